@@ -0,0 +1 @@
+"""Benchmarks run against an in-process mock of the Footprints SOAP API."""
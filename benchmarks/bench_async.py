@@ -0,0 +1,61 @@
+"""Compare `getTicketDetails` throughput of the sync and async clients.
+
+Run with::
+
+    $ python -m benchmarks.bench_async --calls 500 --latency 0.02 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import time
+
+from footprintsapi import AsyncFootprints, Footprints
+
+from .mock_server import MockFootprintsServer
+
+
+def bench_sync(url: str, calls: int) -> float:
+    """Return the seconds taken to fetch `calls` tickets one after the other."""
+    fp = Footprints("client", "secret", url)
+    start = time.perf_counter()
+    for _ in range(calls):
+        fp.get_ticket(80001, 9001)
+    return time.perf_counter() - start
+
+
+async def bench_async(url: str, calls: int, concurrency: int) -> float:
+    """Return the seconds taken to fetch `calls` tickets with `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncFootprints("client", "secret", url) as fp:
+
+        async def fetch() -> None:
+            async with semaphore:
+                await fp.get_ticket(80001, 9001)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(fetch() for _ in range(calls)))
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    with MockFootprintsServer(latency=args.latency) as server:
+        sync_time = bench_sync(server.wsdl_url, args.calls)
+        async_time = asyncio.run(
+            bench_async(server.wsdl_url, args.calls, args.concurrency)
+        )
+
+    for name, elapsed in (("sync", sync_time), ("async", async_time)):
+        print(f"{name:>5}: {elapsed:8.3f}s {args.calls / elapsed:10.1f} calls/s")
+    print(f"speedup: {sync_time / async_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare the time zeep and the templates take to render request envelopes.
+
+`editTicket` envelopes are rendered by zeep and by its template.
+`tests/test_envelope.py` checks the template of every operation of the
+bundled WSDL renders the same bytes as zeep.
+
+Run with::
+
+    $ python -m benchmarks.bench_envelopes --fields 40 --repeat 2000
+"""
+
+import argparse
+import time
+
+from zeep.wsdl.utils import etree_to_string
+
+from footprintsapi import Footprints
+from footprintsapi.envelope import EnvelopeTemplate
+from footprintsapi.utils import parse_keys
+
+from .mock_server import MockFootprintsServer
+
+
+def bench(func, repeat: int) -> float:
+    """Return the seconds taken to call a function `repeat` times."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the checks and the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fields", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    with MockFootprintsServer() as server:
+        fp = Footprints("client", "secret", server.wsdl_url)
+        client = fp._requester._client
+        binding = client.service._binding
+        fields = [
+            dict(field_name=f"Field {i}", field_value=dict(value=[f"Value {i} & co"]))
+            for i in range(args.fields)
+        ]
+        params = parse_keys(
+            dict(
+                ticket_definition_id=80,
+                ticket_id=9001,
+                ticket_fields=dict(item_fields=fields),
+                submitter="agent",
+            ),
+            depth=8,
+        )
+        envelope, headers = binding._create("editTicket", (params,), {}, client=client)
+        template = EnvelopeTemplate(binding.get("editTicket"), envelope, headers)
+
+        zeep = bench(
+            lambda: etree_to_string(
+                binding._create("editTicket", (params,), {}, client=client)[0]
+            ),
+            args.repeat,
+        )
+        templated = bench(lambda: template.render(params), args.repeat)
+        for name, seconds in (("zeep", zeep), ("template", templated)):
+            print(
+                f"{name:>8}: {seconds / args.repeat * 1e6:8.1f}us per editTicket "
+                f"({zeep / seconds:5.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compare `get_attributes` with the previous implementation.
+
+The previous implementation lowercased the wanted labels on every call, then
+scanned them and ran the snake case regex for every matching field. Tickets are
+built from plain dicts shaped like zeep's `itemFields`.
+
+Run with::
+
+    $ python -m benchmarks.bench_fields --custom-fields 300 --tickets 2000
+"""
+
+import argparse
+import re
+import time
+
+from footprintsapi.mixins import COMMON_ATTRS, CUSTOM_ATTRS
+from footprintsapi.utils import get_attributes
+
+
+def legacy_to_snake_case(value: str) -> str:
+    """The implementation of `to_snake_case` before it was memoized."""
+    words = re.findall(r"[A-Z]?[a-z]+|[A-Z]{2,}(?=[A-Z][a-z]|\d|\W|$)|\d+", value)
+    return "_".join(map(str.lower, words))
+
+
+def legacy_get_attributes(
+    fields_to_iterate: list, attributes_to_fetch: list = None
+) -> list:
+    """The implementation of `get_attributes` before the field extractors."""
+    if attributes_to_fetch:
+        attributes_to_fetch = [a.lower() for a in attributes_to_fetch]
+
+    attrs = []
+    for item in fields_to_iterate:
+        label = item["fieldName"].lower()
+        try:
+            value = item["fieldValue"]["value"]
+        except TypeError:
+            value = None
+
+        if attributes_to_fetch and label in attributes_to_fetch:
+            if isinstance(value, list) and len(value) == 1:
+                value = value[0]
+            key = legacy_to_snake_case(label)
+            attrs.append((key, value))
+
+    return attrs
+
+
+def build_fields(custom_fields: int) -> list:
+    """Return the `itemFields` of a ticket with the known and extra fields."""
+    names = list(dict.fromkeys(COMMON_ATTRS + CUSTOM_ATTRS))
+    names += [f"Custom Field {i}" for i in range(custom_fields)]
+    return [
+        dict(fieldName=name, fieldValue=dict(value=[f"{name} value"])) for name in names
+    ]
+
+
+def bench(func, tickets: list) -> float:
+    """Return the seconds taken to extract the common and custom attributes."""
+    start = time.perf_counter()
+    for fields in tickets:
+        func(fields, COMMON_ATTRS)
+        func(fields, CUSTOM_ATTRS)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--custom-fields", type=int, default=300)
+    parser.add_argument("--tickets", type=int, default=2000)
+    args = parser.parse_args()
+
+    tickets = [build_fields(args.custom_fields) for _ in range(args.tickets)]
+    for attributes in (COMMON_ATTRS, CUSTOM_ATTRS):
+        assert get_attributes(tickets[0], attributes) == legacy_get_attributes(
+            tickets[0], attributes
+        )
+
+    legacy = bench(legacy_get_attributes, tickets)
+    compiled = bench(get_attributes, tickets)
+    for name, seconds in (("legacy", legacy), ("compiled", compiled)):
+        print(
+            f"{name:>8}: {seconds:6.3f}s, "
+            f"{seconds / args.tickets * 1e6:8.1f}us per ticket "
+            f"({legacy / seconds:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Split the time of `get_ticket` calls in their phases with request hooks.
+
+Tickets with many custom fields are fetched through a `RequestHooks` subclass
+recording every event, then the time of a call is split between serializing
+the request, the network, deserializing the response and building the
+`Ticket`. Retried and failing calls check the events the hooks receive.
+
+Run with::
+
+    $ python -m benchmarks.bench_hooks --calls 200 --custom-fields 40
+"""
+
+import argparse
+import statistics
+
+from footprintsapi import Footprints
+from footprintsapi.exceptions import FootprintsException
+from footprintsapi.retry import RetryPolicy
+from footprintsapi.tracing import RequestHooks
+
+from .mock_server import RESPONSES, MockFootprintsServer, ticket_details
+
+
+class RecordingHooks(RequestHooks):
+    """Hooks keeping every event and the calls which ended."""
+
+    def __init__(self) -> None:
+        self.events = []
+        self.calls = []
+        self.builds = []
+
+    def before_send(self, call) -> None:
+        self.events.append(("before_send", call.method_name, call.attempts))
+
+    def after_receive(self, call) -> None:
+        self.events.append(("after_receive", call.method_name, call.attempts))
+        self.calls.append(call)
+
+    def on_retry(self, call, exception, delay) -> None:
+        self.events.append(("on_retry", call.method_name, call.attempts))
+
+    def on_error(self, call, exception) -> None:
+        self.events.append(("on_error", call.method_name, type(exception).__name__))
+
+    def after_build(self, method_name, obj, seconds) -> None:
+        self.builds.append(seconds)
+
+
+def check_retries(fp: Footprints, hooks: RecordingHooks, server) -> None:
+    """Assert a retried call and a failed one reach the right hooks."""
+    del hooks.events[:]
+    server.fail_next(1)
+    fp.get_ticket(80, 9001)
+    assert [event[0] for event in hooks.events] == [
+        "before_send",
+        "on_retry",
+        "before_send",
+        "after_receive",
+    ], hooks.events
+    assert hooks.calls[-1].attempts == 2
+
+    del hooks.events[:]
+    server.fail_next(3)
+    try:
+        fp.get_ticket(80, 9001)
+    except FootprintsException:
+        pass
+    else:
+        raise AssertionError("The call should have failed.")
+    assert hooks.events[-1] == (
+        "on_error",
+        "getTicketDetails",
+        "FootprintsException",
+    ), hooks.events
+    assert [event[0] for event in hooks.events].count("on_retry") == 2
+
+
+def main() -> None:
+    """Run the checks and the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--custom-fields", type=int, default=40)
+    args = parser.parse_args()
+
+    responses = dict(
+        RESPONSES, getTicketDetails=ticket_details(args.custom_fields, "x" * 2000)
+    )
+    hooks = RecordingHooks()
+    with MockFootprintsServer(responses) as server:
+        fp = Footprints(
+            "client",
+            "secret",
+            server.wsdl_url,
+            cache_policies={"getTicketDetails": None},
+            retry_policy=RetryPolicy(backoff=0.001, jitter=False),
+            hooks=hooks,
+        )
+        fp.get_ticket(80, 9001)
+        del hooks.calls[:], hooks.builds[:]
+
+        for _ in range(args.calls):
+            fp.get_ticket(80, 9001)
+        calls, builds = list(hooks.calls), list(hooks.builds)
+        check_retries(fp, hooks, server)
+
+    assert len(calls) == len(builds) == args.calls
+    response_bytes = len(server.render("getTicketDetails"))
+    for call in calls:
+        assert call.attempts == 1 and call.request_bytes > 0
+        assert call.response_bytes == response_bytes
+        assert 0 < call.network_seconds < call.seconds
+
+    phases = dict(
+        serialize=statistics.median(call.serialize_seconds for call in calls),
+        network=statistics.median(call.network_seconds for call in calls),
+        deserialize=statistics.median(call.deserialize_seconds for call in calls),
+        build=statistics.median(builds),
+    )
+    total = sum(phases.values())
+    for name, seconds in phases.items():
+        print(f"{name:>12}: {seconds * 1e6:7.1f}us ({seconds / total * 100:4.1f}%)")
+    print(
+        f"{'envelopes':>12}: {calls[0].request_bytes} bytes sent, "
+        f"{calls[0].response_bytes} bytes received"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare `parse_keys` with its key table and plain key conversions.
+
+`parse_keys` looks the schema names up in `KEY_TABLE`, the plain conversions
+are the functions wrapped by the memo tables, as they were before either.
+Requests are converted from snake case to the modified camel case sent to
+Footprints, responses the other way around.
+
+Run with::
+
+    $ python -m benchmarks.bench_keys --repeat 20000
+"""
+
+import argparse
+import re
+import time
+
+from footprintsapi.keymap import FOOTPRINTS_KEYS
+from footprintsapi.utils import (
+    _unpack,
+    parse_keys,
+    warm_key_cache,
+)
+
+
+def snake_case(value: str) -> str:
+    """The implementation of `to_snake_case` before it was memoized."""
+    words = re.findall(r"[A-Z]?[a-z]+|[A-Z]{2,}(?=[A-Z][a-z]|\d|\W|$)|\d+", value)
+    return "_".join(map(str.lower, words))
+
+
+def camel_case(value: str) -> str:
+    """The implementation of `to_camel_case` before it was memoized."""
+    content = value.split("_")
+    return content[0] + "".join(
+        word.title() for word in content[1:] if not word.isspace()
+    )
+
+
+def legacy_parse_keys(data: dict, parse_type: str = "modified_camel") -> dict:
+    """The implementation of `parse_keys` before the memo tables."""
+
+    def keys_to_modified_camel(data: dict) -> dict:
+        return {"_" + camel_case(key): value for key, value in _unpack(data)}
+
+    def keys_to_camel_case(data: dict) -> dict:
+        return {camel_case(key): value for key, value in _unpack(data)}
+
+    def keys_to_snake_case(data: dict) -> dict:
+        return {snake_case(key): value for key, value in _unpack(data)}
+
+    formatters = [keys_to_modified_camel, keys_to_camel_case, keys_to_snake_case]
+
+    formatter = None
+    for f in formatters:
+        if parse_type in f.__name__:
+            formatter = f
+    return formatter(data)
+
+
+def bench(func, payloads: list, repeat: int) -> float:
+    """Return the seconds taken to convert every payload `repeat` times."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data, parse_type in payloads:
+            func(data, parse_type)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    keys = [key for key in FOOTPRINTS_KEYS if re.match(r"_[a-z]", key)]
+    response = {key: None for key in keys[:30]}
+    request = {snake_case(key): None for key in keys[30:40]}
+    payloads = [(request, "modified_camel"), (response, "snake_case")]
+    for data, parse_type in payloads:
+        assert parse_keys(data, parse_type) == legacy_parse_keys(data, parse_type)
+
+    warm_key_cache(FOOTPRINTS_KEYS)
+    legacy = bench(legacy_parse_keys, payloads, args.repeat)
+    memoized = bench(parse_keys, payloads, args.repeat)
+    calls = args.repeat * len(payloads)
+    for name, seconds in (("plain", legacy), ("table", memoized)):
+        print(
+            f"{name:>8}: {seconds:6.3f}s, {calls / seconds:10.0f} calls/s "
+            f"({legacy / seconds:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
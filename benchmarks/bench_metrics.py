@@ -0,0 +1,95 @@
+"""Measure the overhead of the per method metrics.
+
+The cost of measuring a call on its own is timed first, then the throughput
+of raw `getTicketDetails` calls against the mock server, the cheapest calls
+the client makes, with metrics and with the measurement taken out of the
+requester. Runs alternate, in turns starting with either client, and their
+medians are compared: the difference is mostly noise next to a call.
+
+Run with::
+
+    $ python -m benchmarks.bench_metrics --calls 500 --runs 10
+"""
+
+import argparse
+import statistics
+import time
+
+from footprintsapi import Footprints
+from footprintsapi.metrics import Metrics
+from footprintsapi.tracing import (
+    Call,
+    end_attempt,
+    enter_call,
+    exit_call,
+    record_exchange,
+    start_attempt,
+)
+
+from .mock_server import MockFootprintsServer
+
+PARAMS = dict(item_definition_id=80, item_id=9001)
+
+
+def bench_measure(repeat: int) -> float:
+    """Return the seconds taken to measure a call, without any call."""
+    metrics = Metrics(callbacks=[lambda observation: None])
+    start = time.perf_counter()
+    for _ in range(repeat):
+        token = enter_call(Call("getTicketDetails", PARAMS))
+        start_attempt()
+        record_exchange(time.perf_counter(), 400, 800)
+        end_attempt()
+        metrics.observe(exit_call(token))
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_calls(fp: Footprints, calls: int) -> float:
+    """Return the seconds taken per call."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        fp._requester.request("getTicketDetails", PARAMS, raw=True)
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=100000)
+    args = parser.parse_args()
+
+    measure = bench_measure(args.repeat)
+    print(f"{'measuring':>10}: {measure * 1e6:6.2f}us per call")
+
+    with MockFootprintsServer() as server:
+        measured = Footprints("client", "secret", server.wsdl_url)
+        unmeasured = Footprints("client", "secret", server.wsdl_url)
+        requester = unmeasured._requester
+        requester._observe = lambda method_name, params: requester._handle_errors()
+
+        clients = dict(without=unmeasured, metrics=measured)
+        timings = dict(without=[], metrics=[])
+        for run in range(args.runs):
+            for name in sorted(clients, reverse=run % 2 == 1):
+                timings[name].append(bench_calls(clients[name], args.calls))
+
+    snapshot = measured.metrics()["getTicketDetails"]
+    assert snapshot["calls"] == args.calls * args.runs
+    assert snapshot["response_bytes"] > 0 and not snapshot["errors"]
+    assert unmeasured.metrics() == {}
+
+    without = statistics.median(timings["without"])
+    for name, runs in timings.items():
+        median = statistics.median(runs)
+        print(
+            f"{name:>10}: {median * 1e6:6.1f}us per call "
+            f"({(median - without) / without * 100:+5.1f}%)"
+        )
+    print(f"measuring is {measure / without * 100:.2f}% of a call")
+    assert measure < without / 100, "Measuring costs more than 1% of a call."
+
+
+if __name__ == "__main__":
+    main()
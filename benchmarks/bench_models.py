@@ -0,0 +1,92 @@
+"""Compare the construction time and memory of `Ticket` and `CompactTicket`.
+
+Each model is built from its own parsed `getTicketDetails` response. The
+responses are traced along with the models, since compact models keep them
+while eager ones only keep the parts they copied.
+
+Run with::
+
+    $ python -m benchmarks.bench_models --tickets 1000 --custom-fields 40
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from footprintsapi import Footprints
+from footprintsapi.models import CompactTicket, Ticket
+
+from .mock_server import RESPONSES, MockFootprintsServer, ticket_details
+
+
+def fetch_responses(fp: Footprints, tickets: int) -> list:
+    """Return `tickets` separately parsed `getTicketDetails` responses."""
+    params = dict(item_definition_id=80, item_id=1)
+    return [
+        fp._requester.request("getTicketDetails", params, bypass_cache=True)
+        for _ in range(tickets)
+    ]
+
+
+def bench(model_class: type, fp: Footprints, tickets: int) -> dict:
+    """Build `tickets` models and measure their time and retained memory.
+
+    Timings and memory are measured on separate runs, tracing allocations
+    slows down the construction.
+    """
+    responses = fetch_responses(fp, tickets)
+    start = time.perf_counter()
+    models = [model_class(None, r) for r in responses]
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for model in models:
+        model.title, model.service
+    accessed = time.perf_counter() - start
+    del models, responses
+
+    # The responses are traced too, compact models keep them alive.
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    models = [model_class(None, r) for r in fetch_responses(fp, tickets)]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del models
+    return dict(built=built, accessed=accessed, retained=retained)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=1000)
+    parser.add_argument("--custom-fields", type=int, default=40)
+    parser.add_argument("--description-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    description = "x" * args.description_size
+    responses = dict(
+        RESPONSES, getTicketDetails=ticket_details(args.custom_fields, description)
+    )
+    with MockFootprintsServer(responses) as server:
+        fp = Footprints("client", "secret", server.wsdl_url)
+        results = {
+            cls.__name__: bench(cls, fp, args.tickets)
+            for cls in (Ticket, CompactTicket)
+        }
+
+    eager = results["Ticket"]
+    for name, result in results.items():
+        print(
+            f"{name:>13}: build {result['built']:6.2f}s "
+            f"({eager['built'] / result['built']:5.1f}x), "
+            f"first access {result['accessed']:6.2f}s, "
+            f"retained {result['retained'] / 2 ** 20:8.1f}MiB "
+            f"({result['retained'] / args.tickets / 1024:6.1f}KiB per ticket)"
+        )
+
+
+if __name__ == "__main__":
+    main()
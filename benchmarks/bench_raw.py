@@ -0,0 +1,118 @@
+"""Compare the throughput of zeep's responses with the raw decoders.
+
+Both decode the same envelopes, then are measured end to end against the mock
+server. `tests/test_raw.py` checks the raw decoders return what zeep's
+objects serialize to.
+
+Run with::
+
+    $ python -m benchmarks.bench_raw --custom-fields 40 --rows 200 --repeat 200
+"""
+
+import argparse
+import time
+
+from requests import Response
+
+from footprintsapi import Footprints
+from footprintsapi.raw import RAW_METHODS
+
+from .mock_server import (
+    ENVELOPE,
+    RESPONSES,
+    MockFootprintsServer,
+    search_results,
+    ticket_details,
+)
+
+ITEM_DETAILS = (
+    "<ext:getItemDetailsResponse><return><_itemFields>"
+    "<itemFields><fieldName>Title</fieldName>"
+    "<fieldValue><value>Printer on fire</value></fieldValue></itemFields>"
+    "<itemFields><fieldName>Status</fieldName><fieldValue/></itemFields>"
+    "<itemFields><fieldName>Email Address</fieldName>"
+    "<fieldValue><value>a@example.com</value><value>b@example.com</value>"
+    "</fieldValue></itemFields>"
+    "<itemFields><fieldName>Priority</fieldName></itemFields>"
+    "</_itemFields><_assignees><value>Agent</value></_assignees>"
+    "</return></ext:getItemDetailsResponse>"
+)
+
+
+def _response(body: str, status: int = 200) -> Response:
+    response = Response()
+    response.status_code = status
+    response.headers["Content-Type"] = "text/xml; charset=utf-8"
+    response._content = ENVELOPE.format(body=body).encode("utf-8")
+    return response
+
+
+def decode_zeep(fp: Footprints, method_name: str, response: Response):
+    """Decode a response the way zeep does for `Requester.request`."""
+    client = fp._requester._client
+    binding = client.service._binding
+    return binding.process_reply(client, binding.get(method_name), response)
+
+
+def decode_raw(fp: Footprints, method_name: str, response: Response):
+    """Decode a response with the raw decoder of its method."""
+    return fp._requester._raw_decoder(method_name)(response.content)
+
+
+def bench(func, repeat: int) -> float:
+    """Return the seconds taken to call a function `repeat` times."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the checks and the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--custom-fields", type=int, default=40)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    bodies = dict(
+        getTicketDetails=ticket_details(args.custom_fields),
+        getItemDetails=ITEM_DETAILS,
+        runSearch=search_results(args.rows),
+    )
+    with MockFootprintsServer(dict(RESPONSES, **bodies)) as server:
+        fp = Footprints("client", "secret", server.wsdl_url)
+        item = dict(item_definition_id=80, item_id=1)
+        requests = dict(
+            getTicketDetails=item, getItemDetails=item, runSearch=dict(search_id=1)
+        )
+        for method_name in RAW_METHODS:
+            params = requests[method_name]
+            response = _response(bodies[method_name])
+            timings = [
+                bench(lambda: decode(fp, method_name, response), args.repeat)
+                for decode in (decode_zeep, decode_raw)
+            ]
+            timings += [
+                bench(
+                    lambda: fp._requester.request(
+                        method_name, params, bypass_cache=True, raw=raw
+                    ),
+                    args.repeat,
+                )
+                for raw in (False, True)
+            ]
+            zeep_decode, raw_decode, zeep_call, raw_call = timings
+            print(
+                f"{method_name:>16}: "
+                f"decode {args.repeat / zeep_decode:6.0f}/s zeep, "
+                f"{args.repeat / raw_decode:6.0f}/s raw "
+                f"({zeep_decode / raw_decode:4.1f}x); "
+                f"call {args.repeat / zeep_call:6.0f}/s zeep, "
+                f"{args.repeat / raw_call:6.0f}/s raw "
+                f"({zeep_call / raw_call:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
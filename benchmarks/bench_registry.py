@@ -0,0 +1,78 @@
+"""Build many `Footprints` instances with and without the shared WSDL registry.
+
+Each mode runs in its own process so that the resident set size isn't
+polluted by the other mode. Run with::
+
+    $ python -m benchmarks.bench_registry --instances 100
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from footprintsapi import Footprints
+
+WSDL = (
+    Path(__file__).resolve().parent.parent
+    / "tests"
+    / "wsdl"
+    / "externalapiservices.wsdl"
+).as_uri()
+
+
+def rss_kib() -> int:
+    """Return the current resident set size in KiB."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * resource.getpagesize() // 1024
+    except OSError:
+        # Peak RSS, in bytes on macOS and KiB elsewhere.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run(instances: int, shared: bool) -> dict:
+    """Build the instances and return the elapsed time and memory growth."""
+    before = rss_kib()
+    start = time.perf_counter()
+    clients = [
+        Footprints(f"agent{i}", "secret", WSDL, shared_wsdl=shared)
+        for i in range(instances)
+    ]
+    elapsed = time.perf_counter() - start
+    documents = len({id(fp._requester._client.wsdl) for fp in clients})
+    return dict(
+        seconds=elapsed, rss_kib=rss_kib() - before, documents=documents, shared=shared
+    )
+
+
+def main() -> None:
+    """Run every mode in a subprocess and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instances", type=int, default=100)
+    parser.add_argument("--mode", choices=("private", "shared"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run(args.instances, args.mode == "shared")))
+        return
+
+    for mode in ("private", "shared"):
+        output = subprocess.check_output(
+            [sys.executable, "-m", "benchmarks.bench_registry", "--mode", mode]
+            + ["--instances", str(args.instances)]
+        )
+        result = json.loads(output)
+        print(
+            f"{mode:>8}: {result['seconds']:7.3f}s "
+            f"{result['rss_kib'] / 1024:8.1f}MiB RSS growth "
+            f"{result['documents']:4d} parsed document(s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Record calls to the mock server, then replay them without any network.
+
+Tickets and a search are recorded with a `Recorder`, then fetched again
+through a `Replayer` once the server is stopped: the models must be the same
+and the archive must not hold the client secret. Replaying serves the
+responses at full speed, or at `--speed` times the recorded pace. Lookups are
+then timed in an archive of `--archived` exchanges, which must stay fast as
+the archive grows.
+
+Run with::
+
+    $ python -m benchmarks.bench_replay --tickets 200 --latency 0.005 --archived 200000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import zlib
+
+from footprintsapi import Footprints
+from footprintsapi.replay import Recorder, Replayer, exchange_key
+
+from .mock_server import MockFootprintsServer
+
+SECRET = "correct horse battery staple"
+
+
+def fetch(fp: Footprints, tickets: int) -> list:
+    """Fetch every ticket and run a search, return the models and rows."""
+    models = [fp.get_ticket(80, item_id).to_json for item_id in range(1, tickets + 1)]
+    return models + list(fp.iter_search(1))
+
+
+def timed_fetch(fp: Footprints, tickets: int) -> tuple:
+    """Return the seconds taken by `fetch` and its result."""
+    start = time.perf_counter()
+    result = fetch(fp, tickets)
+    return time.perf_counter() - start, result
+
+
+def bench_lookups(path: str, archived: int, lookups: int) -> float:
+    """Fill an archive with synthetic exchanges, return the seconds per lookup."""
+    recorder = Recorder(path)
+    archive = recorder.archive
+    empty = zlib.compress(b"")
+    with archive._conn:
+        archive._conn.executemany(
+            "INSERT INTO exchanges (key, seq, method, target, request, status, "
+            "headers, content, elapsed) VALUES (?, 0, 'POST', '/', '', 200, '{}', ?, 0)",
+            (
+                (exchange_key("POST", "/", str(i).encode()), empty)
+                for i in range(archived)
+            ),
+        )
+    recorder.close()
+
+    replayer = Replayer(path)
+    bodies = [str(i * (archived // lookups)).encode() for i in range(lookups)]
+    start = time.perf_counter()
+    for body in bodies:
+        replayer.lookup("POST", "http://footprints/", body)
+    seconds = (time.perf_counter() - start) / lookups
+    replayer.close()
+    return seconds
+
+
+def main() -> None:
+    """Run the checks and the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--speed", type=float, default=10)
+    parser.add_argument("--archived", type=int, default=200000)
+    parser.add_argument("--lookups", type=int, default=10000)
+    args = parser.parse_args()
+
+    settings = dict(cache_policies={"getTicketDetails": None})
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "recorded.db")
+        with MockFootprintsServer(latency=args.latency) as server:
+            recorder = Recorder(path)
+            fp = Footprints(
+                "client", SECRET, server.wsdl_url, tape=recorder, **settings
+            )
+            recorded, expected = timed_fetch(fp, args.tickets)
+            wsdl_url = server.wsdl_url
+            exchanges = len(recorder.archive)
+            recorder.close()
+
+        with open(path, "rb") as f:
+            assert SECRET.encode() not in f.read()
+
+        replayer = Replayer(path)
+        fp = Footprints("client", SECRET, wsdl_url, tape=replayer, **settings)
+        replayed, result = timed_fetch(fp, args.tickets)
+        assert result == expected
+        assert replayer.served == exchanges
+
+        paced = Replayer(path, speed=args.speed)
+        fp = Footprints("client", SECRET, wsdl_url, tape=paced, **settings)
+        paced_seconds, result = timed_fetch(fp, args.tickets)
+        assert result == expected
+
+        lookup = bench_lookups(
+            os.path.join(directory, "large.db"), args.archived, args.lookups
+        )
+
+    print(f"{'recorded':>12}: {recorded:6.3f}s for {exchanges} exchanges")
+    print(f"{'replayed':>12}: {replayed:6.3f}s ({recorded / replayed:5.1f}x faster)")
+    print(f"{f'{args.speed:g}x pace':>12}: {paced_seconds:6.3f}s")
+    print(
+        f"{'lookups':>12}: {lookup * 1e6:6.1f}us each "
+        f"in an archive of {args.archived} exchanges"
+    )
+    assert lookup < 0.001, "Archive lookups should take well under a millisecond."
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare the peak memory of `get_search` and `iter_search`.
+
+Both run the same search against the mock server, `get_search` parsing the
+whole response before returning and `iter_search` yielding the rows while the
+response is read. Each row is read once and dropped.
+
+Run with::
+
+    $ python -m benchmarks.bench_search --rows 2000 10000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from footprintsapi import Footprints
+
+from .mock_server import RESPONSES, MockFootprintsServer, search_results
+
+
+def get_search(fp: Footprints) -> int:
+    """Run the search with `get_search` and return the number of rows."""
+    return sum(1 for row in fp.get_search(1, bypass_cache=True))
+
+
+def iter_search(fp: Footprints) -> int:
+    """Run the search with `iter_search` and return the number of rows."""
+    return sum(1 for row in fp.iter_search(1))
+
+
+def bench(func, fp: Footprints) -> dict:
+    """Run a search and measure its time and peak memory.
+
+    Timings and memory are measured on separate runs, tracing allocations
+    slows down parsing.
+    """
+    start = time.perf_counter()
+    rows = func(fp)
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    func(fp)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return dict(rows=rows, seconds=seconds, peak=peak)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[2000, 10000])
+    parser.add_argument("--fields", type=int, default=10)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        responses = dict(RESPONSES, runSearch=search_results(rows, args.fields))
+        with MockFootprintsServer(responses) as server:
+            fp = Footprints("client", "secret", server.wsdl_url)
+            for func in (get_search, iter_search):
+                result = bench(func, fp)
+                assert result["rows"] == rows
+                print(
+                    f"{func.__name__:>11} {rows:>7} rows: "
+                    f"{result['seconds']:6.2f}s, "
+                    f"peak {result['peak'] / 2 ** 20:8.1f}MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
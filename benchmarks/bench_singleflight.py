@@ -0,0 +1,116 @@
+"""Count the calls reaching footprints when many callers want the same ticket.
+
+Bursts of threads, then of asyncio tasks, fetch the same ticket at the same
+moment, as the views of a dashboard do. With single-flight coalescing each
+burst must make a single `getTicketDetails` call, without it one call per
+caller. The response cache is disabled to only measure the coalescing.
+
+Run with::
+
+    $ python -m benchmarks.bench_singleflight --callers 50 --bursts 5 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from footprintsapi import AsyncFootprints, Footprints
+from footprintsapi.singleflight import SingleFlight
+
+from .mock_server import MockFootprintsServer
+
+SETTINGS = dict(cache_policies={"getTicketDetails": None})
+
+
+def burst(fp: Footprints, callers: int) -> list:
+    """Fetch the same ticket from `callers` threads released at once."""
+    barrier = threading.Barrier(callers)
+    tickets = [None] * callers
+
+    def fetch(index: int) -> None:
+        barrier.wait()
+        tickets[index] = fp.get_ticket(80, 9001)
+
+    threads = [threading.Thread(target=fetch, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return tickets
+
+
+def bench_threads(server, args, single_flight: Optional[SingleFlight]) -> tuple:
+    """Return the seconds and the calls made by the thread bursts."""
+    fp = Footprints(
+        "client",
+        "secret",
+        server.wsdl_url,
+        pool_maxsize=args.callers,
+        single_flight=single_flight,
+        **SETTINGS,
+    )
+    calls = server.calls
+    start = time.perf_counter()
+    for _ in range(args.bursts):
+        tickets = burst(fp, args.callers)
+        assert all(ticket.to_json == tickets[0].to_json for ticket in tickets)
+    return time.perf_counter() - start, server.calls - calls
+
+
+async def bench_tasks(server, args, single_flight: Optional[SingleFlight]) -> tuple:
+    """Return the seconds and the calls made by the task bursts."""
+    async with AsyncFootprints(
+        "client",
+        "secret",
+        server.wsdl_url,
+        pool_maxsize=args.callers,
+        single_flight=single_flight,
+        **SETTINGS,
+    ) as fp:
+        calls = server.calls
+        start = time.perf_counter()
+        for _ in range(args.bursts):
+            tickets = await asyncio.gather(
+                *(fp.get_ticket(80, 9001) for _ in range(args.callers))
+            )
+            assert all(ticket.to_json == tickets[0].to_json for ticket in tickets)
+        return time.perf_counter() - start, server.calls - calls
+
+
+def main() -> None:
+    """Run the checks and the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=50)
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    results = {}
+    with MockFootprintsServer(latency=args.latency) as server:
+        for name, single_flight in (("coalesced", SingleFlight()), ("separate", None)):
+            results["threads", name] = bench_threads(server, args, single_flight)
+            results["tasks", name] = asyncio.run(
+                bench_tasks(server, args, single_flight)
+            )
+            if single_flight is not None:
+                stats = single_flight.stats()
+                assert stats["calls"]["getTicketDetails"] == 2 * args.bursts
+                assert stats["coalesced"]["getTicketDetails"] == (
+                    2 * args.bursts * (args.callers - 1)
+                )
+
+    for (kind, name), (seconds, calls) in results.items():
+        if name == "coalesced":
+            assert calls == args.bursts, (kind, calls)
+        else:
+            assert calls == args.bursts * args.callers, (kind, calls)
+        print(
+            f"{kind:>8} {name:>9}: {calls:4d} getTicketDetails calls "
+            f"for {args.bursts * args.callers} gets in {seconds:6.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Compare the latency of `editTicket` calls with and without write-behind.
+
+The same edits are sent one call at a time, then spooled with a `WriteBehind`
+and flushed. The edits of each ticket must reach the server in the order they
+were made, and a spool left behind by a stopped process is drained by the
+next one.
+
+Run with::
+
+    $ python -m benchmarks.bench_spool --tickets 20 --changes 5 --latency 0.02
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+
+from footprintsapi import Footprints
+from footprintsapi.spool import WriteBehind
+
+from .mock_server import MockFootprintsServer
+
+TICKET_ID = re.compile(rb"<_ticketId>(\d+)</_ticketId>")
+STEP = re.compile(rb"<value>(\d+)</value>")
+
+
+def edits(tickets: int, per_ticket: int) -> list:
+    """Return `per_ticket` edits of the same field for each ticket, interleaved."""
+    return [
+        (
+            ticket_id,
+            {
+                "item_fields": [
+                    {"field_name": "Step", "field_value": {"value": [str(step)]}}
+                ]
+            },
+        )
+        for step in range(per_ticket)
+        for ticket_id in range(1, tickets + 1)
+    ]
+
+
+def check_order(payloads: list) -> None:
+    """Assert each ticket received increasing steps, ending with the last one."""
+    steps = {}
+    for payload in payloads:
+        ticket_id = TICKET_ID.search(payload)
+        if ticket_id:
+            step = int(STEP.search(payload).group(1))
+            received = steps.setdefault(ticket_id.group(1), [])
+            assert not received or received[-1] < step, (ticket_id, received, step)
+            received.append(step)
+    assert len({tuple(received[-1:]) for received in steps.values()}) == 1
+
+
+def main() -> None:
+    """Run the checks and the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=20)
+    parser.add_argument("--changes", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    batch = edits(args.tickets, args.changes)
+    with tempfile.TemporaryDirectory() as directory, MockFootprintsServer(
+        latency=args.latency, keep_requests=True
+    ) as server:
+        path = os.path.join(directory, "spool.db")
+        fp = Footprints("client", "secret", server.wsdl_url)
+        fp.update_ticket(80, 1, batch[0][1])
+
+        start = time.perf_counter()
+        for ticket_id, ticket_fields in batch:
+            fp.update_ticket(80, ticket_id, ticket_fields)
+        direct = time.perf_counter() - start
+
+        fp = Footprints(
+            "client", "secret", server.wsdl_url, write_behind=WriteBehind(path)
+        )
+        calls = server.calls
+        del server.requests[:]
+        start = time.perf_counter()
+        for ticket_id, ticket_fields in batch:
+            fp.update_ticket(80, ticket_id, ticket_fields)
+        acked = time.perf_counter() - start
+        assert fp.join(timeout=60)
+        flushed = time.perf_counter() - start
+        check_order(server.requests)
+        assert fp.write_behind.stats()["sent"] == len(batch)
+        spooled_calls = server.calls - calls
+
+        # Writes spooled by a process which never sent them.
+        stopped = WriteBehind(path)
+        for ticket_id, ticket_fields in batch:
+            stopped.submit(
+                "editTicket",
+                dict(
+                    ticket_definition_id=80,
+                    ticket_id=ticket_id,
+                    ticket_fields=ticket_fields,
+                ),
+            )
+        stopped.spool.close()
+        fp = Footprints(
+            "client", "secret", server.wsdl_url, write_behind=WriteBehind(path)
+        )
+        assert fp.join(timeout=60)
+        assert fp.write_behind.stats() == dict(
+            pending=0, failed=0, sent=len(batch), retried=0
+        )
+
+    print(
+        f"{'direct':>13}: {direct / len(batch) * 1e3:6.2f}ms per edit, "
+        f"{len(batch)} calls, {direct:5.2f}s in total"
+    )
+    print(
+        f"{'write-behind':>13}: {acked / len(batch) * 1e3:6.2f}ms per edit, "
+        f"{spooled_calls} calls, {flushed:5.2f}s until flushed"
+    )
+
+
+if __name__ == "__main__":
+    main()
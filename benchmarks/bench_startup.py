@@ -0,0 +1,71 @@
+"""Compare `Footprints(...)` construction time with and without WSDL caching.
+
+Modes:
+
+- cold: fetch and parse the WSDL every time.
+- sqlite: fetch the WSDL from the `storage_url` sqlite cache, parse it every time.
+- snapshot: load the precompiled document written by `snapshot_path`.
+- lazy: defer loading until the first request, which is never made here.
+
+Run with::
+
+    $ python -m benchmarks.bench_startup --repeat 20
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from footprintsapi import Footprints
+
+from .mock_server import MockFootprintsServer
+
+
+def bench(repeat: int, **kwargs) -> list:
+    """Return the construction times of `repeat` clients built with kwargs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Footprints("client", "secret", **kwargs)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--base-url", help="Benchmark a live WSDL instead of the mock.")
+    args = parser.parse_args()
+
+    with MockFootprintsServer() as server, tempfile.TemporaryDirectory() as tmp:
+        base_url = args.base_url or server.wsdl_url
+        storage_url = os.path.join(tmp, "wsdl.db")
+        snapshot_path = os.path.join(tmp, "wsdl.pickle")
+
+        # Prime the sqlite cache and the snapshot.
+        Footprints("client", "secret", base_url, storage_url=storage_url)
+        Footprints("client", "secret", base_url, snapshot_path=snapshot_path)
+
+        results = {
+            "cold": bench(args.repeat, base_url=base_url),
+            "sqlite": bench(args.repeat, base_url=base_url, storage_url=storage_url),
+            "snapshot": bench(
+                args.repeat, base_url=base_url, snapshot_path=snapshot_path
+            ),
+            "lazy": bench(args.repeat, base_url=base_url, lazy=True),
+        }
+
+    cold = statistics.median(results["cold"])
+    for mode, timings in results.items():
+        median = statistics.median(timings)
+        print(
+            f"{mode:>8}: median {median * 1000:8.2f}ms "
+            f"min {min(timings) * 1000:8.2f}ms ({cold / median:5.1f}x vs cold)"
+        )
+
+
+if __name__ == "__main__":
+    main()
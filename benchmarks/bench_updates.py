@@ -0,0 +1,76 @@
+"""Compare one `update_ticket` call per change with `update_tickets`.
+
+Each ticket gets several changes, one field each, as automation tends to send
+them. The changes are sent one call at a time, then coalesced and dispatched
+with `update_tickets`, counting the `editTicket` calls reaching the server.
+
+Run with::
+
+    $ python -m benchmarks.bench_updates --tickets 50 --changes 3 --latency 0.02
+"""
+
+import argparse
+import time
+
+from footprintsapi import Footprints
+
+from .mock_server import MockFootprintsServer
+
+
+def changes(tickets: int, per_ticket: int) -> list:
+    """Return `per_ticket` single field changes for each ticket, interleaved."""
+    return [
+        (
+            ticket_id,
+            {
+                "item_fields": [
+                    {"field_name": f"Field {n}", "field_value": {"value": [str(n)]}}
+                ]
+            },
+        )
+        for n in range(per_ticket)
+        for ticket_id in range(1, tickets + 1)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=50)
+    parser.add_argument("--changes", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    batch = changes(args.tickets, args.changes)
+    with MockFootprintsServer(latency=args.latency) as server:
+        fp = Footprints(
+            "client", "secret", server.wsdl_url, pool_maxsize=args.concurrency
+        )
+        fp.update_ticket(80, 1, batch[0][1])
+
+        calls = server.calls
+        start = time.perf_counter()
+        for ticket_id, ticket_fields in batch:
+            fp.update_ticket(80, ticket_id, ticket_fields)
+        one_by_one = time.perf_counter() - start, server.calls - calls
+
+        calls = server.calls
+        start = time.perf_counter()
+        results = fp.update_tickets(80, batch, concurrency=args.concurrency)
+        batched = time.perf_counter() - start, server.calls - calls
+
+    assert [result.id for result in results] == list(range(1, args.tickets + 1))
+    assert all(result.ok for result in results)
+    for name, (seconds, calls) in (
+        ("one by one", one_by_one),
+        ("update_tickets", batched),
+    ):
+        print(
+            f"{name:>14}: {len(batch)} changes in {calls:4d} editTicket calls, "
+            f"{seconds:6.2f}s ({one_by_one[0] / seconds:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
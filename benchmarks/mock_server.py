@@ -0,0 +1,265 @@
+"""A minimal in-process mock of the Footprints SOAP API.
+
+The mock serves the WSDL bundled in `tests/wsdl/` (with the service address
+rewritten to point back at the mock) and answers operations with canned
+responses, optionally after a fixed latency.
+"""
+
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from typing import Dict, Optional
+
+WSDL_DIR = Path(__file__).resolve().parent.parent / "tests" / "wsdl"
+WSDL_FILE = "externalapiservices.wsdl"
+SCHEMA_FILE = "externalapiservices_schema.xsd"
+
+ENVELOPE = (
+    '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" '
+    'xmlns:ext="http://externalapi.business.footprints.numarasoftware.com/">'
+    "<soapenv:Body>{body}</soapenv:Body></soapenv:Envelope>"
+)
+
+FAULT = (
+    "<soapenv:Fault><faultcode>soapenv:Server</faultcode>"
+    "<faultstring>{message}</faultstring></soapenv:Fault>"
+)
+
+TICKET_DETAILS = (
+    "<ext:getTicketDetailsResponse><return>"
+    "<_ticketNumber>SR-00001</_ticketNumber>"
+    "<_submitter>Jesus Rodriguez</_submitter>"
+    "<_createDate>07/05/21</_createDate>"
+    "<_createTime>10:00pm</_createTime>"
+    "<_title>Testing</_title>"
+    "<_status>Pending</_status>"
+    "<_priority>Low</_priority>"
+    "<_description>Something really bad happened!</_description>"
+    "<_customFields>"
+    "<itemFields><fieldName>Service</fieldName>"
+    "<fieldValue><value>Email</value></fieldValue></itemFields>"
+    "<itemFields><fieldName>Email Address</fieldName>"
+    "<fieldValue><value>jesus@example.com</value></fieldValue></itemFields>"
+    "</_customFields>"
+    "</return></ext:getTicketDetailsResponse>"
+)
+
+CUSTOM_FIELD = (
+    "<itemFields><fieldName>{name}</fieldName>"
+    "<fieldValue><value>{value}</value></fieldValue></itemFields>"
+)
+
+
+def ticket_details(custom_fields: int = 0, description: str = "") -> str:
+    """Render a `getTicketDetails` body with extra custom fields.
+
+    :param custom_fields: The number of custom fields to add to the canned ones.
+
+    :param description: Text appended to the ticket description.
+    """
+    fields = "".join(
+        CUSTOM_FIELD.format(name=f"Custom Field {i}", value=f"Value {i}")
+        for i in range(custom_fields)
+    )
+    return TICKET_DETAILS.replace(
+        "</_description>", f"{description}</_description>"
+    ).replace("</_customFields>", f"{fields}</_customFields>")
+
+
+SEARCH_ROW = (
+    "<_items><_containerDefinitionId>1</_containerDefinitionId>"
+    "<_containerDefinitionName>Service Desk</_containerDefinitionName>"
+    "<_itemDefinitionId>80</_itemDefinitionId>"
+    "<_itemDefinitionName>Incident</_itemDefinitionName>"
+    "<_itemId>{item_id}</_itemId>"
+    "<_itemFields>{fields}</_itemFields>"
+    "<_assignees><value>Jesus Rodriguez</value></_assignees></_items>"
+)
+
+
+def search_results(rows: int, fields: int = 5) -> str:
+    """Render a `runSearch` body with synthetic rows.
+
+    :param rows: The number of rows found.
+
+    :param fields: The number of fields in each row.
+    """
+    row_fields = "".join(
+        CUSTOM_FIELD.format(name=f"Field {i}", value=f"Value {i}")
+        for i in range(fields)
+    )
+    items = "".join(
+        SEARCH_ROW.format(item_id=i, fields=row_fields) for i in range(1, rows + 1)
+    )
+    return f"<ext:runSearchResponse><return>{items}</return></ext:runSearchResponse>"
+
+
+RESPONSES = {
+    "getItemId": "<ext:getItemIdResponse><return>9001</return></ext:getItemIdResponse>",
+    "getTicketDetails": TICKET_DETAILS,
+    "editTicket": "<ext:editTicketResponse><return>9001</return></ext:editTicketResponse>",
+    "runSearch": search_results(20),
+    "listContainerDefinitions": (
+        "<ext:listContainerDefinitionsResponse><return><_definitions>"
+        "<_definitionId>1</_definitionId><_definitionName>Service Desk</_definitionName>"
+        "</_definitions></return></ext:listContainerDefinitionsResponse>"
+    ),
+}
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+OPERATION = re.compile(rb"Body>\s*<(?:[\w-]+:)?(\w+)")
+
+
+class MockFootprintsServer:
+    """Threaded HTTP server pretending to be a Footprints instance."""
+
+    def __init__(
+        self,
+        responses: Optional[Dict[str, str]] = None,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        keep_requests: bool = False,
+    ) -> None:
+        """Init function.
+
+        :param responses: Operation name to SOAP body mapping, defaults to `RESPONSES`.
+
+        :param latency: Seconds to wait before answering each operation.
+
+        :param host: The interface to listen on.
+
+        :param port: The port to listen on, a free port is picked by default.
+
+        :param keep_requests: Keep the body of every operation called in `requests`.
+        """
+        self.responses = dict(RESPONSES if responses is None else responses)
+        self.latency = latency
+        self.calls = 0
+        self.keep_requests = keep_requests
+        self.requests = []
+        self._rendered = {}
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Return the root url of the mock."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def wsdl_url(self) -> str:
+        """Return the url to pass as `base_url` to `Footprints`."""
+        return f"{self.url}/{WSDL_FILE}"
+
+    def start(self) -> "MockFootprintsServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockFootprintsServer":
+        """Start the server on enter."""
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        """Stop the server on exit."""
+        self.stop()
+
+    def fail_next(
+        self, count: int = 1, status: int = 503, retry_after: Optional[str] = None
+    ) -> None:
+        """Answer the next operations with an HTTP error instead of their response.
+
+        :param count: The number of operations to fail.
+
+        :param status: The HTTP status to answer with.
+
+        :param retry_after: An optional Retry-After header value.
+        """
+        with self._lock:
+            self._failures.extend([(status, retry_after)] * count)
+
+    def _next_failure(self) -> Optional[tuple]:
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def render(self, operation: str) -> bytes:
+        """Render the response envelope for an operation.
+
+        Envelopes are rendered once, so large responses don't weigh on the
+        memory measured by the benchmarks.
+        """
+        if operation not in self._rendered:
+            body = self.responses.get(operation)
+            if body is None:
+                body = FAULT.format(message=f"Unsupported operation {operation}.")
+            self._rendered[operation] = ENVELOPE.format(body=body).encode("utf-8")
+        return self._rendered[operation]
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, content: bytes, **headers) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name.replace("_", "-"), value)
+                self.send_header("Content-Type", "text/xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self) -> None:
+                name = self.path.split("?")[0].lstrip("/")
+                if name not in (WSDL_FILE, SCHEMA_FILE):
+                    return self._send(404, b"")
+                content = (WSDL_DIR / name).read_bytes()
+                if name == WSDL_FILE:
+                    content = re.sub(
+                        rb'location="[^"]+"',
+                        f'location="{server.url}/soap"'.encode(),
+                        content,
+                    )
+                self._send(200, content)
+
+            def do_POST(self) -> None:
+                payload = self.rfile.read(int(self.headers["Content-Length"]))
+                match = OPERATION.search(payload)
+                operation = match.group(1).decode() if match else ""
+                server.calls += 1
+                if server.keep_requests:
+                    server.requests.append(payload)
+                if server.latency:
+                    time.sleep(server.latency)
+                failure = server._next_failure()
+                if failure:
+                    status, retry_after = failure
+                    headers = dict(Retry_After=retry_after) if retry_after else {}
+                    return self._send(status, b"", **headers)
+                status = 200 if operation in server.responses else 500
+                self._send(status, server.render(operation))
+
+        return Handler
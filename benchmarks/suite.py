@@ -0,0 +1,260 @@
+"""Run every offline benchmark case and save the results as JSON.
+
+Each case is timed against the in-process mock server with the same latency
+and payload sizes: end-to-end `get_ticket` calls, bulk `get_tickets`, saved
+searches, `Ticket` construction, `parse_keys` and the `editTicket` write
+paths. Results are saved with the version of the client, so the files of two
+releases can be compared: with `--baseline`, cases whose median got slower
+by more than `--tolerance` in every round are reported and the suite exits
+with status 1.
+
+Run with::
+
+    $ python -m benchmarks.suite --output results.json
+    $ python -m benchmarks.suite --baseline results.json --tolerance 0.25
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+import footprintsapi
+from footprintsapi import Footprints
+from footprintsapi.models import Ticket
+from footprintsapi.utils import parse_keys
+
+from .mock_server import RESPONSES, MockFootprintsServer, search_results, ticket_details
+
+ITEM_DEFINITION_ID = 80
+
+# Settings which must match for two results to be compared.
+SETTINGS = (
+    "calls",
+    "rounds",
+    "latency",
+    "custom_fields",
+    "description_size",
+    "rows",
+    "concurrency",
+)
+
+
+def timed(func: Callable[[], object], calls: int) -> List[float]:
+    """Return the seconds taken by each of `calls` calls, after a warm up call."""
+    func()
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(rounds: List[List[float]], operations: int = 1) -> dict:
+    """Summarize the timings of a case.
+
+    :param rounds: The seconds taken by each sample, per round. The lowest
+    median of a round is the one compared between results, as it is the least
+    disturbed by the rest of the machine.
+
+    :param operations: The number of operations made by each sample, such as the
+    tickets of a bulk fetch.
+    """
+    ordered = sorted(sample for samples in rounds for sample in samples)
+    total = sum(ordered)
+    return dict(
+        best=min(statistics.median(samples) for samples in rounds),
+        samples=len(ordered),
+        operations=len(ordered) * operations,
+        throughput=len(ordered) * operations / total if total else None,
+        mean=total / len(ordered),
+        p50=statistics.median(ordered),
+        p95=ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        max=ordered[-1],
+    )
+
+
+def ticket_fields(custom_fields: int) -> dict:
+    """Return the `ticket_fields` of an edit setting `custom_fields` fields."""
+    return {
+        "item_fields": [
+            {"field_name": f"Custom Field {i}", "field_value": {"value": [f"{i}"]}}
+            for i in range(max(1, custom_fields))
+        ]
+    }
+
+
+def construct_tickets(requester, params: dict, calls: int) -> List[float]:
+    """Return the seconds taken to build each `Ticket` from its own response."""
+    responses = iter(
+        [
+            requester.request("getTicketDetails", params, bypass_cache=True)
+            for _ in range(calls + 1)
+        ]
+    )
+    return timed(lambda: Ticket(None, next(responses)), calls)
+
+
+def run_cases(fp: Footprints, args: argparse.Namespace) -> Dict[str, dict]:
+    """Time every case selected by `args` and return their summaries."""
+    requester = fp._requester
+    params = dict(item_definition_id=ITEM_DEFINITION_ID, item_id=9001)
+    ids = list(range(1, args.concurrency * 4 + 1))
+    batches = max(1, args.calls // len(ids))
+    searches = max(1, args.calls // 10)
+    fields = ticket_fields(args.custom_fields)
+    changes = [(ticket_id, fields) for ticket_id in ids]
+    response = requester.request("getTicketDetails", params, raw=True)
+    request = dict(params, ticket_fields=fields)
+
+    def convert_keys() -> None:
+        parse_keys(response, "snake_case")
+        parse_keys(request, depth=8)
+
+    # The function timing each case and the operations made by each sample.
+    cases = dict(
+        get_ticket=(
+            lambda: timed(lambda: fp.get_ticket(ITEM_DEFINITION_ID, 9001), args.calls),
+            1,
+        ),
+        get_tickets=(
+            lambda: timed(
+                lambda: fp.get_tickets(
+                    ITEM_DEFINITION_ID, ids, concurrency=args.concurrency
+                ),
+                batches,
+            ),
+            len(ids),
+        ),
+        get_search=(lambda: timed(lambda: fp.get_search(1), searches), 1),
+        iter_search=(
+            lambda: timed(lambda: sum(1 for _ in fp.iter_search(1)), searches),
+            1,
+        ),
+        ticket_construction=(
+            lambda: construct_tickets(requester, params, args.calls),
+            1,
+        ),
+        parse_keys=(lambda: timed(convert_keys, args.calls * 10), 1),
+        update_ticket=(
+            lambda: timed(
+                lambda: fp.update_ticket(ITEM_DEFINITION_ID, 9001, fields), args.calls
+            ),
+            1,
+        ),
+        update_tickets=(
+            lambda: timed(
+                lambda: fp.update_tickets(
+                    ITEM_DEFINITION_ID, changes, concurrency=args.concurrency
+                ),
+                batches,
+            ),
+            len(ids),
+        ),
+    )
+    unknown = set(args.cases or ()) - set(cases)
+    if unknown:
+        raise SystemExit(f"Unknown cases: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name, (case, operations) in cases.items():
+        if not args.cases or name in args.cases:
+            rounds = [case() for _ in range(args.rounds)]
+            results[name] = summarize(rounds, operations)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Return the cases whose best median got slower than the baseline's.
+
+    :param tolerance: The share by which a median may grow, 0.25 for 25%.
+    """
+    changed = [
+        name
+        for name in SETTINGS
+        if results["settings"].get(name) != baseline["settings"].get(name)
+    ]
+    if changed:
+        print(
+            f"Settings differ from the baseline ({', '.join(changed)}), "
+            "the comparison is only indicative.",
+            file=sys.stderr,
+        )
+
+    regressions = []
+    for name, result in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["best"] / before["best"]
+        print(f"{name:>20}: {ratio:5.2f}x the median of {baseline['version']}")
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    """Run the suite, print and save the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--custom-fields", type=int, default=20)
+    parser.add_argument("--description-size", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--cases", nargs="*", help="The cases to run, all by default.")
+    parser.add_argument("--output", help="The JSON file to save the results to.")
+    parser.add_argument("--baseline", help="A JSON file of earlier results.")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    responses = dict(
+        RESPONSES,
+        getTicketDetails=ticket_details(
+            args.custom_fields, "x" * args.description_size
+        ),
+        runSearch=search_results(args.rows),
+    )
+    with MockFootprintsServer(responses, latency=args.latency) as server:
+        fp = Footprints(
+            "client",
+            "secret",
+            server.wsdl_url,
+            cache_policies={"getTicketDetails": None},
+            pool_maxsize=args.concurrency,
+        )
+        results = dict(
+            version=footprintsapi.__version__,
+            python=platform.python_version(),
+            platform=platform.platform(),
+            created=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            settings={name: getattr(args, name) for name in SETTINGS},
+            results=run_cases(fp, args),
+        )
+
+    for name, result in results["results"].items():
+        print(
+            f"{name:>20}: {result['throughput']:9.1f} ops/s, "
+            f"p50 {result['p50'] * 1e3:8.3f}ms, p95 {result['p95'] * 1e3:8.3f}ms"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Slower than the baseline: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """Required init file."""
 
-from footprintsapi.footprints import Footprints
+from footprintsapi.footprints import AsyncFootprints, Footprints
 
-__all__ = ["Footprints"]
+__all__ = ["AsyncFootprints", "Footprints"]
 
 __version__ = "1.0.7"
@@ -0,0 +1,238 @@
+"""Circuit breaker failing fast while Footprints is down."""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from .exceptions import CircuitOpen
+from .retry import TRANSIENT_STATUSES, is_transient
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop calling Footprints after repeated network or server failures.
+
+    The circuit opens after `failure_threshold` consecutive failures, or when
+    `failure_rate` of the last `window` calls failed. While open every call is
+    rejected with `CircuitOpen`. After `reset_timeout` seconds the next caller
+    runs a cheap probe (`listContainerDefinitions` by default), closing the
+    circuit when it succeeds and opening it again otherwise.
+
+    Only connection errors, timeouts and 5xx/429 responses count as failures,
+    SOAP faults and validation errors mean the server is up.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30,
+        probe_method: str = "listContainerDefinitions",
+        statuses: Iterable[int] = (500,) + TRANSIENT_STATUSES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Init function.
+
+        :param failure_threshold: Consecutive failures opening the circuit.
+
+        :param failure_rate: The share of failed calls in the window opening the circuit.
+
+        :param window: The number of recent calls the failure rate is measured over.
+
+        :param min_calls: Calls needed in the window before the rate is considered.
+
+        :param reset_timeout: Seconds to wait before probing an open circuit.
+
+        :param probe_method: The SOAP method called to check if Footprints recovered.
+
+        :param statuses: The HTTP statuses counted as failures.
+
+        :param clock: Returns the current time in seconds, `time.monotonic` by default.
+        """
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.probe_method = probe_method
+        self.statuses = frozenset(statuses)
+        self.clock = clock
+        self.state = CLOSED
+        self.opened_at = None
+        self.consecutive_failures = 0
+        self.rejected = 0
+        self.trips = 0
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        """Return False while calls are being rejected."""
+        return self.state == CLOSED
+
+    def is_failure(self, exception: Exception) -> bool:
+        """Check if an exception means Footprints is unavailable."""
+        return is_transient(exception, self.statuses)
+
+    def _admit(self) -> bool:
+        """Reject the call while open, return True when the caller must probe."""
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            if (
+                self.state == OPEN
+                and self.clock() - self.opened_at >= self.reset_timeout
+            ):
+                # Only the first caller probes, the others are still rejected.
+                self.state = HALF_OPEN
+                return True
+            self.rejected += 1
+        raise CircuitOpen()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = self.clock()
+        self.trips += 1
+
+    def _probed(self, exception: Optional[Exception]) -> None:
+        with self._lock:
+            if exception is None:
+                self.state = CLOSED
+                self.consecutive_failures = 0
+                self._outcomes.clear()
+            else:
+                self._open()
+
+    def record(self, exception: Optional[Exception] = None) -> None:
+        """Record the outcome of a call.
+
+        :param exception: The exception raised by the call, None on success.
+        """
+        failed = exception is not None and self.is_failure(exception)
+        with self._lock:
+            self._outcomes.append(failed)
+            self.consecutive_failures = self.consecutive_failures + 1 if failed else 0
+            if self.state != CLOSED or not failed:
+                return
+            failures = sum(self._outcomes)
+            if self.consecutive_failures >= self.failure_threshold or (
+                len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+    def call(self, func: Callable[[], Any], probe: Optional[Callable] = None) -> Any:
+        """Call a function unless the circuit is open.
+
+        :param func: The function making the call.
+
+        :param probe: The function probing Footprints when the circuit half opens.
+        The call itself is the probe when not given.
+        """
+        if self._admit():
+            if probe is None:
+                return self._probe_with(func)
+            try:
+                self._probe_with(probe)
+            except CircuitOpen:
+                raise
+            except Exception:
+                # The probe got an answer, Footprints is up.
+                pass
+        try:
+            result = func()
+        except Exception as e:
+            self.record(e)
+            raise
+        self.record()
+        return result
+
+    def _probe_with(self, func: Callable[[], Any]) -> Any:
+        try:
+            result = func()
+        except Exception as e:
+            failed = self.is_failure(e)
+            self._probed(e if failed else None)
+            if failed:
+                raise CircuitOpen() from e
+            raise
+        except BaseException:
+            # Interrupted probes, such as cancelled tasks, leave the circuit open.
+            self._probed(CircuitOpen())
+            raise
+        self._probed(None)
+        return result
+
+    async def acall(
+        self,
+        func: Callable[[], Awaitable],
+        probe: Optional[Callable[[], Awaitable]] = None,
+    ) -> Any:
+        """Await a coroutine function unless the circuit is open.
+
+        :param func: The coroutine function making the call.
+
+        :param probe: The coroutine function probing Footprints when the circuit
+        half opens. The call itself is the probe when not given.
+        """
+        if self._admit():
+            if probe is None:
+                return await self._aprobe_with(func)
+            try:
+                await self._aprobe_with(probe)
+            except CircuitOpen:
+                raise
+            except Exception:
+                # The probe got an answer, Footprints is up.
+                pass
+        try:
+            result = await func()
+        except Exception as e:
+            self.record(e)
+            raise
+        self.record()
+        return result
+
+    async def _aprobe_with(self, func: Callable[[], Awaitable]) -> Any:
+        try:
+            result = await func()
+        except Exception as e:
+            failed = self.is_failure(e)
+            self._probed(e if failed else None)
+            if failed:
+                raise CircuitOpen() from e
+            raise
+        except BaseException:
+            # Interrupted probes, such as cancelled tasks, leave the circuit open.
+            self._probed(CircuitOpen())
+            raise
+        self._probed(None)
+        return result
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures."""
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._outcomes.clear()
+
+    def stats(self) -> dict:
+        """Return the state of the circuit, suitable for health checks."""
+        with self._lock:
+            calls = len(self._outcomes)
+            return dict(
+                state=self.state,
+                healthy=self.state == CLOSED,
+                consecutive_failures=self.consecutive_failures,
+                failure_rate=sum(self._outcomes) / calls if calls else 0.0,
+                opened_for=(
+                    self.clock() - self.opened_at if self.state != CLOSED else None
+                ),
+                rejected=self.rejected,
+                trips=self.trips,
+            )
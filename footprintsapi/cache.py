@@ -0,0 +1,440 @@
+"""Caches used to avoid redundant round-trips to the Footprints API."""
+
+import copy
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .utils import get_attributes
+
+MISSING = object()
+
+
+class LRUCache:
+    """A thread-safe, size bounded, least recently used cache."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None) -> None:
+        """Init function.
+
+        :param maxsize: The maximum number of entries to keep. A size of 0
+        disables the cache.
+
+        :param ttl: Seconds an entry stays valid, entries never expire by default.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check if a key is cached without affecting its recency."""
+        return key in self._data
+
+    def keys(self) -> List[Hashable]:
+        """Return a snapshot of the cached keys, least recently used first."""
+        with self._lock:
+            return list(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for a key, marking it as recently used."""
+        with self._lock:
+            expires, value = self._data.get(key, (None, MISSING))
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                value = MISSING
+            if value is MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key from the cache and return its value."""
+        with self._lock:
+            return self._data.pop(key, (None, default))[1]
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """Return the cache counters."""
+        return dict(
+            hits=self.hits, misses=self.misses, size=len(self), maxsize=self.maxsize
+        )
+
+
+class SqliteItemIdStore:
+    """Persist item number to item id mappings in a sqlite database.
+
+    The table lives next to the WSDL cache when sharing its `storage_url`.
+    """
+
+    def __init__(self, path: str, timeout: Optional[int] = 60) -> None:
+        """Init function.
+
+        :param path: The sqlite database path.
+
+        :param timeout: Seconds to wait for the database lock.
+        """
+        if path == ":memory:":
+            raise ValueError("The item id store requires a database file.")
+
+        self._path = path
+        self._timeout = timeout
+        self._lock = threading.RLock()
+
+        with self.db_connection() as conn:
+            conn.execute(
+                """
+                    CREATE TABLE IF NOT EXISTS item_ids
+                    (item_definition_id text, item_number text, item_id integer,
+                    PRIMARY KEY (item_definition_id, item_number))
+                """
+            )
+            conn.commit()
+
+    @contextmanager
+    def db_connection(self):
+        """Open a connection to the database."""
+        with self._lock:
+            connection = sqlite3.connect(self._path, timeout=self._timeout)
+            try:
+                yield connection
+            finally:
+                connection.close()
+
+    def get(self, key: Tuple[str, str]) -> Optional[int]:
+        """Return the stored item id for a key."""
+        with self.db_connection() as conn:
+            row = conn.execute(
+                "SELECT item_id FROM item_ids WHERE item_definition_id=? AND item_number=?",
+                key,
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_many(self, entries: Iterable[Tuple[Tuple[str, str], int]]) -> None:
+        """Store many key and item id pairs at once."""
+        with self.db_connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO item_ids VALUES (?, ?, ?)",
+                [(*key, item_id) for key, item_id in entries],
+            )
+            conn.commit()
+
+
+class ItemIdCache:
+    """Resolve item numbers to item ids without calling `getItemId` twice.
+
+    Lookups are served from an in-memory LRU first, then from the optional
+    sqlite store. The mapping never changes once a ticket exists, so entries
+    never expire.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        path: Optional[str] = None,
+        timeout: Optional[int] = 60,
+    ) -> None:
+        """Init function.
+
+        :param maxsize: The maximum number of mappings kept in memory.
+
+        :param path: An optional sqlite database path to persist the mappings.
+
+        :param timeout: Seconds to wait for the database lock.
+        """
+        self._memory = LRUCache(maxsize)
+        self._store = SqliteItemIdStore(path, timeout) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        item_definition_id: Union[str, int], item_number: Union[str, int]
+    ) -> Tuple[str, str]:
+        """Build the cache key for an item number."""
+        return str(item_definition_id), str(item_number)
+
+    def get(
+        self, item_definition_id: Union[str, int], item_number: Union[str, int]
+    ) -> Optional[int]:
+        """Return the cached item id for an item number, if any."""
+        key = self.key(item_definition_id, item_number)
+        item_id = self._memory.get(key)
+        if item_id is None and self._store:
+            item_id = self._store.get(key)
+            if item_id is not None:
+                self._memory.set(key, item_id)
+
+        with self._lock:
+            if item_id is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return item_id
+
+    def set(
+        self,
+        item_definition_id: Union[str, int],
+        item_number: Union[str, int],
+        item_id: int,
+    ) -> None:
+        """Cache the item id of an item number."""
+        self.update([(self.key(item_definition_id, item_number), item_id)])
+
+    def update(self, entries: Iterable[Tuple[Tuple[str, str], int]]) -> None:
+        """Cache many key and item id pairs at once."""
+        entries = [(key, item_id) for key, item_id in entries if item_id is not None]
+        for key, item_id in entries:
+            self._memory.set(key, item_id)
+        if self._store and entries:
+            self._store.set_many(entries)
+
+    def warm(self, search_rows: Iterable, number_field: str = "Ticket Number") -> int:
+        """Load the mappings found in a `runSearch` result.
+
+        :param search_rows: The rows returned by `Footprints.get_search`.
+
+        :param number_field: The external name of the field holding the item number.
+        The saved search must include it in its columns.
+
+        :return: The number of mappings loaded.
+        """
+        entries = []
+        for row in search_rows or ():
+            try:
+                fields = row["_itemFields"]["itemFields"]
+            except (KeyError, TypeError):
+                continue
+            for _, item_number in get_attributes(fields, [number_field]):
+                if item_number:
+                    key = self.key(row["_itemDefinitionId"], item_number)
+                    entries.append((key, row["_itemId"]))
+
+        self.update(entries)
+        return len(entries)
+
+    def clear(self) -> None:
+        """Remove every in-memory mapping."""
+        self._memory.clear()
+
+    def stats(self) -> dict:
+        """Return the cache counters."""
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._memory),
+            maxsize=self._memory.maxsize,
+            persistent=self._store is not None,
+        )
+
+
+class CachePolicy(NamedTuple):
+    """How long and how many responses of a SOAP method to cache."""
+
+    ttl: float
+    maxsize: int = 256
+
+
+# Definitions rarely change, ticket details go stale quickly.
+DEFAULT_CACHE_POLICIES = {
+    "listContainerDefinitions": CachePolicy(ttl=4 * 60 * 60, maxsize=64),
+    "listFieldDefinitions": CachePolicy(ttl=4 * 60 * 60, maxsize=256),
+    "listItemDefinitions": CachePolicy(ttl=4 * 60 * 60, maxsize=256),
+    "listQuickTemplates": CachePolicy(ttl=4 * 60 * 60, maxsize=256),
+    "getItemDetails": CachePolicy(ttl=5, maxsize=1024),
+    "getTicketDetails": CachePolicy(ttl=5, maxsize=1024),
+}
+
+# Methods whose responses describe a single item, keyed by its identifiers.
+ITEM_METHODS = {
+    "getItemDetails": ("_itemDefinitionId", "_itemId"),
+    "getTicketDetails": ("_itemDefinitionId", "_itemId"),
+}
+
+# The items changed by each write method.
+WRITE_METHODS = {
+    "createCI": (),
+    "createContact": (),
+    "createItem": (),
+    "createOrEditContact": (("_addressBookDefinitionId", "_contactId"),),
+    "createTicket": (),
+    "createTicketAndLinkAssets": (),
+    "editCI": (("_cmdbDefinitionId", "_ciId"),),
+    "editContact": (("_addressBookDefinitionId", "_contactId"),),
+    "editItem": (("_itemDefinitionId", "_itemId"),),
+    "editTicket": (("_ticketDefinitionId", "_ticketId"),),
+    "linkItems": (
+        ("_firstItemDefinitionId", "_firstItemId"),
+        ("_secondItemDefinitionId", "_secondItemId"),
+    ),
+    "linkTickets": (
+        ("_firstTicketDefinitionId", "_firstTicketId"),
+        ("_secondTicketDefinitionId", "_secondTicketId"),
+    ),
+}
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert params into a hashable value independent of key order."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        # Ids are sent as longs, so 80001 and "80001" are the same call.
+        return str(value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _target(params: dict, keys: Tuple[str, str]) -> Optional[Tuple[str, str]]:
+    """Return the (definition id, item id) pair found in params."""
+    definition_id, item_id = (params.get(key) for key in keys)
+    if definition_id is None or item_id is None:
+        return None
+    return str(definition_id), str(item_id)
+
+
+class ResponseCache:
+    """Cache SOAP responses per method with a TTL and LRU eviction.
+
+    Only methods with a policy are cached. Successful write methods invalidate
+    the cached details of the items they change, and any write clears the
+    cached responses of the methods which aren't scoped to an item.
+
+    Responses are copied in and out of the cache, callers may change them. A
+    response fetched before a write invalidated it isn't cached, when `set` is
+    given the `generation` read before the call.
+    """
+
+    # The number of invalidated items remembered to reject stale responses.
+    max_generations = 4096
+
+    def __init__(self, policies: Optional[Dict[str, Optional[CachePolicy]]] = None):
+        """Init function.
+
+        :param policies: Method name to `CachePolicy` mapping merged over
+        `DEFAULT_CACHE_POLICIES`. Map a method to `None` to disable its cache.
+        """
+        policies = {**DEFAULT_CACHE_POLICIES, **(policies or {})}
+        self._caches = {
+            method: LRUCache(policy.maxsize, policy.ttl)
+            for method, policy in policies.items()
+            if policy is not None
+        }
+        self._generation = 0
+        self._invalidated = OrderedDict()
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def _key(self, method_name: str, params: dict) -> Hashable:
+        keys = ITEM_METHODS.get(method_name)
+        return (_target(params, keys) if keys else None), _freeze(params)
+
+    def get(self, method_name: str, params: dict, default: Any = MISSING) -> Any:
+        """Return the cached response for a call."""
+        cache = self._caches.get(method_name)
+        if cache is None:
+            return default
+        response = cache.get(self._key(method_name, params), MISSING)
+        return default if response is MISSING else copy.deepcopy(response)
+
+    def generation(self) -> int:
+        """Return the number of invalidations so far, read it before a call."""
+        return self._generation
+
+    def set(
+        self,
+        method_name: str,
+        params: dict,
+        response: Any,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Cache the response of a call.
+
+        :param method_name: The name of the method called.
+
+        :param params: The parameters sent to footprints.
+
+        :param response: The response returned by footprints.
+
+        :param generation: The `generation` read before the call. The response
+        isn't cached if its item was invalidated since.
+        """
+        cache = self._caches.get(method_name)
+        if cache is None:
+            return
+        key = self._key(method_name, params)
+        response = copy.deepcopy(response)
+        with self._lock:
+            invalidated = self._invalidated.get(key[0], self._floor)
+            if generation is None or invalidated <= generation:
+                cache.set(key, response)
+
+    def invalidate(self, method_name: str, params: dict) -> None:
+        """Drop the cached responses made stale by a write call."""
+        if method_name not in WRITE_METHODS:
+            return
+
+        targets = {_target(params, keys) for keys in WRITE_METHODS[method_name]}
+        with self._lock:
+            # Methods not scoped to an item are remembered as the None item.
+            self._generation += 1
+            for target in targets | {None}:
+                self._invalidated[target] = self._generation
+                self._invalidated.move_to_end(target)
+            while len(self._invalidated) > self.max_generations:
+                self._floor = self._invalidated.popitem(last=False)[1]
+
+            for cached_method, cache in self._caches.items():
+                if cached_method not in ITEM_METHODS:
+                    if not cached_method.startswith("list"):
+                        cache.clear()
+                    continue
+                for key in cache.keys():
+                    if key[0] in targets:
+                        cache.pop(key)
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        for cache in self._caches.values():
+            cache.clear()
+
+    def stats(self) -> dict:
+        """Return the cache counters per method."""
+        return {method: cache.stats() for method, cache in self._caches.items()}
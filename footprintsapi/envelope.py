@@ -0,0 +1,234 @@
+"""Render request envelopes from templates instead of zeep's serializer.
+
+The envelope of an operation only differs between calls by the values of its
+fields. A template keeps the static part of the envelope, as rendered by zeep
+for a first call, and renders the fields with functions compiled once from the
+WSDL types. Values the templates can't render exactly like zeep, such as nil
+values or objects of another type, raise `UnsupportedValue` so the caller can
+fall back to zeep.
+"""
+
+import copy
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from lxml import etree
+from zeep.wsdl.utils import etree_to_string
+from zeep.xsd import Element
+from zeep.xsd.const import NotSet
+from zeep.xsd.types.builtins import String
+from zeep.xsd.types.simple import AnySimpleType
+from zeep.xsd.valueobjects import CompoundValue
+
+from .raw import is_sequence_type
+
+Encoder = Callable[[List[str], Any], None]
+
+# Characters lxml refuses in text, zeep raises its own error for them.
+INVALID_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+# Characters escaped by lxml, or refused.
+SPECIAL_CHARS = re.compile("[&<>\r\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+# Marks where the fields go in the rendered skeleton.
+BODY_MARK = "FOOTPRINTSAPI-BODY"
+
+
+class UnsupportedValue(Exception):
+    """A value a template can't render exactly like zeep."""
+
+
+def escape(text: str) -> str:
+    """Escape text the way lxml serializes it."""
+    if not SPECIAL_CHARS.search(text):
+        return text
+    if INVALID_CHARS.search(text):
+        raise UnsupportedValue(text)
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    return text
+
+
+class _Context:
+    """State shared while compiling the encoders of an operation."""
+
+    def __init__(self, wrapper: etree._Element) -> None:
+        self.wrapper = wrapper
+        self.prefixes = {}
+        self.compiled = {}
+
+    def tag(self, element: Element) -> Optional[str]:
+        """Return the tag lxml renders for an element, None if it declares a namespace."""
+        qname = element.qname
+        if not qname.namespace:
+            return qname.localname
+        if qname.namespace not in self.prefixes:
+            # Let lxml pick the prefix, as it does when zeep renders the element.
+            probe = etree.SubElement(self.wrapper, qname.text)
+            prefix = probe.prefix
+            self.wrapper.remove(probe)
+            declared = self.wrapper.nsmap.get(prefix) == qname.namespace
+            self.prefixes[qname.namespace] = prefix if declared else None
+        prefix = self.prefixes[qname.namespace]
+        return f"{prefix}:{qname.localname}" if prefix else None
+
+
+def _unsupported(out: List[str], value: Any) -> None:
+    raise UnsupportedValue(value)
+
+
+def _simple_encoder(element: Element, tag: str) -> Encoder:
+    xmlvalue = element.type.xmlvalue
+    # Strings are rendered as they are, skip the conversion.
+    is_string = type(element.type) is String
+    start, end, empty = f"<{tag}>", f"</{tag}>", f"<{tag}/>"
+
+    def encode(out: List[str], value: Any) -> None:
+        if is_string and type(value) is str:
+            out.append(start + escape(value) + end)
+            return
+        try:
+            text = xmlvalue(value)
+        except Exception:
+            raise UnsupportedValue(value) from None
+        if text is None:
+            out.append(empty)
+        elif isinstance(text, str):
+            out.append(start + escape(text) + end)
+        else:
+            raise UnsupportedValue(value)
+
+    return encode
+
+
+def _sequence_encoder(xsd_type: Any, context: _Context) -> Encoder:
+    """Compile the function rendering the children of a sequence from a dict."""
+    children = []
+
+    def encode(out: List[str], value: dict) -> None:
+        for name, encode_child in children:
+            encode_child(out, value.get(name))
+
+    # Registered before compiling the children, for recursive types.
+    context.compiled[id(xsd_type)] = encode
+    for name, element in xsd_type.elements:
+        children.append((name, _element_encoder(element, context)))
+    return encode
+
+
+def _complex_encoder(element: Element, tag: str, context: _Context) -> Encoder:
+    xsd_type = element.type
+    start, end, empty = f"<{tag}>", f"</{tag}>", f"<{tag}/>"
+    if not getattr(xsd_type, "elements_nested", None) and not xsd_type.attributes:
+        # zeep renders types without content as empty elements, whatever the value.
+        return lambda out, value: out.append(empty)
+    if not is_sequence_type(xsd_type):
+        return _unsupported
+
+    content = context.compiled.get(id(xsd_type)) or _sequence_encoder(xsd_type, context)
+
+    def encode(out: List[str], value: Any) -> None:
+        if isinstance(value, CompoundValue):
+            if value._xsd_type != xsd_type:
+                raise UnsupportedValue(value)
+            value = value.__values__
+        elif not isinstance(value, dict):
+            raise UnsupportedValue(value)
+        out.append(start)
+        mark = len(out)
+        content(out, value)
+        if len(out) == mark:
+            out[-1] = empty
+        else:
+            out.append(end)
+
+    return encode
+
+
+def _element_encoder(element: Element, context: _Context) -> Encoder:
+    """Compile the function rendering the occurrences of an element."""
+    tag = context.tag(element)
+    if tag is None:
+        encode_item = _unsupported
+    elif isinstance(element.type, AnySimpleType):
+        encode_item = _simple_encoder(element, tag)
+    else:
+        encode_item = _complex_encoder(element, tag, context)
+
+    many = element.accepts_multiple
+    optional = element.is_optional
+    min_occurs = element.min_occurs
+    max_occurs = element.max_occurs if isinstance(element.max_occurs, int) else None
+
+    def encode(out: List[str], value: Any) -> None:
+        if many and isinstance(value, list):
+            if len(value) < min_occurs or (max_occurs and len(value) > max_occurs):
+                raise UnsupportedValue(value)
+            for item in value:
+                if item is not None:
+                    encode_item(out, item)
+                elif not optional:
+                    raise UnsupportedValue(value)
+        elif value is not None and value is not NotSet:
+            encode_item(out, value)
+        elif not optional:
+            # zeep renders a nil element or raises a validation error.
+            raise UnsupportedValue(value)
+
+    return encode
+
+
+class EnvelopeTemplate:
+    """Render the request envelopes of an operation without zeep's serializer."""
+
+    def __init__(self, operation: Any, envelope: etree._Element, headers: dict) -> None:
+        """Init function.
+
+        :param operation: The zeep binding operation to render the requests of.
+
+        :param envelope: An envelope of the operation rendered by zeep, its
+        static parts are reused.
+
+        :param headers: The http headers zeep sent along with the envelope.
+        """
+        body = operation.input.body
+        if (
+            operation.abstract.wsa_action
+            or operation.input.header.type.elements
+            or not is_sequence_type(body.type)
+        ):
+            raise TypeError(f"Can't render {operation.name} without zeep.")
+
+        skeleton = copy.deepcopy(envelope)
+        wrapper = skeleton.find(f".//{body.qname.text}")
+        if wrapper is None:
+            raise TypeError(f"Can't render {operation.name} without zeep.")
+        del wrapper[:]
+        self.empty = etree_to_string(skeleton)
+        wrapper.text = BODY_MARK
+        self.prefix, self.suffix = (
+            etree_to_string(skeleton).decode("utf-8").split(BODY_MARK)
+        )
+
+        self.name = operation.name
+        self.headers = headers
+        self.part = body.type.elements[0][0]
+        self._encode = _sequence_encoder(body.type, _Context(wrapper))
+
+    def render(self, params: Dict[str, Any]) -> bytes:
+        """Render the envelope of a call.
+
+        :param params: The value of the first part of the request, as passed to zeep.
+        """
+        out = [self.prefix]
+        self._encode(out, {self.part: params})
+        if len(out) == 1:
+            return self.empty
+        out.append(self.suffix)
+        return "".join(out).encode("utf-8")
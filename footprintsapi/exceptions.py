@@ -110,3 +110,20 @@ class Forbidden(FootprintsException):
         "This is most likely due to a permission issue. "
         "Please check your credentials before proceeding."
     )
+
+
+class CircuitOpen(FootprintsException):
+    """Footprints is failing, calls are rejected until it recovers."""
+
+    status_code = HTTPStatus.SERVICE_UNAVAILABLE
+    message = (
+        "Footprints is currently unavailable. "
+        "Calls are rejected until a health probe succeeds."
+    )
+
+
+class ReplayMiss(FootprintsException):
+    """The request was not found in the archive being replayed."""
+
+    status_code = HTTPStatus.NOT_FOUND
+    message = "The request was not recorded in the archive being replayed."
@@ -4,20 +4,74 @@ Contains the footprints client, which all supported endpoints should be
 either directly or indirectly accessible from.
 """
 
-from typing import Optional, Union
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Union
 
 from requests import Response
 from zeep import Settings
 
-from .mixins import CommonMixin
-from .models import FootprintsBaseObject, Item, Ticket
-from .requester import Requester
-from .utils import cleanup_args
+from .breaker import CircuitBreaker
+from .cache import CachePolicy, ItemIdCache
+from .metrics import Metrics
+from .mixins import CommonMixin, GetItemIdMixin
+from .models import (
+    BulkResult,
+    CompactItem,
+    CompactTicket,
+    FootprintsBaseObject,
+    Item,
+    Ticket,
+    TicketChange,
+)
+from .requester import PARAMS_DEPTH, AsyncRequester, Requester
+from .replay import Tape
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .spool import WriteBehind
+from .throttle import Throttle
+from .tracing import RequestHooks, build
+from .utils import cleanup_args, merge_ticket_fields
+
+
+def coalesce_changes(changes: Iterable[tuple]) -> List[TicketChange]:
+    """Merge the changes made to the same ticket, in the order tickets are first seen.
+
+    The fields of a ticket are merged with `merge_ticket_fields`, its assignees
+    are those of the last change setting them.
+
+    :param changes: `TicketChange` or `(ticket_id, ticket_fields[, assignees])` tuples.
+    """
+    grouped = {}
+    for change in changes:
+        change = TicketChange(*change)
+        grouped.setdefault(change.ticket_id, []).append(change)
+
+    coalesced = []
+    for ticket_id, ticket_changes in grouped.items():
+        assignees = None
+        for change in ticket_changes:
+            if change.assignees is not None:
+                assignees = change.assignees
+        fields = [change.ticket_fields for change in ticket_changes]
+        coalesced.append(
+            TicketChange(
+                ticket_id,
+                merge_ticket_fields(field for field in fields if field),
+                assignees,
+            )
+        )
+    return coalesced
 
 
 class Footprints(CommonMixin, FootprintsBaseObject):
     """The main class to be instantiated to provide access to Footprints' SOAP API."""
 
+    requester_class = Requester
+    ticket_class = Ticket
+    item_class = Item
+
     def __init__(
         self,
         client_id: str,
@@ -26,6 +80,28 @@ class Footprints(CommonMixin, FootprintsBaseObject):
         settings: Optional[object] = None,
         storage_url: Optional[str] = None,
         timeout: Optional[int] = 60,
+        item_id_cache: Optional[ItemIdCache] = None,
+        cache_policies: Optional[Dict[str, Optional[CachePolicy]]] = None,
+        lazy: bool = False,
+        snapshot_path: Optional[str] = None,
+        shared_wsdl: bool = False,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 0,
+        keep_alive: bool = True,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        throttle: Optional[Throttle] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        envelope_templates: bool = False,
+        compact_models: bool = False,
+        write_behind: Optional[WriteBehind] = None,
+        metrics: Optional[Metrics] = None,
+        hooks: Optional[RequestHooks] = None,
+        tape: Optional[Tape] = None,
+        single_flight: Optional[SingleFlight] = None,
+        params_depth: int = PARAMS_DEPTH,
     ) -> None:
         """Init function.
 
@@ -38,16 +114,176 @@ class Footprints(CommonMixin, FootprintsBaseObject):
         :param storage_url: A url path for sqlite to store the wsdl.
 
         :param timeout: A timeout for the DB only relevant when providing a storage url.
+
+        :param item_id_cache: The cache used to resolve item numbers to item ids.
+        Defaults to an in-memory LRU, persisted next to the wsdl when providing a
+        storage url.
+
+        :param cache_policies: Per SOAP method response cache policies, merged over
+        `DEFAULT_CACHE_POLICIES`. Map a method to `None` to disable its cache.
+
+        :param lazy: Defer loading the WSDL until the first request.
+
+        :param snapshot_path: A path to a precompiled WSDL snapshot, see
+        `footprintsapi.snapshot`. Written on first use when missing.
+
+        :param shared_wsdl: Share the parsed WSDL with every other instance using
+        the same base url, see `footprintsapi.registry`.
+
+        :param pool_connections: The number of hosts to keep connection pools for.
+
+        :param pool_maxsize: The maximum number of connections kept per host. Raise
+        it along with the `concurrency` of `get_tickets`.
+
+        :param max_retries: The number of times a failed connection is retried.
+
+        :param keep_alive: Reuse connections between requests.
+
+        :param connect_timeout: Seconds to wait for a connection, waits forever by default.
+
+        :param read_timeout: Seconds to wait for a response, waits forever by default.
+
+        :param retry_policy: How transient failures of idempotent reads are retried,
+        see `footprintsapi.retry`. Failed calls aren't retried by default.
+
+        :param throttle: Rate and concurrency limits for reads and writes, see
+        `footprintsapi.throttle`. Share one throttle between the objects calling the
+        same endpoint. Unlimited by default.
+
+        :param breaker: The circuit breaker failing calls fast while footprints is
+        down, see `footprintsapi.breaker`. Its `stats()` suit health checks. Disabled
+        by default.
+
+        :param envelope_templates: Render the request envelopes of `create*`,
+        `edit*` and `link*` calls from templates checked against zeep on first use,
+        see `footprintsapi.envelope`. Off by default.
+
+        :param compact_models: Return `CompactTicket` and `CompactItem` objects, which
+        decode the response on first attribute access and use far less memory.
+
+        :param write_behind: Spool `create*`, `edit*` and `link*` calls to a local
+        sqlite file and send them from a background thread, see
+        `footprintsapi.spool`. Spooled calls return their id in the spool, pass
+        `write_behind=False` to a call to wait for its response instead.
+
+        :param metrics: The per method latency, size, retry and error counters, see
+        `footprintsapi.metrics`. Share one to aggregate several objects, or pass
+        one with callbacks to export every call.
+
+        :param hooks: Callbacks around every call and model built, with the time
+        spent serializing, on the network and deserializing, see
+        `footprintsapi.tracing`.
+
+        :param tape: A `Recorder` archiving every exchange with footprints, or a
+        `Replayer` answering from such an archive without any network, see
+        `footprintsapi.replay`.
+
+        :param single_flight: Coalesces identical read calls made while one is in
+        flight into that call, see `footprintsapi.singleflight`. Its `stats()`
+        count the calls coalesced. Disabled by default.
+
+        :param params_depth: The nesting levels of the call params whose keys are
+        converted to footprints' naming, such as `item_id` to `_itemId`. Lower it
+        for params nested less deeply, or pass 0 to send params already named as
+        footprints expects without converting them.
         """
         if settings and not isinstance(settings, Settings):
             raise TypeError("Settings are expected in the form of a Settings object.")
 
-        self._requester = Requester(
-            client_id, client_secret, base_url, settings, storage_url, timeout
+        self._requester = self.requester_class(
+            client_id,
+            client_secret,
+            base_url,
+            settings,
+            storage_url,
+            timeout,
+            cache_policies=cache_policies,
+            lazy=lazy,
+            snapshot_path=snapshot_path,
+            shared_wsdl=shared_wsdl,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            keep_alive=keep_alive,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            retry_policy=retry_policy,
+            throttle=throttle,
+            breaker=breaker,
+            envelope_templates=envelope_templates,
+            write_behind=write_behind,
+            metrics=metrics,
+            hooks=hooks,
+            tape=tape,
+            single_flight=single_flight,
+            params_depth=params_depth,
+        )
+        self.write_behind = self._requester.write_behind
+        self.retry_policy = self._requester.retry_policy
+        self.throttle = self._requester.throttle
+        self.breaker = self._requester.breaker
+        self.single_flight = self._requester.single_flight
+        if compact_models:
+            self.ticket_class = CompactTicket
+            self.item_class = CompactItem
+        self.item_id_cache = item_id_cache or ItemIdCache(
+            path=storage_url, timeout=timeout
         )
         # Initialize any mixins.
         super().__init__()
 
+    def get_item_id(
+        self,
+        item_definition_id: Union[str, int],
+        item_number: Union[str, int],
+        submitter: Optional[str] = None,
+        **kwargs,
+    ) -> str:
+        """Retrieve an item id, skipping the round-trip for known item numbers.
+
+        :param item_number: The Service request number,
+        can optionally include the organization prefix.
+
+        :param item_definition_id: The global item definition.
+
+        :param submitter: Userid/username of submitter.
+
+        :calls: `GET getItemId`
+
+        :return: Item id.
+        """
+        item_id = self.item_id_cache.get(item_definition_id, item_number)
+        if item_id is None:
+            item_id = super().get_item_id(
+                item_definition_id, item_number, submitter, **kwargs
+            )
+            self.item_id_cache.set(item_definition_id, item_number, item_id)
+        return item_id
+
+    def warm_item_ids(
+        self,
+        search_id: Union[str, int],
+        number_field: str = "Ticket Number",
+        submitter: Optional[str] = None,
+        **kwargs,
+    ) -> int:
+        """Run a saved search and cache the item ids of every row.
+
+        :param search_id: The saved search id. The search must include the item
+        number field in its columns.
+
+        :param number_field: The external name of the field holding the item number.
+
+        :param submitter: Userid/username of submitter.
+
+        :calls: `GET runSearch`
+
+        :return: The number of item ids cached.
+        """
+        return self.item_id_cache.warm(
+            self.get_search(search_id, submitter, **kwargs), number_field
+        )
+
     def get_item(
         self,
         item_definition_id: Union[str, int],
@@ -72,10 +308,13 @@ class Footprints(CommonMixin, FootprintsBaseObject):
 
         :return: Item object.
         """
-        return Item(
+        return build(
+            self._requester.hooks,
+            "getItemDetails",
+            self.item_class,
             *self._obj_data(
                 method_name="getItemDetails", params=cleanup_args(locals()), **kwargs
-            )
+            ),
         )
 
     def get_ticket(
@@ -110,10 +349,165 @@ class Footprints(CommonMixin, FootprintsBaseObject):
             params["item_number"] = item_id
             params["item_id"] = self.get_item_id(**params)
 
-        return Ticket(
-            *self._obj_data(method_name="getTicketDetails", params=params, **kwargs)
+        return build(
+            self._requester.hooks,
+            "getTicketDetails",
+            self.ticket_class,
+            *self._obj_data(method_name="getTicketDetails", params=params, **kwargs),
         )
 
+    def get_tickets(
+        self,
+        item_definition_id: Union[str, int],
+        ids: Iterable[Union[str, int]],
+        concurrency: int = 8,
+        submitter: Optional[str] = None,
+        fields_to_retrieve: Optional[list] = None,
+        **kwargs,
+    ) -> List[BulkResult]:
+        """Get many footprints tickets concurrently.
+
+        Item numbers are resolved with `getItemId` ahead of the detail fetches,
+        each detail fetch is dispatched as soon as its item id is known.
+
+        :param item_definition_id: The global item definition.
+
+        :param ids: The tickets' item identifiers or item_numbers.
+
+        :param concurrency: The maximum number of calls in flight.
+
+        :param submitter: Userid/username of submitter.
+
+        :param fields_to_retrieve: What specific fields to retrieve. List of external field names.
+
+        :calls: `GET getItemId`, `GET getTicketDetails`
+
+        :return: List of results in the same order as the ids. Failed ids hold
+        the raised exception instead of a Ticket object.
+        """
+        ids = list(ids)
+        outcomes = [Future() for _ in ids]
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+
+        def fetch(index: int, item_id: Union[str, int]) -> None:
+            try:
+                ticket = self.get_ticket(
+                    item_definition_id, item_id, submitter, fields_to_retrieve, **kwargs
+                )
+            except Exception as e:
+                outcomes[index].set_result(BulkResult(ids[index], error=e))
+            else:
+                outcomes[index].set_result(BulkResult(ids[index], result=ticket))
+
+        def resolved(index: int, lookup: Future) -> None:
+            if lookup.exception() is not None:
+                outcomes[index].set_result(
+                    BulkResult(ids[index], error=lookup.exception())
+                )
+            else:
+                executor.submit(fetch, index, lookup.result())
+
+        try:
+            for index, item_id in enumerate(ids):
+                if isinstance(item_id, str):
+                    lookup = executor.submit(
+                        self.get_item_id,
+                        item_definition_id,
+                        item_id,
+                        submitter,
+                        **kwargs,
+                    )
+                    lookup.add_done_callback(partial(resolved, index))
+                else:
+                    executor.submit(fetch, index, item_id)
+
+            return [outcome.result() for outcome in outcomes]
+        finally:
+            executor.shutdown(wait=False)
+
+    def update_tickets(
+        self,
+        ticket_definition_id: Union[str, int],
+        changes: Iterable[tuple],
+        concurrency: int = 8,
+        submitter: Optional[str] = None,
+        **kwargs,
+    ) -> List[BulkResult]:
+        """Update many footprints tickets concurrently.
+
+        The changes made to the same ticket are merged into a single `editTicket`
+        call, see `coalesce_changes`.
+
+        :param ticket_definition_id: The container ticket definition id.
+
+        :param changes: `TicketChange` or `(ticket_id, ticket_fields[, assignees])`
+        tuples, `ticket_fields` being the dict taken by `Ticket.update`.
+
+        :param concurrency: The maximum number of calls in flight.
+
+        :param submitter: Userid/username of submitter.
+
+        :calls: `PUT editTicket`
+
+        :return: List of results, one per ticket in the order they were first
+        changed. Failed tickets hold the raised exception instead of the ticket id.
+        """
+        coalesced = coalesce_changes(changes)
+
+        def update(change: TicketChange) -> BulkResult:
+            try:
+                result = self.update_ticket(
+                    ticket_definition_id,
+                    change.ticket_id,
+                    change.ticket_fields,
+                    assignees=change.assignees,
+                    submitter=submitter,
+                    **kwargs,
+                )
+            except Exception as e:
+                return BulkResult(change.ticket_id, error=e)
+            return BulkResult(change.ticket_id, result=result)
+
+        if len(coalesced) <= 1 or concurrency <= 1:
+            return [update(change) for change in coalesced]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(update, coalesced))
+
+    def metrics(self) -> Dict[str, dict]:
+        """Return the calls, errors, retries, bytes and latency percentiles per method."""
+        return self._requester.metrics.snapshot()
+
+    def prometheus_metrics(self, prefix: str = "footprints") -> str:
+        """Return the per method metrics in Prometheus' text exposition format.
+
+        :param prefix: The prefix of the metric names.
+        """
+        return self._requester.metrics.prometheus(prefix)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the writes spooled so far are sent or set aside.
+
+        :param timeout: The maximum number of seconds to wait, forever by default.
+
+        :return: Whether the writes were all handled in time, True without
+        write-behind.
+        """
+        if self.write_behind is None:
+            return True
+        return self.write_behind.flush(timeout)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Flush the spooled writes and stop sending them in the background.
+
+        :param timeout: The maximum number of seconds to wait for the flush.
+
+        :return: Whether the writes were all handled in time, True without
+        write-behind.
+        """
+        if self.write_behind is None:
+            return True
+        return self.write_behind.join(timeout)
+
     def create_ticket(
         self,
         ticket_definition_id: Union[str, int],
@@ -149,3 +543,243 @@ class Footprints(CommonMixin, FootprintsBaseObject):
         return self._requester.request(
             method_name="createTicket", params=cleanup_args(locals()), **kwargs
         )
+
+
+class AsyncFootprints(Footprints):
+    """Asyncio twin of :class:`Footprints`.
+
+    Every endpoint method returns a coroutine which resolves to the same
+    value the synchronous client would return.
+    """
+
+    requester_class = AsyncRequester
+
+    async def __aenter__(self) -> "AsyncFootprints":
+        """Enter the async context manager."""
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        """Close the client on exit."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying http connections."""
+        await self._requester.aclose()
+
+    async def get_item_id(
+        self,
+        item_definition_id: Union[str, int],
+        item_number: Union[str, int],
+        submitter: Optional[str] = None,
+        **kwargs,
+    ) -> str:
+        """Retrieve an item id, skipping the round-trip for known item numbers.
+
+        :param item_number: The Service request number,
+        can optionally include the organization prefix.
+
+        :param item_definition_id: The global item definition.
+
+        :param submitter: Userid/username of submitter.
+
+        :calls: `GET getItemId`
+
+        :return: Item id.
+        """
+        item_id = self.item_id_cache.get(item_definition_id, item_number)
+        if item_id is None:
+            item_id = await GetItemIdMixin.get_item_id(
+                self, item_definition_id, item_number, submitter, **kwargs
+            )
+            self.item_id_cache.set(item_definition_id, item_number, item_id)
+        return item_id
+
+    async def warm_item_ids(
+        self,
+        search_id: Union[str, int],
+        number_field: str = "Ticket Number",
+        submitter: Optional[str] = None,
+        **kwargs,
+    ) -> int:
+        """Run a saved search and cache the item ids of every row.
+
+        :param search_id: The saved search id. The search must include the item
+        number field in its columns.
+
+        :param number_field: The external name of the field holding the item number.
+
+        :param submitter: Userid/username of submitter.
+
+        :calls: `GET runSearch`
+
+        :return: The number of item ids cached.
+        """
+        return self.item_id_cache.warm(
+            await self.get_search(search_id, submitter, **kwargs), number_field
+        )
+
+    async def get_item(
+        self,
+        item_definition_id: Union[str, int],
+        item_id: Union[str, int],
+        fields_to_retrieve: Optional[list] = None,
+        submitter: Optional[str] = None,
+        **kwargs,
+    ) -> Item:
+        """Retrieve item details.
+
+        :param item_id: The id of the item to retrieve.
+
+        :param item_definition_id: The global item definition.
+
+        :param fields_to_retrieve: List of external field names to retrieve.
+
+        :param submitter: Userid/username of submitter.
+
+        :calls: `GET getItemDetails`
+
+        :return: Item object.
+        """
+        response = await self._requester.request(
+            method_name="getItemDetails", params=cleanup_args(locals()), **kwargs
+        )
+        return build(
+            self._requester.hooks,
+            "getItemDetails",
+            self.item_class,
+            self._requester,
+            response,
+        )
+
+    async def get_ticket(
+        self,
+        item_definition_id: Union[str, int],
+        item_id: Union[str, int],
+        submitter: Optional[str] = None,
+        fields_to_retrieve: Optional[list] = None,
+        **kwargs,
+    ) -> Ticket:
+        """Get a footprints ticket.
+
+        :param item_definition_id: The global item definition.
+
+        :param item_id: The ticket's item identifier or item_number.
+
+        :param submitter: Userid/username of submitter.
+
+        :param fields_to_retrieve: What specific fields to retrieve. List of external field names.
+
+        :calls: `GET getTicketDetails`
+
+        :return: Ticket object
+        """
+        params = cleanup_args(locals())
+
+        if kwargs:
+            params = {**params, **kwargs}
+
+        if isinstance(item_id, str):
+            params["item_number"] = item_id
+            params["item_id"] = await self.get_item_id(**params)
+
+        response = await self._requester.request(
+            method_name="getTicketDetails", params=params, **kwargs
+        )
+        return build(
+            self._requester.hooks,
+            "getTicketDetails",
+            self.ticket_class,
+            self._requester,
+            response,
+        )
+
+    async def get_tickets(
+        self,
+        item_definition_id: Union[str, int],
+        ids: Iterable[Union[str, int]],
+        concurrency: int = 8,
+        submitter: Optional[str] = None,
+        fields_to_retrieve: Optional[list] = None,
+        **kwargs,
+    ) -> List[BulkResult]:
+        """Get many footprints tickets concurrently.
+
+        :param item_definition_id: The global item definition.
+
+        :param ids: The tickets' item identifiers or item_numbers.
+
+        :param concurrency: The maximum number of tickets in flight.
+
+        :param submitter: Userid/username of submitter.
+
+        :param fields_to_retrieve: What specific fields to retrieve. List of external field names.
+
+        :calls: `GET getItemId`, `GET getTicketDetails`
+
+        :return: List of results in the same order as the ids. Failed ids hold
+        the raised exception instead of a Ticket object.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(item_id: Union[str, int]) -> BulkResult:
+            async with semaphore:
+                try:
+                    ticket = await self.get_ticket(
+                        item_definition_id,
+                        item_id,
+                        submitter,
+                        fields_to_retrieve,
+                        **kwargs,
+                    )
+                except Exception as e:
+                    return BulkResult(item_id, error=e)
+                return BulkResult(item_id, result=ticket)
+
+        return list(await asyncio.gather(*(fetch(item_id) for item_id in ids)))
+
+    async def update_tickets(
+        self,
+        ticket_definition_id: Union[str, int],
+        changes: Iterable[tuple],
+        concurrency: int = 8,
+        submitter: Optional[str] = None,
+        **kwargs,
+    ) -> List[BulkResult]:
+        """Update many footprints tickets concurrently.
+
+        :param ticket_definition_id: The container ticket definition id.
+
+        :param changes: `TicketChange` or `(ticket_id, ticket_fields[, assignees])`
+        tuples, `ticket_fields` being the dict taken by `Ticket.update`.
+
+        :param concurrency: The maximum number of tickets in flight.
+
+        :param submitter: Userid/username of submitter.
+
+        :calls: `PUT editTicket`
+
+        :return: List of results, one per ticket in the order they were first
+        changed. Failed tickets hold the raised exception instead of the ticket id.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def update(change: TicketChange) -> BulkResult:
+            async with semaphore:
+                try:
+                    result = await self.update_ticket(
+                        ticket_definition_id,
+                        change.ticket_id,
+                        change.ticket_fields,
+                        assignees=change.assignees,
+                        submitter=submitter,
+                        **kwargs,
+                    )
+                except Exception as e:
+                    return BulkResult(change.ticket_id, error=e)
+                return BulkResult(change.ticket_id, result=result)
+
+        return list(
+            await asyncio.gather(
+                *(update(change) for change in coalesce_changes(changes))
+            )
+        )
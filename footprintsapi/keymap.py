@@ -0,0 +1,232 @@
+"""Element names of the Footprints schema.
+
+`FOOTPRINTS_KEYS` lists the element names of the Footprints 12 external API
+schema. `footprintsapi.utils` converts them once at import into `KEY_TABLE`,
+which `parse_keys` looks keys up in before falling back to the memoized
+conversions. Requesters warm those with the names of the WSDL they load.
+
+Regenerate the table from another WSDL with::
+
+    $ python -m footprintsapi.keymap https://{host}/footprints/...?wsdl
+"""
+
+import argparse
+from typing import List
+
+from zeep import Client
+from zeep.wsdl import Document
+
+FOOTPRINTS_KEYS = (
+    "CreateCIRequest",
+    "CreateContactRequest",
+    "CreateItemRequest",
+    "CreateTicketAndLinkAssetsRequest",
+    "CreateTicketRequest",
+    "DefinitionResponse",
+    "DefinitionsResponse",
+    "DescriptionDetail",
+    "EditCIRequest",
+    "EditContactRequest",
+    "EditItemRequest",
+    "EditTicketRequest",
+    "FieldDefinitionResponse",
+    "FieldDefinitionsResponse",
+    "GetContactAssociatedTicketsRequest",
+    "GetItemDetailsRequest",
+    "GetItemIdRequest",
+    "ItemDetailsResponse",
+    "LinkItemsRequest",
+    "LinkTicketsRequest",
+    "ListContainerDefinitionsRequest",
+    "ListFieldDefinitionsRequest",
+    "ListItemDefinitionsRequest",
+    "ListQuickTemplatesRequest",
+    "ListSearchesRequest",
+    "QuickTemplate",
+    "QuickTemplatesResponse",
+    "RunSearchRequest",
+    "TicketDetailsResponse",
+    "_addressBookDefinitionId",
+    "_allDescriptionsList",
+    "_allDescriptionsText",
+    "_assetsList",
+    "_assignees",
+    "_assigness",
+    "_ciFields",
+    "_ciId",
+    "_cmdbDefinitionId",
+    "_contactDefinitionId",
+    "_contactFields",
+    "_contactId",
+    "_containerDefinitionId",
+    "_containerDefinitionName",
+    "_containerSubtypeName",
+    "_createDate",
+    "_createTime",
+    "_customFields",
+    "_data",
+    "_date",
+    "_definitionDescription",
+    "_definitionId",
+    "_definitionName",
+    "_definitions",
+    "_description",
+    "_descriptionStamp",
+    "_editors",
+    "_emailRecipients",
+    "_eventStarter",
+    "_events",
+    "_fieldDefinitions",
+    "_fieldExternalName",
+    "_fieldType",
+    "_fieldsToRetrieve",
+    "_firstItemDefinitionId",
+    "_firstItemId",
+    "_firstTicketDefinitionId",
+    "_firstTicketId",
+    "_history",
+    "_itemDefinitionId",
+    "_itemDefinitionName",
+    "_itemFields",
+    "_itemId",
+    "_itemNumber",
+    "_itemSubtypeName",
+    "_itemTypeName",
+    "_items",
+    "_lastEditDate",
+    "_lastEditTime",
+    "_linkTypeName",
+    "_mostRecentEdit",
+    "_primaryKeyValue",
+    "_priority",
+    "_quickTemplateId",
+    "_quickTemplates",
+    "_searchDescription",
+    "_searchId",
+    "_searchName",
+    "_searchType",
+    "_searches",
+    "_secondItemDefinitionId",
+    "_secondItemId",
+    "_secondTicketDefinitionId",
+    "_secondTicketId",
+    "_selectContact",
+    "_stamp",
+    "_status",
+    "_submitter",
+    "_subtypeName",
+    "_templateDescription",
+    "_templateId",
+    "_templateName",
+    "_ticketDefinitionId",
+    "_ticketFields",
+    "_ticketId",
+    "_ticketNumber",
+    "_title",
+    "_userName",
+    "action",
+    "assetFields",
+    "assets",
+    "createCI",
+    "createCIRequest",
+    "createCIResponse",
+    "createContact",
+    "createContactRequest",
+    "createContactResponse",
+    "createItem",
+    "createItemRequest",
+    "createItemResponse",
+    "createOrEditContact",
+    "createOrEditContactRequest",
+    "createOrEditContactResponse",
+    "createTicket",
+    "createTicketAndLinkAssets",
+    "createTicketAndLinkAssetsRequest",
+    "createTicketAndLinkAssetsResponse",
+    "createTicketRequest",
+    "createTicketResponse",
+    "date",
+    "descriptionsDetail",
+    "editCI",
+    "editCIRequest",
+    "editCIResponse",
+    "editContact",
+    "editContactRequest",
+    "editContactResponse",
+    "editItem",
+    "editItemRequest",
+    "editItemResponse",
+    "editTicket",
+    "editTicketRequest",
+    "editTicketResponse",
+    "fieldName",
+    "fieldValue",
+    "fieldsChange",
+    "getContactAssociatedTickets",
+    "getContactAssociatedTicketsRequest",
+    "getContactAssociatedTicketsResponse",
+    "getItemDetails",
+    "getItemDetailsRequest",
+    "getItemDetailsResponse",
+    "getItemId",
+    "getItemIdRequest",
+    "getItemIdResponse",
+    "getTicketDetails",
+    "getTicketDetailsResponse",
+    "historyEvents",
+    "itemFields",
+    "linkItems",
+    "linkItemsRequest",
+    "linkItemsResponse",
+    "linkTickets",
+    "linkTicketsRequest",
+    "linkTicketsResponse",
+    "listContainerDefinitions",
+    "listContainerDefinitionsRequest",
+    "listContainerDefinitionsResponse",
+    "listFieldDefinitions",
+    "listFieldDefinitionsRequest",
+    "listFieldDefinitionsResponse",
+    "listItemDefinitions",
+    "listItemDefinitionsRequest",
+    "listItemDefinitionsResponse",
+    "listQuickTemplates",
+    "listQuickTemplatesRequest",
+    "listQuickTemplatesResponse",
+    "listSearches",
+    "listSearchesRequest",
+    "listSearchesResponse",
+    "newValue",
+    "oldValue",
+    "return",
+    "runSearch",
+    "runSearchRequest",
+    "runSearchResponse",
+    "schema",
+    "value",
+)
+
+
+def schema_keys(document: Document) -> List[str]:
+    """Return the sorted element names defined by the schema of a WSDL document."""
+    names = {element.name for element in document.types.elements}
+    for xsd_type in document.types.types:
+        for name, _ in getattr(xsd_type, "elements", ()):
+            names.add(name)
+    return sorted(names)
+
+
+def main() -> None:
+    """Print the element names of a WSDL as a Python tuple."""
+    parser = argparse.ArgumentParser(description="Print the Footprints schema keys.")
+    parser.add_argument("base_url", help="The WSDL url or path.")
+    args = parser.parse_args()
+
+    print("FOOTPRINTS_KEYS = (")
+    for name in schema_keys(Client(args.base_url).wsdl):
+        print(f'    "{name}",')
+    print(")")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Per method call metrics of the Footprints client.
+
+Every call reaching footprints is counted once it ends: its latency, the bytes
+sent and received over all its attempts, the number of retries and the type
+of the exception it raised, once mapped by the requester. Calls are followed
+by `footprintsapi.tracing`, cache hits aren't counted.
+The counters are kept per SOAP method and read with `Metrics.snapshot` or
+`Metrics.prometheus`, callbacks receive every `Observation` as it is made.
+"""
+
+import bisect
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from .tracing import Call
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+# Counters exported to Prometheus: metric name, help and attribute.
+COUNTERS = (
+    ("calls_total", "Calls made to footprints.", "calls"),
+    ("retries_total", "Attempts retried after a failure.", "retries"),
+    ("request_bytes_total", "Bytes of the request envelopes.", "request_bytes"),
+    ("response_bytes_total", "Bytes of the response envelopes.", "response_bytes"),
+)
+
+
+class Observation(NamedTuple):
+    """A measured call, as passed to the metrics callbacks."""
+
+    method_name: str
+    seconds: float
+    attempts: int
+    request_bytes: int
+    response_bytes: int
+    error: Optional[str] = None
+
+
+class _MethodMetrics:
+    """The counters of a SOAP method."""
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "retries",
+        "request_bytes",
+        "response_bytes",
+        "buckets",
+        "seconds",
+        "recent",
+    )
+
+    def __init__(self, window: int) -> None:
+        self.calls = 0
+        self.errors = {}
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        # One more bucket for the calls slower than the last bound.
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.seconds = 0.0
+        self.recent = deque(maxlen=window)
+
+    def copy(self) -> "_MethodMetrics":
+        copy = _MethodMetrics(self.recent.maxlen)
+        for name in self.__slots__:
+            setattr(copy, name, getattr(self, name))
+        copy.errors = dict(self.errors)
+        copy.buckets = list(self.buckets)
+        copy.recent = list(self.recent)
+        return copy
+
+
+def _percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _labels(**labels: str) -> str:
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Metrics:
+    """Thread-safe per method call counters and latency histograms.
+
+    Percentiles are computed over the latencies of the last `window` calls of
+    each method, the histogram counts every call.
+    """
+
+    def __init__(
+        self,
+        window: int = 1024,
+        callbacks: Iterable[Callable[[Observation], None]] = (),
+    ) -> None:
+        """Init function.
+
+        :param window: The number of recent latencies kept per method for the
+        percentiles.
+
+        :param callbacks: Functions called with the `Observation` of every call,
+        such as an exporter to statsd. Exceptions they raise are logged.
+        """
+        self.window = window
+        self.callbacks = list(callbacks)
+        self._methods: Dict[str, _MethodMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self, call: Call, error: Optional[BaseException] = None
+    ) -> Optional[Observation]:
+        """Count a finished call.
+
+        :param call: The call, as followed by `footprintsapi.tracing`.
+
+        :param error: The exception the call raised, if any.
+
+        :return: The observation passed to the callbacks, None without callbacks.
+        """
+        seconds = call.seconds
+        error_name = type(error).__name__ if error is not None else None
+
+        with self._lock:
+            metrics = self._methods.get(call.method_name)
+            if metrics is None:
+                metrics = self._methods[call.method_name] = _MethodMetrics(self.window)
+            metrics.calls += 1
+            metrics.retries += max(0, call.attempts - 1)
+            metrics.request_bytes += call.request_bytes
+            metrics.response_bytes += call.response_bytes
+            metrics.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            metrics.seconds += seconds
+            metrics.recent.append(seconds)
+            if error_name is not None:
+                metrics.errors[error_name] = metrics.errors.get(error_name, 0) + 1
+
+        if not self.callbacks:
+            return None
+        observation = Observation(
+            call.method_name,
+            seconds,
+            call.attempts,
+            call.request_bytes,
+            call.response_bytes,
+            error_name,
+        )
+        for callback in self.callbacks:
+            try:
+                callback(observation)
+            except Exception:
+                logger.exception("Error in a metrics callback")
+        return observation
+
+    def _copies(self) -> List[tuple]:
+        """Return a consistent copy of the counters of each method, by name."""
+        with self._lock:
+            return sorted(
+                (name, metrics.copy()) for name, metrics in self._methods.items()
+            )
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Return the counters and latency percentiles of each method."""
+        snapshot = {}
+        for name, metrics in self._copies():
+            recent = sorted(metrics.recent)
+            latency = dict(mean=metrics.seconds / metrics.calls)
+            for fraction in PERCENTILES:
+                latency[f"p{round(fraction * 100)}"] = _percentile(recent, fraction)
+            snapshot[name] = dict(
+                calls=metrics.calls,
+                errors=metrics.errors,
+                retries=metrics.retries,
+                request_bytes=metrics.request_bytes,
+                response_bytes=metrics.response_bytes,
+                latency=latency,
+            )
+        return snapshot
+
+    def prometheus(self, prefix: str = "footprints") -> str:
+        """Return the counters and latency histograms in Prometheus' text format.
+
+        :param prefix: The prefix of the metric names.
+        """
+        methods = self._copies()
+        lines = []
+        for metric, help_text, attribute in COUNTERS:
+            lines += [
+                f"# HELP {prefix}_{metric} {help_text}",
+                f"# TYPE {prefix}_{metric} counter",
+            ]
+            for name, metrics in methods:
+                value = getattr(metrics, attribute)
+                lines.append(f"{prefix}_{metric}{_labels(method=name)} {value}")
+
+        metric = f"{prefix}_errors_total"
+        lines += [
+            f"# HELP {metric} Failed calls, by exception type.",
+            f"# TYPE {metric} counter",
+        ]
+        for name, metrics in methods:
+            for error, count in sorted(metrics.errors.items()):
+                lines.append(f"{metric}{_labels(method=name, exception=error)} {count}")
+
+        metric = f"{prefix}_call_duration_seconds"
+        lines += [
+            f"# HELP {metric} Latency of the calls, retries included.",
+            f"# TYPE {metric} histogram",
+        ]
+        for name, metrics in methods:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), metrics.buckets):
+                cumulative += count
+                labels = _labels(method=name, le=str(bound))
+                lines.append(f"{metric}_bucket{labels} {cumulative}")
+            lines.append(f"{metric}_sum{_labels(method=name)} {metrics.seconds}")
+            lines.append(f"{metric}_count{_labels(method=name)} {metrics.calls}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Forget every counter."""
+        with self._lock:
+            self._methods.clear()
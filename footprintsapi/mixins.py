@@ -1,6 +1,7 @@
 """Collection of common mixins."""
 
-from typing import Iterable, Optional, Tuple, Union
+import json
+from typing import Iterable, Iterator, Optional, Tuple, Union
 
 from footprintsapi.requester import Requester
 from .utils import cleanup_args, get_attributes
@@ -41,9 +42,48 @@ class CommonMixin:
         return (self._requester, self._requester.request(method_name, params, **kwargs))
 
 
+def _encode(obj: object) -> dict:
+    """Serialize the objects returned by zeep."""
+    return obj.__dict__
+
+
+class ToJsonMixin:
+    """Mixin class serializing the original response of a model on demand.
+
+    Expects the response in `_original_attributes` and a `_json` attribute
+    memoizing `to_json`.
+    """
+
+    __slots__ = ()
+
+    @property
+    def to_json(self) -> str:
+        """Return the original response from the API as indented JSON."""
+        if self._json is None:
+            # Bypass the models' __setattr__, which records public attributes.
+            object.__setattr__(
+                self,
+                "_json",
+                json.dumps(self._original_attributes, default=_encode, indent=2),
+            )
+        return self._json
+
+    def to_compact_json(self) -> str:
+        """Return the original response as JSON without whitespace, for bulk exports."""
+        return json.dumps(
+            self._original_attributes, default=_encode, separators=(",", ":")
+        )
+
+    def to_json_bytes(self) -> bytes:
+        """Return the original response as UTF-8 encoded compact JSON."""
+        return self.to_compact_json().encode("utf-8")
+
+
 class CustomAttributesMixin:
     """Mixin class to get custom attributes."""
 
+    __slots__ = ()
+
     def get_custom_attributes(
         self, custom_attributes: Optional[Iterable] = CUSTOM_ATTRS
     ) -> dict:
@@ -278,6 +318,27 @@ class RunSearchMixin:
             method_name="runSearch", params=cleanup_args(locals()), **kwargs
         )
 
+    def iter_search(
+        self, search_id: Union[str, int], submitter: Optional[str] = None, **kwargs
+    ) -> Iterator:
+        """Run a search and yield its rows while the response is read.
+
+        Unlike `get_search` the whole result set is never held in memory. The
+        async client returns an async iterator.
+
+        :param search_id: The id of the saved search to run.
+
+        :param submitter: Userid/username of submitter.
+
+        :returns: `footprintsapi.models.SearchRow` tuples.
+        """
+        # The parser builds models, which import this module.
+        from .stream import SearchRowParser
+
+        return self._requester.stream(
+            "runSearch", cleanup_args(locals()), SearchRowParser, **kwargs
+        )
+
 
 class CreateCIMixin:
     """Add basic `createCI` functionality to Footprints object."""
@@ -1,7 +1,6 @@
 """Base FootprintsObject."""
 
-import json
-from typing import Optional, Union
+from typing import Any, Dict, List, NamedTuple, Optional, Union
 from requests import Response
 
 from .mixins import (
@@ -28,12 +27,89 @@ from .mixins import (
     ListQuickTemplatesMixin,
     ListSearchesMixin,
     RunSearchMixin,
+    ToJsonMixin,
 )
 from .requester import Requester
 from .utils import cleanup_args, get_attributes, parse_keys, pretty_attributes, to_dict
 
 
-class FootprintsObject:
+class BulkResult(NamedTuple):
+    """The outcome of a single id within a bulk call."""
+
+    id: Union[str, int]
+    result: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the call for this id succeeded."""
+        return self.error is None
+
+
+class TicketChange(NamedTuple):
+    """A pending edit of a ticket, as passed to `update_tickets`.
+
+    `ticket_fields` takes the same dict as `Ticket.update`.
+    """
+
+    ticket_id: Union[str, int]
+    ticket_fields: Optional[dict] = None
+    assignees: Optional[list] = None
+
+
+class SearchRow(NamedTuple):
+    """A row of a saved search, as yielded by `iter_search`.
+
+    `fields` maps the external field names to their value, a list when the
+    field holds several values.
+    """
+
+    container_definition_id: Optional[int]
+    container_definition_name: Optional[str]
+    item_definition_id: Optional[int]
+    item_definition_name: Optional[str]
+    item_id: Optional[int]
+    fields: Dict[str, Any]
+    assignees: List[str]
+
+
+def decode_attributes(obj: object, attributes: Union[dict, object]) -> dict:
+    """Build the snake cased attributes of an object from an API response.
+
+    The attributes are assigned to `obj.attributes` as they are built, so that
+    `get_custom_attributes` can read the raw custom fields.
+
+    :param obj: The object being built.
+
+    :param attributes: The JSON/dict/object returned by the API.
+    """
+    # Dicts are copied since their custom attributes are merged into them.
+    obj.attributes = dict(attributes) if isinstance(attributes, dict) else attributes
+    if (
+        "_itemFields" in attributes
+        if isinstance(attributes, dict)
+        else hasattr(attributes, "_itemFields")
+    ):
+        obj.attributes = dict(
+            get_attributes(
+                fields_to_iterate=attributes["_itemFields"]["itemFields"],
+                attributes_to_fetch=COMMON_ATTRS,
+            )
+        )
+
+    if isinstance(obj.attributes, object) and not isinstance(obj.attributes, dict):
+        obj.attributes = to_dict(attributes)
+
+    if hasattr(obj, "get_custom_attributes"):
+        obj.attributes.update(obj.get_custom_attributes())
+
+    if any(map(lambda k: k.startswith("_"), obj.attributes.keys())):
+        obj.attributes = parse_keys(obj.attributes, "snake_case")
+
+    return obj.attributes
+
+
+class FootprintsObject(ToJsonMixin):
     """Base class for all classes representing objects returned by the API.
 
     This makes a call to :func:`Footprintsapi.FootprintsObject.set_attributes`
@@ -44,6 +120,7 @@ class FootprintsObject:
         """:param attributes: Dict(JSON) to build this object with."""
         self._requester = requester
         self._original_attributes = {}
+        self._json = None
         self.attributes = {}
         self.set_attributes(attributes)
         self._update_attributes = True
@@ -55,6 +132,7 @@ class FootprintsObject:
             "attributes",
             "_requester",
             "_original_attributes",
+            "_json",
             "_update_attributes",
         ]
 
@@ -68,11 +146,6 @@ class FootprintsObject:
             self.attributes[key] = value
         super(FootprintsObject, self).__setattr__(key, value)
 
-    @property
-    def to_json(self) -> dict:
-        """Return the original JSON response from the API."""
-        return self._original_attributes
-
     def set_attributes(self, attributes: Union[dict, object]) -> None:
         """Load this object with attributes.
 
@@ -81,31 +154,11 @@ class FootprintsObject:
 
         :param attributes: The JSON/dict/object to build this object with.
         """
-        self.attributes = attributes
-        if hasattr(attributes, "_itemFields"):
-            self.attributes = dict(
-                get_attributes(
-                    fields_to_iterate=attributes._itemFields["itemFields"],
-                    attributes_to_fetch=COMMON_ATTRS,
-                )
-            )
-
-        if isinstance(self.attributes, object) and not isinstance(
-            self.attributes, dict
-        ):
-            self.attributes = to_dict(attributes)
-
-        if hasattr(self, "get_custom_attributes"):
-            self.attributes.update(self.get_custom_attributes())
-
-        if any(map(lambda k: k.startswith("_"), self.attributes.keys())):
-            self.attributes = parse_keys(self.attributes, "snake_case")
+        decode_attributes(self, attributes)
 
+        # Kept by reference, only serialized when `to_json` is read.
         self._original_attributes = attributes
-        if isinstance(self._original_attributes, object):
-            self._original_attributes = json.dumps(
-                attributes, default=lambda o: o.__dict__, indent=2
-            )
+        self._json = None
 
         for key, value in self.attributes.items():
             self.__setattr__(key, value)
@@ -193,6 +246,78 @@ class Item(FootprintsObject):
         return self._requester.request(method_name="editItem", params=params, **kwargs)
 
 
+class CompactFootprintsObject(ToJsonMixin):
+    """Memory efficient alternative to `FootprintsObject`.
+
+    The raw response is kept as is and only decoded into attributes on first
+    access. Fields aren't copied onto the instance and no JSON string is kept.
+    """
+
+    __slots__ = ("_requester", "_original_attributes", "_attributes", "_json")
+
+    def __init__(self, requester: Requester, attributes: Union[dict, object]) -> None:
+        """:param attributes: Dict(JSON) or object to build this object with."""
+        object.__setattr__(self, "_requester", requester)
+        object.__setattr__(self, "_original_attributes", attributes)
+        object.__setattr__(self, "_attributes", None)
+        object.__setattr__(self, "_json", None)
+
+    @property
+    def attributes(self) -> dict:
+        """Return the decoded attributes, decoding them on first access."""
+        if self._attributes is None:
+            decode_attributes(self, self._original_attributes)
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, value: dict) -> None:
+        object.__setattr__(self, "_attributes", value)
+
+    def __getattr__(self, key: str) -> Any:
+        """Look up attributes which aren't slots in the decoded attributes."""
+        if key.startswith("__"):
+            raise AttributeError(key)
+        try:
+            return self.attributes[key]
+        except KeyError:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{key}'"
+            ) from None
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        """Set attributes."""
+        if key in CompactFootprintsObject.__slots__ or key == "attributes":
+            object.__setattr__(self, key, value)
+        else:
+            self.attributes[key] = value
+
+    def __dir__(self) -> list:
+        """List the decoded attributes along with the class attributes."""
+        return sorted(set(super().__dir__()) | set(self.attributes))
+
+    def __repr__(self) -> str:
+        """Class representation."""
+        class_name = self.__class__.__name__
+        attrs = pretty_attributes(self.attributes, self.attributes.keys(), 8)
+        return f"{class_name}({attrs})"
+
+
+class CompactTicket(CompactFootprintsObject, CustomAttributesMixin):
+    """Compact version of `Ticket`."""
+
+    __slots__ = ()
+
+    update = Ticket.update
+
+
+class CompactItem(CompactFootprintsObject):
+    """Compact version of `Item`."""
+
+    __slots__ = ()
+
+    update = Item.update
+
+
 class FootprintsBaseObject(
     CreateCIMixin,
     CreateContactMixin,
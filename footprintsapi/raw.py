@@ -0,0 +1,198 @@
+"""Decode hot read responses straight from their XML.
+
+zeep builds an object graph for every response, which the models flatten again
+right away. The responses of `RAW_METHODS` can instead be decoded into plain
+dicts and lists, laid out like `zeep.helpers.serialize_object` lays out zeep's
+result. The decoders are compiled once per operation from the WSDL types.
+"""
+
+import logging
+from typing import Any, Callable, Dict
+
+from lxml import etree
+from zeep.exceptions import Fault
+from zeep.helpers import serialize_object
+from zeep.xsd import Element, Sequence
+from zeep.xsd.types.simple import AnySimpleType
+
+logger = logging.getLogger(__name__)
+
+RAW_METHODS = ("getTicketDetails", "getItemDetails", "runSearch")
+
+Decoder = Callable[[etree._Element], Any]
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _simple_decoder(xsd_type: AnySimpleType) -> Decoder:
+    pythonvalue = xsd_type.pythonvalue
+
+    def decode(node: etree._Element) -> Any:
+        text = node.text
+        if text is None:
+            return None
+        try:
+            return pythonvalue(text)
+        except (TypeError, ValueError):
+            logger.exception("Error during xml -> python translation")
+            return None
+
+    return decode
+
+
+def _zeep_decoder(element: Element, schema: Any) -> Decoder:
+    """Decode the elements zeep alone knows how to parse, such as `xs:anyType`."""
+
+    def decode(node: etree._Element) -> Any:
+        return serialize_object(element.parse(node, schema, allow_none=True), dict)
+
+    return decode
+
+
+def is_sequence_type(xsd_type: Any) -> bool:
+    """Check if an xsd type is a complex type holding a sequence of elements."""
+    nested = getattr(xsd_type, "elements_nested", None)
+    if not nested or len(nested) > 1 or xsd_type.attributes:
+        return False
+    indicator = nested[0][1]
+    return (
+        isinstance(indicator, Sequence)
+        and indicator.max_occurs == 1
+        and all(isinstance(element, Element) for _, element in xsd_type.elements)
+    )
+
+
+def _sequence_decoder(xsd_type: Any, schema: Any, compiled: Dict) -> Decoder:
+    defaults = {}
+    repeated = []
+    # Local names of the children, extended with their qualified tags as seen.
+    fields = {}
+
+    def decode(node: etree._Element) -> Any:
+        if not len(node) and not len(node.attrib):
+            return None
+        values = dict(defaults)
+        for name in repeated:
+            values[name] = []
+        for child in node:
+            tag = child.tag
+            field = fields.get(tag)
+            if field is None:
+                if not isinstance(tag, str):
+                    # Comments and processing instructions.
+                    continue
+                field = fields.get(_local_name(tag))
+                if field is None:
+                    continue
+                fields[tag] = field
+            name, many, decode_child = field
+            if many:
+                values[name].append(decode_child(child))
+            else:
+                values[name] = decode_child(child)
+        return values
+
+    # Registered before compiling the children, for recursive types.
+    compiled[id(xsd_type)] = decode
+    for name, element in xsd_type.elements:
+        many = element.accepts_multiple
+        if many:
+            repeated.append(name)
+        else:
+            defaults[name] = element.default_value
+        fields[element.qname.localname] = (
+            name,
+            many,
+            compile_decoder(element, schema, compiled),
+        )
+    return decode
+
+
+def compile_decoder(element: Element, schema: Any, compiled: Dict = None) -> Decoder:
+    """Compile a function decoding an xsd element.
+
+    Sequences are decoded to dicts holding all their fields, repeated ones as
+    lists. Like zeep, elements are matched on their local name and empty
+    complex elements are decoded to None. Unknown elements are skipped. Other
+    complex types are left to zeep and serialized.
+
+    :param element: The zeep xsd element to decode.
+
+    :param schema: The schema the element belongs to.
+
+    :param compiled: The sequence decoders already compiled, by type id.
+    """
+    if compiled is None:
+        compiled = {}
+    xsd_type = element.type
+    if isinstance(xsd_type, AnySimpleType):
+        return _simple_decoder(xsd_type)
+    if not is_sequence_type(xsd_type):
+        return _zeep_decoder(element, schema)
+    if id(xsd_type) in compiled:
+        return compiled[id(xsd_type)]
+    return _sequence_decoder(xsd_type, schema, compiled)
+
+
+class RawDecoder:
+    """Decode the SOAP responses of an operation without zeep objects.
+
+    The result is unwrapped the way zeep unwraps it: the single part of the
+    response, and the only field of that part when it has no other.
+    """
+
+    def __init__(self, operation: Any, schema: Any) -> None:
+        """Init function.
+
+        :param operation: The zeep binding operation to decode the responses of.
+
+        :param schema: The schema of the WSDL, `client.wsdl.types`.
+        """
+        body = operation.output.body
+        elements = body.type.elements
+        if len(elements) != 1:
+            raise TypeError(f"Can't decode {operation.name} without zeep.")
+        self.name = operation.name
+        self.part, element = elements[0]
+        self._decode = compile_decoder(element, schema)
+        self._unwrap = None
+        if (
+            not isinstance(element.type, AnySimpleType)
+            and len(element.type.elements) == 1
+            and not element.type.attributes
+        ):
+            self._unwrap = element.type.elements[0][0]
+
+    def __call__(self, content: bytes) -> Any:
+        """Decode a response envelope, raising its fault if any.
+
+        :param content: The body of the HTTP response.
+        """
+        envelope = etree.fromstring(
+            content, parser=etree.XMLParser(resolve_entities=False, huge_tree=True)
+        )
+        body = next(
+            (child for child in envelope if _local_name(str(child.tag)) == "Body"),
+            None,
+        )
+        message = body[0] if body is not None and len(body) else None
+        if message is None:
+            return None
+        if _local_name(message.tag) == "Fault":
+            raise Fault(
+                message=message.findtext("faultstring"),
+                code=message.findtext("faultcode"),
+                actor=message.findtext("faultactor"),
+                detail=message.find("detail"),
+            )
+
+        part = next(
+            (child for child in message if _local_name(str(child.tag)) == self.part),
+            None,
+        )
+        result = self._decode(part) if part is not None else None
+        if self._unwrap is not None and result is not None:
+            return result[self._unwrap]
+        return result
@@ -0,0 +1,85 @@
+"""Process-wide registry of parsed WSDL documents.
+
+A parsed zeep document holds no credentials of its own, the transport and
+settings used to call the operations come from the client. Requesters for the
+same endpoint can therefore share a single document, so parsing time and
+memory scale with the number of endpoints rather than the number of users.
+"""
+
+import threading
+from typing import Callable, Dict, Hashable, Optional
+
+from zeep import Settings
+from zeep.wsdl import Document
+
+
+class DocumentRegistry:
+    """Thread-safe mapping of WSDL location to parsed document."""
+
+    def __init__(self) -> None:
+        """Init function."""
+        self._documents: Dict[Hashable, Document] = {}
+        self._locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(location: str, settings: Optional[Settings] = None) -> Hashable:
+        """Build the registry key, documents parsed with other settings differ."""
+        settings = settings or Settings()
+        # Settings is a slotted class, its slots are its fields.
+        return location, tuple(
+            repr(getattr(settings, name))
+            for name in Settings.__slots__
+            if not name.startswith("_")
+        )
+
+    def get(
+        self,
+        location: str,
+        loader: Callable[[], Document],
+        settings: Optional[Settings] = None,
+    ) -> Document:
+        """Return the document for a location, loading it once.
+
+        Concurrent callers for the same location wait for the first load
+        instead of parsing the WSDL again.
+
+        :param location: The WSDL location.
+
+        :param loader: Called to load the document when it isn't registered yet.
+
+        :param settings: The zeep settings used to parse the document.
+        """
+        key = self.key(location, settings)
+        document = self._documents.get(key)
+        if document is not None:
+            return document
+
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            document = self._documents.get(key)
+            if document is None:
+                document = self._documents[key] = loader()
+        return document
+
+    def discard(self, location: str, settings: Optional[Settings] = None) -> None:
+        """Forget the document of a location, the next request reloads it."""
+        key = self.key(location, settings)
+        with self._lock:
+            self._documents.pop(key, None)
+            self._locks.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every document."""
+        with self._lock:
+            self._documents.clear()
+            self._locks.clear()
+
+    def __len__(self) -> int:
+        """Return the number of registered documents."""
+        return len(self._documents)
+
+
+registry = DocumentRegistry()
@@ -0,0 +1,436 @@
+"""Record Footprints exchanges to a sqlite archive and replay them offline.
+
+A `Recorder` saves every HTTP exchange of a requester, the WSDL included, to
+an archive. A `Replayer` serves the archived responses back without touching
+the network, so models and key conversions can be profiled on production
+payloads at full speed, or a day of traffic replayed faster than it happened.
+
+Exchanges are keyed by the HTTP method, the path and the request body, the
+host is left out so an archive replays against any base url. Credentials are
+scrubbed before anything is written: request headers are never stored, the
+credentials and authorization headers and cookies are dropped from the
+response headers, and the text of the credential elements, such as those of
+a WS-Security `UsernameToken`, is masked in the request and response bodies.
+Bodies are compressed with zlib.
+"""
+
+import abc
+import asyncio
+import hashlib
+import io
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from http import HTTPStatus
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .exceptions import ReplayMiss
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+# Response headers never archived: credentials, cookies, and the framing of
+# the original body, which is stored decoded.
+DROPPED_HEADERS = (
+    "authorization",
+    "proxy-authorization",
+    "set-cookie",
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+    "connection",
+    "keep-alive",
+)
+
+MASK = b"********"
+
+# The text of the elements holding credentials, whatever their namespace.
+CREDENTIALS = re.compile(
+    rb"(<(?:[\w.-]+:)?(?:Username|Password|Nonce)\b[^>]*(?<!/)>)[^<]*",
+    re.IGNORECASE,
+)
+
+OPERATION = re.compile(rb"Body>\s*<(?:[\w-]+:)?(\w+)")
+
+
+class Exchange(NamedTuple):
+    """An archived response."""
+
+    status: int
+    headers: Dict[str, str]
+    content: bytes
+    elapsed: float
+
+
+def _target(url: str) -> str:
+    """Return the path and query of a url, without its host and credentials."""
+    parts = urlsplit(url)
+    return parts.path + ("?" + parts.query if parts.query else "")
+
+
+def _scrub(body) -> bytes:
+    """Return a body as bytes, with the text of its credential elements masked."""
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return CREDENTIALS.sub(rb"\1" + MASK, body)
+
+
+def exchange_key(method: str, url: str, body: bytes) -> bytes:
+    """Return the archive key of a request, its body already scrubbed."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{method} {_target(url)}\n".encode("utf-8"))
+    digest.update(body)
+    return digest.digest()
+
+
+def _archived_headers(headers) -> str:
+    return json.dumps(
+        {
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in DROPPED_HEADERS
+        }
+    )
+
+
+class Archive:
+    """Exchanges kept in a sqlite database, indexed by request.
+
+    The responses recorded for the same request are numbered in the order
+    they were recorded, a lookup is a single indexed query.
+    """
+
+    def __init__(self, path: str, timeout: Optional[int] = 60) -> None:
+        """Init function.
+
+        :param path: The sqlite database path.
+
+        :param timeout: Seconds to wait for the database lock.
+        """
+        self._lock = threading.RLock()
+        self._counts: Dict[bytes, int] = {}
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                    CREATE TABLE IF NOT EXISTS exchanges
+                    (id integer PRIMARY KEY AUTOINCREMENT, key blob, seq integer,
+                    method text, target text, operation text, request blob,
+                    status integer, headers text, content blob, elapsed real,
+                    recorded real)
+                """
+            )
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS exchanges_key "
+                "ON exchanges (key, seq)"
+            )
+
+    def count(self, key: bytes) -> int:
+        """Return the number of responses recorded for a request."""
+        with self._lock:
+            count = self._counts.get(key)
+            if count is None:
+                count = self._counts[key] = self._conn.execute(
+                    "SELECT COUNT(*) FROM exchanges WHERE key=?", (key,)
+                ).fetchone()[0]
+        return count
+
+    def add(
+        self,
+        key: bytes,
+        method: str,
+        url: str,
+        request: bytes,
+        status: int,
+        headers: dict,
+        content: bytes,
+        elapsed: float,
+    ) -> None:
+        """Record an exchange, the request body already scrubbed."""
+        operation = OPERATION.search(request)
+        with self._lock, self._conn:
+            seq = self.count(key)
+            self._conn.execute(
+                "INSERT INTO exchanges (key, seq, method, target, operation, request, "
+                "status, headers, content, elapsed, recorded) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    seq,
+                    method,
+                    _target(url),
+                    operation.group(1).decode("ascii") if operation else None,
+                    zlib.compress(request),
+                    status,
+                    _archived_headers(headers),
+                    zlib.compress(content),
+                    elapsed,
+                    time.time(),
+                ),
+            )
+            self._counts[key] = seq + 1
+
+    def get(self, key: bytes, seq: int = 0) -> Optional[Exchange]:
+        """Return a recorded response of a request, None if there is none."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, content, elapsed FROM exchanges "
+                "WHERE key=? AND seq=?",
+                (key, seq),
+            ).fetchone()
+        if row is None:
+            return None
+        return Exchange(row[0], json.loads(row[1]), zlib.decompress(row[2]), row[3])
+
+    def operations(self) -> Dict[str, int]:
+        """Return the number of exchanges recorded per SOAP operation."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT COALESCE(operation, method), COUNT(*) FROM exchanges "
+                "GROUP BY 1 ORDER BY 1"
+            ).fetchall()
+        return dict(rows)
+
+    def __len__(self) -> int:
+        """Return the number of exchanges recorded."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM exchanges").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class Tape(abc.ABC):
+    """Base class of the recorder and the replayer.
+
+    Requesters wrap their HTTP adapter and httpx transport with the tape's.
+    """
+
+    def __init__(self, path: str, timeout: Optional[int] = 60) -> None:
+        """Init function.
+
+        :param path: The sqlite database path of the archive.
+
+        :param timeout: Seconds to wait for the database lock.
+        """
+        self.archive = Archive(path, timeout)
+
+    @abc.abstractmethod
+    def adapter(self, adapter: BaseAdapter) -> BaseAdapter:
+        """Return the requests adapter to mount in place of `adapter`."""
+
+    @abc.abstractmethod
+    def async_transport(self, transport):
+        """Return the httpx transport to use in place of `transport`."""
+
+    def close(self) -> None:
+        """Close the archive."""
+        self.archive.close()
+
+
+class Recorder(Tape):
+    """Record every exchange reaching footprints.
+
+    Streamed responses are read in full before being handed over, so recording
+    is meant for capturing traffic, not for measuring it.
+    """
+
+    def record(
+        self, method: str, url: str, body: bytes, response, elapsed: float
+    ) -> None:
+        """Archive an exchange, masking the credentials of both bodies."""
+        body = _scrub(body)
+        self.archive.add(
+            exchange_key(method, url, body),
+            method,
+            url,
+            body,
+            response.status_code,
+            response.headers,
+            _scrub(response.content),
+            elapsed,
+        )
+
+    def adapter(self, adapter: BaseAdapter) -> BaseAdapter:
+        """Return an adapter recording the exchanges of `adapter`."""
+        return _RecordingAdapter(self, adapter)
+
+    def async_transport(self, transport):
+        """Return a transport recording the exchanges of `transport`."""
+        return _AsyncRecordingTransport(self, transport)
+
+
+class Replayer(Tape):
+    """Answer requests with the responses of an archive, without any network.
+
+    A request recorded several times gets its responses in the order they
+    were recorded, starting over once they were all served. Requests missing
+    from the archive raise `ReplayMiss`.
+    """
+
+    def __init__(
+        self, path: str, speed: Optional[float] = None, timeout: Optional[int] = 60
+    ) -> None:
+        """Init function.
+
+        :param path: The sqlite database path of the archive.
+
+        :param speed: Wait the recorded response time divided by `speed` before
+        answering, 10 replays traffic ten times faster than it was recorded.
+        Answers right away by default.
+
+        :param timeout: Seconds to wait for the database lock.
+        """
+        super().__init__(path, timeout)
+        self.speed = speed
+        self.served = 0
+        self._cursors: Dict[bytes, int] = {}
+        self._lock = threading.Lock()
+
+    def lookup(
+        self, method: str, url: str, body: bytes
+    ) -> Tuple[Exchange, Optional[float]]:
+        """Return the next response to a request and the seconds to wait first."""
+        body = _scrub(body)
+        key = exchange_key(method, url, body)
+        count = self.archive.count(key)
+        if not count:
+            request = f"{method} {_target(url)}"
+            operation = OPERATION.search(body)
+            if operation:
+                request += " " + operation.group(1).decode("ascii")
+            raise ReplayMiss(f"{request} was not recorded.")
+        with self._lock:
+            seq = self._cursors.get(key, 0)
+            self._cursors[key] = (seq + 1) % count
+            self.served += 1
+        exchange = self.archive.get(key, seq)
+        delay = exchange.elapsed / self.speed if self.speed else None
+        return exchange, delay
+
+    def rewind(self) -> None:
+        """Serve the recorded responses from the first one again."""
+        with self._lock:
+            self._cursors.clear()
+
+    def adapter(self, adapter: BaseAdapter) -> BaseAdapter:
+        """Return an adapter answering from the archive, `adapter` is unused."""
+        return _ReplayAdapter(self)
+
+    def async_transport(self, transport):
+        """Return a transport answering from the archive, `transport` is unused."""
+        return _AsyncReplayTransport(self)
+
+
+def _response_headers(exchange: Exchange) -> dict:
+    return {**exchange.headers, "Content-Length": str(len(exchange.content))}
+
+
+class _RecordingAdapter(BaseAdapter):
+    def __init__(self, recorder: Recorder, adapter: BaseAdapter) -> None:
+        super().__init__()
+        self.recorder = recorder
+        self.adapter = adapter
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        started = time.perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        # Reads the whole body, streamed or not.
+        response.content
+        self.recorder.record(
+            request.method,
+            request.url,
+            request.body,
+            response,
+            time.perf_counter() - started,
+        )
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+class _ReplayAdapter(BaseAdapter):
+    def __init__(self, replayer: Replayer) -> None:
+        super().__init__()
+        self.replayer = replayer
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        exchange, delay = self.replayer.lookup(
+            request.method, request.url, request.body
+        )
+        if delay:
+            time.sleep(delay)
+        response = Response()
+        response.status_code = exchange.status
+        response.headers = CaseInsensitiveDict(_response_headers(exchange))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(exchange.content)
+        response.reason = HTTPStatus(exchange.status).phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+_AsyncBaseTransport = httpx.AsyncBaseTransport if httpx is not None else object
+
+
+class _AsyncRecordingTransport(_AsyncBaseTransport):
+    def __init__(self, recorder: Recorder, transport) -> None:
+        self.recorder = recorder
+        self.transport = transport
+
+    async def handle_async_request(self, request):
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        await response.aread()
+        self.recorder.record(
+            request.method,
+            str(request.url),
+            request.content,
+            response,
+            time.perf_counter() - started,
+        )
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class _AsyncReplayTransport(_AsyncBaseTransport):
+    def __init__(self, replayer: Replayer) -> None:
+        self.replayer = replayer
+
+    async def handle_async_request(self, request):
+        exchange, delay = self.replayer.lookup(
+            request.method, str(request.url), request.content
+        )
+        if delay:
+            await asyncio.sleep(delay)
+        return httpx.Response(
+            exchange.status,
+            headers=_response_headers(exchange),
+            content=exchange.content,
+            request=request,
+        )
@@ -1,15 +1,27 @@
 """Module housing the SOAP request handler."""
 
-from typing import Optional
+import threading
+import time
+import warnings
+from contextlib import closing, contextmanager
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Tuple
 
 import requests
 import zeep
 from requests import Response, Session
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
-from zeep import Client, Settings
+from requests_file import FileAdapter
+from zeep import AsyncClient, Client, Settings
 from zeep.cache import SqliteCache
-from zeep.transports import Transport
+from zeep.transports import AsyncTransport, Transport
+from zeep.wsdl import Document
+from zeep.wsdl.utils import etree_to_string
 
+from .breaker import CircuitBreaker
+from .cache import MISSING, CachePolicy, ResponseCache, _freeze
+from .envelope import EnvelopeTemplate, UnsupportedValue
 from .exceptions import (
     BadRequest,
     FootprintsException,
@@ -17,12 +29,75 @@ from .exceptions import (
     ResourceDoesNotExist,
     Unauthorized,
 )
-from .utils import parse_keys, set_default_attr
+from .keymap import schema_keys
+from .metrics import Metrics
+from .raw import RAW_METHODS, RawDecoder
+from .registry import registry
+from .replay import Tape
+from .retry import TRANSIENT_STATUSES, RetryPolicy
+from .singleflight import SingleFlight
+from .snapshot import bind_document, load_snapshot, save_snapshot
+from .spool import WriteBehind, is_write
+from .throttle import Throttle
+from .tracing import (
+    Call,
+    RequestHooks,
+    end_attempt,
+    enter_call,
+    exit_call,
+    record_exchange,
+    retry_attempt,
+    start_attempt,
+)
+from .utils import parse_keys, set_default_attr, warm_key_cache
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+# I believe this is an exhaustive list for the methods the SOAP API supports?
+QUERY_METHODS = (
+    "createCI",
+    "createContact",
+    "createItem",
+    "createOrEditContact",
+    "createTicket",
+    "createTicketAndLinkAssets",
+    "editCI",
+    "editContact",
+    "editItem",
+    "editTicket",
+    "getContactAssociatedTickets",
+    "getItemDetails",
+    "getItemId",
+    "getTicketDetails",
+    "linkItems",
+    "linkTickets",
+    "listContainerDefinitions",
+    "listFieldDefinitions",
+    "listItemDefinitions",
+    "listQuickTemplates",
+    "listSearches",
+    "runSearch",
+)
+
+# Keyword arguments consumed by the requester itself, never sent to footprints.
+REQUEST_OPTIONS = ("bypass_cache", "raw", "write_behind")
+
+# Nesting levels of the request params converted to the footprints naming
+# convention, deep enough for field lists such as `ticket_fields`.
+PARAMS_DEPTH = 8
+
+# Bytes read at a time from streamed responses.
+CHUNK_SIZE = 64 * 1024
 
 
 class Requester:
     """Responsible for handling SOAP requests."""
 
+    client_class = Client
+
     def __init__(
         self,
         client_id: str,
@@ -31,25 +106,142 @@ class Requester:
         settings: Optional[Settings] = None,
         storage_url: Optional[str] = None,
         timeout: Optional[int] = 60,
+        cache_policies: Optional[Dict[str, Optional[CachePolicy]]] = None,
+        lazy: bool = False,
+        snapshot_path: Optional[str] = None,
+        shared_wsdl: bool = False,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 0,
+        keep_alive: bool = True,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        throttle: Optional[Throttle] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        envelope_templates: bool = False,
+        write_behind: Optional[WriteBehind] = None,
+        metrics: Optional[Metrics] = None,
+        hooks: Optional[RequestHooks] = None,
+        tape: Optional[Tape] = None,
+        single_flight: Optional[SingleFlight] = None,
+        params_depth: int = PARAMS_DEPTH,
     ) -> None:
-        """Init function."""
+        """Init function.
+
+        :param cache_policies: Per method response cache policies, merged over
+        the defaults. Map a method to `None` to disable its cache.
+
+        :param lazy: Defer loading the WSDL until the first request.
+
+        :param snapshot_path: A path to a precompiled WSDL snapshot. The snapshot
+        is loaded instead of parsing the WSDL, and written when missing or stale.
+
+        :param shared_wsdl: Share the parsed WSDL with every other requester of the
+        same base url in this process. Only the first one fetches the WSDL, the
+        others don't check their credentials until their first request.
+
+        :param pool_connections: The number of hosts to keep connection pools for.
+
+        :param pool_maxsize: The maximum number of connections kept per host. Size
+        it to the number of threads sharing the requester.
+
+        :param max_retries: The number of times a failed connection is retried.
+
+        :param keep_alive: Reuse connections between requests.
+
+        :param connect_timeout: Seconds to wait for a connection, waits forever by default.
+
+        :param read_timeout: Seconds to wait for a response, waits forever by default.
+
+        :param retry_policy: How transient failures are retried, see `RetryPolicy`.
+        Failed calls aren't retried without one.
+
+        :param throttle: The rate and concurrency limits applied to each attempt,
+        see `Throttle`.
+
+        :param breaker: The circuit breaker rejecting calls while footprints is down,
+        see `CircuitBreaker`. Every call reaches footprints without one.
+
+        :param envelope_templates: Render the request envelopes of the write methods
+        from templates instead of zeep's serializer. The template of a method is only
+        used once it rendered the same envelope as zeep for a call, see
+        `EnvelopeTemplate`.
+
+        :param write_behind: Spool writes and send them from a background thread,
+        see `WriteBehind`. Writes left in its spool are sent right away.
+
+        :param metrics: The per method call metrics, see `Metrics`.
+
+        :param hooks: Callbacks around every call, see `RequestHooks`.
+
+        :param tape: A `Recorder` archiving every exchange, or a `Replayer`
+        answering from an archive instead of the network.
+
+        :param single_flight: Shares the read calls in flight with the identical
+        calls made meanwhile, see `SingleFlight`. Every call is sent without one.
+
+        :param params_depth: The nesting levels of the params converted to the
+        footprints naming convention. With 0 the params are sent as given, their
+        keys already named as footprints expects.
+        """
         self.base_url = base_url
         self.client_id = client_id
         self.client_secret = client_secret
-        self._cache = []
+        self.response_cache = ResponseCache(cache_policies)
         self._settings = settings
-        self._session = Session()
-        self._session.auth = HTTPBasicAuth(self.client_id, self.client_secret)
         self.storage_url = storage_url
-        cache = None
+        self.snapshot_path = snapshot_path
+        self.shared_wsdl = shared_wsdl
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retry_policy = retry_policy
+        self.throttle = throttle or Throttle()
+        self.breaker = breaker
+        self.metrics = metrics or Metrics()
+        self.hooks = hooks
+        self.tape = tape
+        self.single_flight = single_flight
+        self.params_depth = params_depth
+        self.envelope_templates = envelope_templates
+        self._templates = {}
+        self._raw_decoders = {}
+        self._wsdl_cache = None
         if self.storage_url:
-            cache = SqliteCache(path=storage_url, timeout=timeout)
+            self._wsdl_cache = SqliteCache(path=storage_url, timeout=timeout)
+        self._lazy_client = None
+        self._client_lock = threading.Lock()
+        if not lazy:
+            self._lazy_client = self._connect(self._wsdl_cache)
+        self.write_behind = write_behind
+        if write_behind is not None:
+            self._start_write_behind(write_behind)
+
+    def _start_write_behind(self, write_behind: WriteBehind) -> None:
+        """Send the spooled writes through this requester."""
+        write_behind.start(partial(self.request, write_behind=False))
+
+    @property
+    def _client(self) -> Client:
+        """Return the zeep client, loading the WSDL on first use."""
+        if self._lazy_client is None:
+            with self._client_lock:
+                if self._lazy_client is None:
+                    self._lazy_client = self._connect(self._wsdl_cache)
+        return self._lazy_client
+
+    def _connect(self, cache: Optional[SqliteCache] = None) -> Client:
+        """Load the WSDL and build the zeep client.
+
+        :param cache: The cache used by the transport to store the wsdl.
+        """
+        self._session = self._build_session()
         try:
-            self._client = Client(
-                self.base_url,
-                transport=Transport(session=self._session, cache=cache),
-                settings=self._settings,
-            )
+            return self._build_client(cache)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 401:
                 raise Unauthorized(e)
@@ -58,75 +250,178 @@ class Requester:
         except requests.exceptions.ConnectionError:
             raise ResourceDoesNotExist()
 
-    def request(
-        self, method_name: str, params: Optional[dict] = {}, **kwargs
-    ) -> Response:
-        """Make a request to the Footprints API and return the response.
+    @property
+    def _timeout(self) -> Optional[tuple]:
+        """Return the (connect, read) timeout passed to requests."""
+        if self.connect_timeout is None and self.read_timeout is None:
+            return None
+        return self.connect_timeout, self.read_timeout
+
+    def _build_session(self) -> Session:
+        """Build the requests session with a tuned connection pool.
+
+        The session is safe to share between threads, each thread borrows its
+        own connection from the pool.
+        """
+        session = Session()
+        session.auth = HTTPBasicAuth(self.client_id, self.client_secret)
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=self.max_retries,
+        )
+        if self.tape is not None:
+            adapter = self.tape.adapter(adapter)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def _build_transport(self, cache: Optional[SqliteCache] = None) -> Transport:
+        """Build the zeep transport on top of the requester's session."""
+        return _Transport(
+            session=self._session,
+            cache=cache,
+            timeout=self._timeout or 300,
+            operation_timeout=self._timeout,
+        )
+
+    def _build_client(self, cache: Optional[SqliteCache] = None) -> Client:
+        """Build the zeep client around the requester's own transport.
+
+        Clients are only bound to an already parsed document when it comes from
+        a snapshot or is shared, zeep builds the others itself.
+        """
+        transport = self._build_transport(cache)
+        settings = self._settings or Settings()
+        if not self.shared_wsdl and not self.snapshot_path:
+            client = self.client_class(
+                self.base_url, transport=transport, settings=settings
+            )
+            warm_key_cache(schema_keys(client.wsdl))
+            return client
+
+        if self.shared_wsdl:
+            document = registry.get(
+                self.base_url,
+                partial(self._load_document, transport, settings),
+                settings,
+            )
+        else:
+            document = self._load_document(transport, settings)
+        return bind_document(self.client_class, document, transport, settings)
+
+    def _load_document(self, transport: Transport, settings: Settings) -> Document:
+        """Parse the WSDL and warm the key conversion caches with its elements."""
+        document = self._parse_document(transport, settings)
+        warm_key_cache(schema_keys(document))
+        return document
+
+    def _parse_document(self, transport: Transport, settings: Settings) -> Document:
+        """Parse the WSDL, from the WSDL snapshot when one is usable."""
+        if self.snapshot_path:
+            document = load_snapshot(
+                self.snapshot_path, transport, settings, self.base_url
+            )
+            if document is not None:
+                return document
+
+        document = Document(self.base_url, transport, settings=settings)
+        if self.snapshot_path:
+            try:
+                save_snapshot(document, self.snapshot_path)
+            except (OSError, RuntimeError) as e:
+                warnings.warn(f"Unable to save the WSDL snapshot: {e}")
+        return document
+
+    def _prepare(self, method_name: str, params: dict, kwargs: dict) -> dict:
+        """Validate the method and convert the params to footprints naming convention.
 
         :param method_name: The name of the method to use for the request.
-        For example: `getItemId`, `getTicketDetails`, `getItemDetails`.
 
         :param params: The parameters to send to footprints.
+
+        :param kwargs: Any extra parameters passed to the request.
         """
-        # I believe this is an exhaustive list for the methods the SOAP API supports?
-        query_methods = [
-            "createCI",
-            "createContact",
-            "createItem",
-            "createOrEditContact",
-            "createTicket",
-            "createTicketAndLinkAssets",
-            "editCI",
-            "editContact",
-            "editItem",
-            "editTicket",
-            "getContactAssociatedTickets",
-            "getItemDetails",
-            "getItemId",
-            "getTicketDetails",
-            "linkItems",
-            "linkTickets",
-            "listContainerDefinitions",
-            "listFieldDefinitions",
-            "listItemDefinitions",
-            "listQuickTemplates",
-            "listSearches",
-            "runSearch",
-        ]
-
-        if method_name not in query_methods:
+        if method_name not in QUERY_METHODS:
             raise ValueError("Unsupported method.")
 
         if "kwargs" not in params and kwargs:
             params = {**params, **kwargs}
 
+        params = {k: v for k, v in params.items() if k not in REQUEST_OPTIONS}
+
         # Convert params keys to footprints naming convention
-        if params:
-            params = parse_keys(params)
+        if params and self.params_depth > 0:
+            params = parse_keys(params, depth=self.params_depth)
 
-        response = None
-        try:
-            # Dynamically call the method
-            response = self._client.service[method_name](params)
-
-            # Doesn't always return a regular json response and can sometimes
-            # return objects.
-            if hasattr(response, "__dict__"):
-                set_default_attr(response, "_itemId", params.get("_itemId"))
-                set_default_attr(
-                    response, "_itemDefinitionId", params.get("_itemDefinitionId")
-                )
-                set_default_attr(
-                    response, "_ticketDefinitionId", params.get("_itemDefinitionId")
-                )
-                set_default_attr(response, "_ticketNumber", params.get("_ticketNumber"))
+        return params
+
+    def _spool(self, method_name: str, params: dict, kwargs: dict) -> int:
+        """Queue a write in the write-behind spool, return its id in the spool.
+
+        The params are spooled as given, they are converted when sent.
+        """
+        if method_name not in QUERY_METHODS:
+            raise ValueError("Unsupported method.")
+
+        if "kwargs" not in params and kwargs:
+            params = {**params, **kwargs}
 
-            # Add response to internal cache
-            if len(self._cache) > 4:
-                self._cache.pop()
+        return self.write_behind.submit(method_name, params)
 
-            self._cache.insert(0, response)
+    def _process_response(
+        self,
+        method_name: str,
+        response: Response,
+        params: dict,
+        generation: Optional[int] = None,
+    ) -> Response:
+        """Set default identifiers on the response and update the response cache.
+
+        :param method_name: The name of the method used for the request.
+
+        :param response: The response returned by footprints.
+
+        :param params: The parameters sent to footprints.
+
+        :param generation: The response cache generation read before the call.
+        """
+        response = self._set_defaults(response, params)
+        self.response_cache.set(method_name, params, response, generation)
+        self.response_cache.invalidate(method_name, params)
+
+        return response
+
+    def _set_defaults(self, response: Response, params: dict) -> Response:
+        """Set the identifiers sent to footprints on a response lacking them.
+
+        :param response: The response returned by footprints.
+
+        :param params: The parameters sent to footprints.
+        """
+        defaults = (
+            ("_itemId", params.get("_itemId")),
+            ("_itemDefinitionId", params.get("_itemDefinitionId")),
+            ("_ticketDefinitionId", params.get("_itemDefinitionId")),
+            ("_ticketNumber", params.get("_ticketNumber")),
+        )
+        # Doesn't always return a regular json response and can sometimes
+        # return objects, or dicts when decoded raw.
+        if isinstance(response, dict):
+            for key, value in defaults:
+                response.setdefault(key, value or None)
+        elif hasattr(response, "__dict__"):
+            for key, value in defaults:
+                set_default_attr(response, key, value)
+        return response
 
+    @contextmanager
+    def _handle_errors(self):
+        """Map errors raised while calling footprints to footprints exceptions."""
+        try:
+            yield
         except requests.exceptions.HTTPError as e:
             raise FootprintsException(e)
 
@@ -143,4 +438,511 @@ class Requester:
         except ValueError:
             raise Forbidden()
 
+    @contextmanager
+    def _observe(self, method_name: str, params: dict):
+        """Follow a call to footprints, mapping its errors like `_handle_errors`.
+
+        The call is counted by the metrics and handed to the hooks once it ends.
+        """
+        token = enter_call(Call(method_name, params, self.hooks))
+        try:
+            with self._handle_errors():
+                yield
+        except BaseException as e:
+            call = exit_call(token)
+            self.metrics.observe(call, e)
+            call.fire("on_error", e)
+            raise
+        self.metrics.observe(exit_call(token))
+
+    def _send(self, method_name: str, params: dict) -> Response:
+        """Call a SOAP method once, within the throttle limits."""
+        client = self._client
+        with self.throttle.slot(method_name):
+            if not self._templatable(client, method_name):
+                return client.service[method_name](params)
+            address, data, headers = self._envelope(method_name, params)
+            response = client.transport.post(address, data, headers)
+            return self._process_reply(method_name, response)
+
+    def _process_reply(self, method_name: str, response: Response) -> Response:
+        """Parse the reply to an envelope posted without zeep, like zeep does."""
+        client = self._client
+        if client.settings.raw_response:
+            return response
+        binding = client.service._binding
+        return binding.process_reply(client, binding.get(method_name), response)
+
+    def _envelope(self, method_name: str, params: dict) -> Tuple[str, bytes, dict]:
+        """Render the SOAP envelope of a call, returning its url, body and headers."""
+        client = self._client
+        address = client.service._binding_options["address"]
+        template = self._templates.get(method_name)
+        if template is not None:
+            try:
+                return address, template.render(params), dict(template.headers)
+            except UnsupportedValue:
+                # Left to zeep, which renders or rejects it.
+                pass
+
+        envelope, headers = client.service._binding._create(
+            method_name, (params,), {}, client=client
+        )
+        data = etree_to_string(envelope)
+        if method_name not in self._templates and self._templatable(
+            client, method_name
+        ):
+            self._check_template(method_name, params, envelope, headers, data)
+        return address, data, headers
+
+    def _templatable(self, client: Client, method_name: str) -> bool:
+        """Check if the envelopes of a method can be rendered without zeep.
+
+        Only writes are templated. Plugins, WS-Security and default SOAP headers
+        edit zeep's envelopes.
+        """
+        return (
+            self.envelope_templates
+            and is_write(method_name)
+            and not client.plugins
+            and not client._default_soapheaders
+            and not client.wsse
+            and not client.settings.extra_http_headers
+        )
+
+    def _check_template(
+        self, method_name: str, params: dict, envelope, headers: dict, data: bytes
+    ) -> None:
+        """Compile the template of a method, keeping it if it renders like zeep."""
+        operation = self._client.service._binding.get(method_name)
+        try:
+            template = EnvelopeTemplate(operation, envelope, dict(headers))
+        except TypeError:
+            self._templates[method_name] = None
+            return
+        try:
+            rendered = template.render(params)
+        except UnsupportedValue:
+            # Checked on a later call.
+            return
+        self._templates[method_name] = template if rendered == data else None
+
+    def _check_reply(self, method_name: str, response: Response) -> None:
+        """Raise the error of a response posted without zeep, if it failed."""
+        if response.status_code == 200:
+            return
+        if response.status_code in TRANSIENT_STATUSES:
+            response.raise_for_status()
+        binding = self._client.service._binding
+        binding.process_reply(self._client, binding.get(method_name), response)
+
+    def _raw_decoder(self, method_name: str) -> RawDecoder:
+        """Return the raw decoder of a method, compiling it on first use."""
+        decoder = self._raw_decoders.get(method_name)
+        if decoder is None:
+            operation = self._client.service._binding.get(method_name)
+            decoder = RawDecoder(operation, self._client.wsdl.types)
+            self._raw_decoders[method_name] = decoder
+        return decoder
+
+    def _send_raw(self, method_name: str, params: dict) -> Response:
+        """Call a SOAP method once and decode its response without zeep objects."""
+        address, data, headers = self._envelope(method_name, params)
+        with self.throttle.slot(method_name):
+            started = time.perf_counter()
+            response = self._session.post(
+                address, data=data, headers=headers, timeout=self._timeout
+            )
+        record_exchange(started, len(data), len(response.content))
+        self._check_reply(method_name, response)
+        return self._raw_decoder(method_name)(response.content)
+
+    def _open_stream(self, method_name: str, params: dict) -> Response:
+        """Call a SOAP method once and return the response before reading its body."""
+        address, data, headers = self._envelope(method_name, params)
+        with self.throttle.slot(method_name):
+            started = time.perf_counter()
+            response = self._session.post(
+                address, data=data, headers=headers, timeout=self._timeout, stream=True
+            )
+        record_exchange(
+            started, len(data), int(response.headers.get("Content-Length") or 0)
+        )
+        if response.status_code != 200:
+            with closing(response):
+                self._check_reply(method_name, response)
         return response
+
+    def _call(
+        self, method_name: str, params: dict, send: Optional[Callable] = None
+    ) -> Response:
+        """Call a SOAP method once, unless the circuit breaker is open.
+
+        :param send: The function making the call, `_send` by default.
+        """
+        start_attempt()
+        if self.breaker is None:
+            response = (send or self._send)(method_name, params)
+        else:
+            response = self.breaker.call(
+                partial(send or self._send, method_name, params),
+                probe=partial(self._send, self.breaker.probe_method, {}),
+            )
+        end_attempt()
+        return response
+
+    def _retry(self, method_name: str, func: Callable[[], Response]) -> Response:
+        """Call a function, retrying it as the retry policy says."""
+        if self.retry_policy is None:
+            return func()
+        return self.retry_policy.call(method_name, func, retry_attempt)
+
+    def request(
+        self,
+        method_name: str,
+        params: Optional[dict] = {},
+        bypass_cache: bool = False,
+        raw: bool = False,
+        write_behind: bool = True,
+        **kwargs,
+    ) -> Response:
+        """Make a request to the Footprints API and return the response.
+
+        :param method_name: The name of the method to use for the request.
+        For example: `getItemId`, `getTicketDetails`, `getItemDetails`.
+
+        :param params: The parameters to send to footprints.
+
+        :param bypass_cache: Always call footprints, even if a cached response exists.
+
+        :param raw: Decode the response of the `RAW_METHODS` straight into dicts and
+        lists instead of zeep objects. Raw responses aren't cached, other methods
+        ignore it.
+
+        :param write_behind: Spool writes when the requester has a `WriteBehind`,
+        returning their id in the spool instead of footprints' response. Pass False
+        to wait for the response.
+        """
+        if write_behind and self.write_behind is not None and is_write(method_name):
+            return self._spool(method_name, params, kwargs)
+
+        params = self._prepare(method_name, params, kwargs)
+        raw = raw and method_name in RAW_METHODS
+
+        response = MISSING
+        if not bypass_cache and not raw:
+            response = self.response_cache.get(method_name, params)
+        if response is not MISSING:
+            return response
+
+        if self.single_flight is not None and self.single_flight.applies(method_name):
+            return self.single_flight.call(
+                method_name,
+                (method_name, raw, _freeze(params)),
+                partial(self._fetch, method_name, params, raw),
+            )
+        return self._fetch(method_name, params, raw)
+
+    def _fetch(self, method_name: str, params: dict, raw: bool) -> Response:
+        """Call footprints with the prepared params, retrying transient failures."""
+        generation = self.response_cache.generation()
+        with self._observe(method_name, params):
+            if raw:
+                response = self._retry(
+                    method_name,
+                    partial(self._call, method_name, params, self._send_raw),
+                )
+                return self._set_defaults(response, params)
+
+            # Dynamically call the method
+            response = self._retry(
+                method_name, partial(self._call, method_name, params)
+            )
+            response = self._process_response(method_name, response, params, generation)
+
+        return response
+
+    def stream(
+        self, method_name: str, params: dict, parser_class: type, **kwargs
+    ) -> Iterator:
+        """Make a request and yield the items decoded while the response is read.
+
+        Streamed responses are never cached. Retries, the throttle and the circuit
+        breaker only apply until the response starts.
+
+        :param method_name: The name of the method to use for the request.
+
+        :param params: The parameters to send to footprints.
+
+        :param parser_class: The incremental parser of the response, such as
+        `footprintsapi.stream.SearchRowParser`.
+        """
+        params = self._prepare(method_name, params, kwargs)
+        with self._observe(method_name, params):
+            response = self._retry(
+                method_name, partial(self._call, method_name, params, self._open_stream)
+            )
+        return self._iter_stream(response, parser_class())
+
+    def _iter_stream(self, response: Response, parser) -> Iterator:
+        with closing(response), self._handle_errors():
+            for chunk in response.iter_content(CHUNK_SIZE):
+                yield from parser.feed(chunk)
+            yield from parser.close()
+
+
+class _Transport(Transport):
+    """Transport raising an HTTPError on gateway errors and throttling.
+
+    zeep can't parse their bodies, the error carries the response so that the
+    retry policy can see its status and Retry-After header.
+    """
+
+    def post(self, address, message, headers) -> Response:
+        started = time.perf_counter()
+        response = super().post(address, message, headers)
+        record_exchange(started, len(message), len(response.content))
+        if response.status_code in TRANSIENT_STATUSES:
+            response.raise_for_status()
+        return response
+
+
+class _AsyncTransport(AsyncTransport):
+    """Async transport which loads the WSDL with a requests session."""
+
+    def __init__(self, session: Session, client, cache=None) -> None:
+        """Init function.
+
+        :param session: The requests session used to load the WSDL.
+
+        :param client: The httpx client used to call the operations.
+
+        :param cache: The cache used to store the wsdl.
+        """
+        super().__init__(client=client, wsdl_client=session, cache=cache)
+        self.session = session
+        self.session.mount("file://", FileAdapter())
+        self.load_timeout = 300
+
+    _load_remote_data = Transport._load_remote_data
+
+    async def post(self, address, message, headers):
+        started = time.perf_counter()
+        response = await super().post(address, message, headers)
+        record_exchange(started, len(message), len(response.content))
+        if response.status_code in TRANSIENT_STATUSES:
+            response.raise_for_status()
+        return response
+
+
+class AsyncRequester(Requester):
+    """Responsible for handling SOAP requests asynchronously.
+
+    The WSDL is still loaded synchronously on instantiation, only the
+    operations themselves are awaitable.
+    """
+
+    client_class = AsyncClient
+
+    def _build_transport(self, cache: Optional[SqliteCache] = None) -> AsyncTransport:
+        """Build the async zeep transport.
+
+        The WSDL is loaded through the requester's session so that local files,
+        authentication and errors behave exactly like the synchronous client.
+        """
+        if httpx is None:
+            raise ImportError(
+                "The async client requires httpx, install it with "
+                "`pip install footprintsapi[async]`."
+            )
+
+        transport = httpx.AsyncHTTPTransport(retries=self.max_retries)
+        if self.tape is not None:
+            transport = self.tape.async_transport(transport)
+        self._async_session = httpx.AsyncClient(
+            auth=(self.client_id, self.client_secret),
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.pool_maxsize,
+                max_keepalive_connections=self.pool_maxsize if self.keep_alive else 0,
+            ),
+            transport=transport,
+        )
+        return _AsyncTransport(self._session, self._async_session, cache)
+
+    def _start_write_behind(self, write_behind: WriteBehind) -> None:
+        """Refuse write-behind, which sends writes from a thread without a loop."""
+        raise TypeError("Write-behind is only supported by the synchronous client.")
+
+    @contextmanager
+    def _handle_errors(self):
+        """Map errors raised while calling footprints to footprints exceptions."""
+        try:
+            with super()._handle_errors():
+                yield
+        except httpx.HTTPError as e:
+            raise FootprintsException(e)
+
+    async def _send(self, method_name: str, params: dict) -> Response:
+        """Call a SOAP method once, within the throttle limits."""
+        client = self._client
+        async with self.throttle.aslot(method_name):
+            if not self._templatable(client, method_name):
+                return await client.service[method_name](params)
+            address, data, headers = self._envelope(method_name, params)
+            response = await client.transport.post(address, data, headers)
+            return self._process_reply(
+                method_name, client.transport.new_response(response)
+            )
+
+    def _check_reply(self, method_name: str, response) -> None:
+        """Raise the error of a response posted without zeep, if it failed."""
+        if response.status_code == 200:
+            return
+        if response.status_code in TRANSIENT_STATUSES:
+            response.raise_for_status()
+        super()._check_reply(method_name, self._client.transport.new_response(response))
+
+    async def _send_raw(self, method_name: str, params: dict) -> Response:
+        """Call a SOAP method once and decode its response without zeep objects."""
+        address, data, headers = self._envelope(method_name, params)
+        async with self.throttle.aslot(method_name):
+            started = time.perf_counter()
+            response = await self._async_session.post(
+                address, content=data, headers=headers
+            )
+        record_exchange(started, len(data), len(response.content))
+        self._check_reply(method_name, response)
+        return self._raw_decoder(method_name)(response.content)
+
+    async def _open_stream(self, method_name: str, params: dict):
+        """Call a SOAP method once and return the response before reading its body."""
+        address, data, headers = self._envelope(method_name, params)
+        async with self.throttle.aslot(method_name):
+            request = self._async_session.build_request(
+                "POST", address, content=data, headers=headers
+            )
+            started = time.perf_counter()
+            response = await self._async_session.send(request, stream=True)
+        record_exchange(
+            started, len(data), int(response.headers.get("Content-Length") or 0)
+        )
+        if response.status_code != 200:
+            await response.aread()
+            await response.aclose()
+            self._check_reply(method_name, response)
+        return response
+
+    async def _call(
+        self, method_name: str, params: dict, send: Optional[Callable] = None
+    ) -> Response:
+        """Call a SOAP method once, unless the circuit breaker is open.
+
+        :param send: The coroutine function making the call, `_send` by default.
+        """
+        start_attempt()
+        if self.breaker is None:
+            response = await (send or self._send)(method_name, params)
+        else:
+            response = await self.breaker.acall(
+                partial(send or self._send, method_name, params),
+                probe=partial(self._send, self.breaker.probe_method, {}),
+            )
+        end_attempt()
+        return response
+
+    async def _retry(
+        self, method_name: str, func: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        """Await a coroutine function, retrying it as the retry policy says."""
+        if self.retry_policy is None:
+            return await func()
+        return await self.retry_policy.acall(method_name, func, retry_attempt)
+
+    def stream(
+        self, method_name: str, params: dict, parser_class: type, **kwargs
+    ) -> AsyncIterator:
+        """Make a request and yield the items decoded while the response is read.
+
+        Returns an async iterator, see `Requester.stream`.
+        """
+        params = self._prepare(method_name, params, kwargs)
+        return self._iter_stream(method_name, params, parser_class())
+
+    async def _iter_stream(
+        self, method_name: str, params: dict, parser
+    ) -> AsyncIterator:
+        with self._observe(method_name, params):
+            response = await self._retry(
+                method_name, partial(self._call, method_name, params, self._open_stream)
+            )
+        with self._handle_errors():
+            try:
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    for item in parser.feed(chunk):
+                        yield item
+                for item in parser.close():
+                    yield item
+            finally:
+                await response.aclose()
+
+    async def request(
+        self,
+        method_name: str,
+        params: Optional[dict] = {},
+        bypass_cache: bool = False,
+        raw: bool = False,
+        **kwargs,
+    ) -> Response:
+        """Make an asynchronous request to the Footprints API and return the response.
+
+        :param method_name: The name of the method to use for the request.
+        For example: `getItemId`, `getTicketDetails`, `getItemDetails`.
+
+        :param params: The parameters to send to footprints.
+
+        :param bypass_cache: Always call footprints, even if a cached response exists.
+
+        :param raw: Decode the response without zeep objects, see `Requester.request`.
+        """
+        params = self._prepare(method_name, params, kwargs)
+        raw = raw and method_name in RAW_METHODS
+
+        response = MISSING
+        if not bypass_cache and not raw:
+            response = self.response_cache.get(method_name, params)
+        if response is not MISSING:
+            return response
+
+        if self.single_flight is not None and self.single_flight.applies(method_name):
+            return await self.single_flight.acall(
+                method_name,
+                (method_name, raw, _freeze(params)),
+                partial(self._fetch, method_name, params, raw),
+            )
+        return await self._fetch(method_name, params, raw)
+
+    async def _fetch(self, method_name: str, params: dict, raw: bool) -> Response:
+        """Call footprints with the prepared params, retrying transient failures."""
+        generation = self.response_cache.generation()
+        with self._observe(method_name, params):
+            if raw:
+                response = await self._retry(
+                    method_name,
+                    partial(self._call, method_name, params, self._send_raw),
+                )
+                return self._set_defaults(response, params)
+
+            # Dynamically call the method
+            response = await self._retry(
+                method_name, partial(self._call, method_name, params)
+            )
+            response = self._process_response(method_name, response, params, generation)
+
+        return response
+
+    async def aclose(self) -> None:
+        """Close the underlying http connections."""
+        if self._lazy_client is not None:
+            await self._async_session.aclose()
+            self._session.close()
@@ -0,0 +1,271 @@
+"""Retry transient Footprints failures with capped exponential backoff."""
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+import requests
+import zeep
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+# Statuses returned by proxies and overloaded app servers, never by a SOAP fault.
+TRANSIENT_STATUSES = (429, 502, 503, 504)
+
+
+def is_idempotent(method_name: str) -> bool:
+    """Check if calling a SOAP method twice is harmless."""
+    return method_name.startswith(("get", "list")) or method_name == "runSearch"
+
+
+def _status_code(exception: Exception) -> Optional[int]:
+    """Return the HTTP status behind an exception, if any."""
+    response = getattr(exception, "response", None)
+    if response is not None:
+        return response.status_code
+    return getattr(exception, "status_code", None)
+
+
+def is_transient(
+    exception: Exception, statuses: Iterable[int] = TRANSIENT_STATUSES
+) -> bool:
+    """Check if an exception is a network failure or one of the given HTTP statuses."""
+    if isinstance(exception, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if httpx is not None and isinstance(exception, httpx.TransportError):
+        return True
+    if isinstance(exception, (requests.HTTPError, zeep.exceptions.TransportError)) or (
+        httpx is not None and isinstance(exception, httpx.HTTPStatusError)
+    ):
+        return _status_code(exception) in statuses
+    return False
+
+
+def _retry_after(exception: Exception) -> Optional[float]:
+    """Return the seconds to wait requested by a Retry-After header, if any."""
+    response = getattr(exception, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryBudget:
+    """Bound the number of retries relative to the number of calls.
+
+    The budget starts with `reserve` tokens, each retry spends one and each
+    call earns back `ratio` of a token. During an outage retries stop once the
+    reserve is spent instead of multiplying the load on the server.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: int = 10) -> None:
+        """Init function.
+
+        :param ratio: The share of calls which may be retried in the long run.
+
+        :param reserve: The number of retries allowed in a burst.
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self._tokens = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Earn back part of a retry for a new call."""
+        with self._lock:
+            self._tokens = min(self.reserve, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spend a retry, return False when the budget is exhausted."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of retries currently available."""
+        return self._tokens
+
+
+class RetryPolicy:
+    """Decide which failed calls are retried and how long to wait in between.
+
+    By default only idempotent reads (`get*`, `list*` and `runSearch`) are
+    retried, after connection errors, timeouts and 429/502/503/504 responses.
+    Subclass and override `is_retryable` or `delay` to change the behaviour.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        jitter: bool = True,
+        statuses: Iterable[int] = TRANSIENT_STATUSES,
+        methods: Optional[Iterable[str]] = None,
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        """Init function.
+
+        :param max_attempts: The maximum number of attempts per call, 1 disables retries.
+
+        :param backoff: Seconds to wait before the first retry, doubled on each retry.
+
+        :param max_backoff: The longest wait between two attempts. Calls asked to
+        wait longer by a Retry-After header are not retried.
+
+        :param jitter: Wait a random time up to the backoff to spread out retries.
+
+        :param statuses: The HTTP statuses worth retrying.
+
+        :param methods: The SOAP methods to retry, idempotent reads by default.
+
+        :param budget: The retry budget, shared by every call using the policy.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods) if methods is not None else None
+        self.budget = budget or RetryBudget()
+        self.attempts = Counter()
+        self.retries = Counter()
+        self.failures = Counter()
+        self._lock = threading.Lock()
+
+    def is_retryable(self, method_name: str, exception: Exception) -> bool:
+        """Check if a call which raised an exception should be attempted again."""
+        if self.methods is not None:
+            if method_name not in self.methods:
+                return False
+        elif not is_idempotent(method_name):
+            return False
+        return is_transient(exception, self.statuses)
+
+    def delay(self, attempt: int, exception: Exception) -> Optional[float]:
+        """Return the seconds to wait before the next attempt, None to give up.
+
+        :param attempt: The number of the attempt which failed, starting at 1.
+
+        :param exception: The exception raised by the failed attempt.
+        """
+        retry_after = _retry_after(exception)
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_backoff else None
+
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def _next_delay(
+        self, method_name: str, attempt: int, exception: Exception
+    ) -> Optional[float]:
+        """Return the wait before retrying a failed attempt, None to raise."""
+        if attempt >= self.max_attempts or not self.is_retryable(
+            method_name, exception
+        ):
+            return None
+        delay = self.delay(attempt, exception)
+        if delay is None or not self.budget.withdraw():
+            return None
+        with self._lock:
+            self.retries[method_name] += 1
+        return delay
+
+    def _attempted(self, method_name: str, failed: bool = False) -> None:
+        with self._lock:
+            self.attempts[method_name] += 1
+            if failed:
+                self.failures[method_name] += 1
+
+    def call(
+        self,
+        method_name: str,
+        func: Callable[[], Any],
+        on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+    ) -> Any:
+        """Call a function, retrying it while it fails with a transient error.
+
+        :param method_name: The SOAP method called by the function.
+
+        :param func: The function making the call.
+
+        :param on_retry: Called with the number of the failed attempt, its
+        exception and the delay before the next one, before waiting.
+        """
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = func()
+            except Exception as e:
+                self._attempted(method_name, failed=True)
+                delay = self._next_delay(method_name, attempt, e)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                time.sleep(delay)
+            else:
+                self._attempted(method_name)
+                return result
+
+    async def acall(
+        self,
+        method_name: str,
+        func: Callable[[], Awaitable],
+        on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+    ) -> Any:
+        """Await a coroutine function, retrying it while it fails with a transient error.
+
+        :param method_name: The SOAP method called by the function.
+
+        :param func: The coroutine function making the call.
+
+        :param on_retry: Called with the number of the failed attempt, its
+        exception and the delay before the next one, before waiting.
+        """
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = await func()
+            except Exception as e:
+                self._attempted(method_name, failed=True)
+                delay = self._next_delay(method_name, attempt, e)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                await asyncio.sleep(delay)
+            else:
+                self._attempted(method_name)
+                return result
+
+    def stats(self) -> dict:
+        """Return the attempt, retry and failure counters per method."""
+        with self._lock:
+            return dict(
+                attempts=dict(self.attempts),
+                retries=dict(self.retries),
+                failures=dict(self.failures),
+                budget=self.budget.tokens,
+            )
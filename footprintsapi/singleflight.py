@@ -0,0 +1,139 @@
+"""Share a read call in flight with the identical calls made meanwhile.
+
+While a call is waiting for footprints, threads or tasks making the same call
+wait for it and get its response, or its exception, instead of sending their
+own. Once it returns the next call goes to footprints again, so no response
+is reused after it was received: that is the response cache's job.
+"""
+
+import asyncio
+import threading
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional
+
+from .retry import is_idempotent
+
+
+class _Flight:
+    """A call in flight and its outcome, once known."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls of the read methods.
+
+    Coalesced calls share the response object of the call they waited for,
+    as cache hits do. They don't reach footprints, so they aren't counted by
+    the metrics nor seen by the request hooks.
+    """
+
+    def __init__(self, methods: Optional[Iterable[str]] = None) -> None:
+        """Init function.
+
+        :param methods: The SOAP methods coalesced, idempotent reads by default.
+        Pass an empty list to disable coalescing.
+        """
+        self.methods = None if methods is None else frozenset(methods)
+        self.calls = Counter()
+        self.coalesced = Counter()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def applies(self, method_name: str) -> bool:
+        """Check if the calls of a method are coalesced."""
+        if self.methods is None:
+            return is_idempotent(method_name)
+        return method_name in self.methods
+
+    def call(self, method_name: str, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Call a function, unless an identical call is in flight.
+
+        :param method_name: The SOAP method called by the function.
+
+        :param key: Identifies the call, such as the method and its params.
+
+        :param func: The function making the call.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls[method_name] += 1
+            else:
+                self.coalesced[method_name] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    async def acall(
+        self, method_name: str, key: Hashable, func: Callable[[], Awaitable]
+    ) -> Any:
+        """Await a coroutine function, unless an identical call is in flight.
+
+        Calls are only shared within an event loop. Tasks waiting for a call
+        which gets cancelled are cancelled as well.
+
+        :param method_name: The SOAP method called by the function.
+
+        :param key: Identifies the call, such as the method and its params.
+
+        :param func: The coroutine function making the call.
+        """
+        loop = asyncio.get_event_loop()
+        key = (loop, key)
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = self._futures[key] = loop.create_future()
+                self.calls[method_name] += 1
+            else:
+                self.coalesced[method_name] += 1
+
+        if not leader:
+            # A waiter being cancelled mustn't cancel the call of the others.
+            return await asyncio.shield(future)
+
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here, waiters or not, so asyncio doesn't log it.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._futures[key]
+
+    def stats(self) -> dict:
+        """Return the calls made and the calls coalesced per method."""
+        with self._lock:
+            return dict(calls=dict(self.calls), coalesced=dict(self.coalesced))
@@ -0,0 +1,205 @@
+"""Precompiled WSDL snapshots.
+
+Parsing the Footprints WSDL and its schema is the slowest part of building a
+client. A snapshot stores the parsed zeep document on disk so that later
+processes can load it without fetching or parsing any XML.
+
+Snapshots are pickles, only load snapshots you created yourself. Create one with::
+
+    $ python -m footprintsapi.snapshot https://{host}/footprints/...?wsdl footprints.wsdl.pickle
+"""
+
+import argparse
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from typing import Optional, Type
+
+import zeep
+
+# The descriptors zeep caches the properties of its types with.
+from cached_property import cached_property, threaded_cached_property
+from lxml import etree
+from zeep import Client, Settings
+from zeep.transports import Transport
+from zeep.wsdl import Document
+
+# Bump when the layout of the pickled document changes.
+SNAPSHOT_VERSION = 1
+
+_DYNAMIC_TYPES_MODULE = "zeep.xsd.dynamic_types"
+
+logger = logging.getLogger(__name__)
+
+
+def _rebuild_type(name: str, bases: tuple, attributes: dict) -> type:
+    """Recreate a type generated by zeep while parsing the schema."""
+    return type(name, bases, attributes)
+
+
+def _cached_properties(cls: type) -> set:
+    """Return the names of the cached properties of a class."""
+    return {
+        name
+        for klass in cls.__mro__
+        for name, value in vars(klass).items()
+        if isinstance(value, (cached_property, threaded_cached_property))
+    }
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickle a zeep document, leaving out the transport and settings.
+
+    Cached properties are dropped as well since they may hold types generated
+    on the fly, they are recomputed on first use.
+    """
+
+    def persistent_id(self, obj) -> Optional[str]:
+        if isinstance(obj, Transport):
+            return "transport"
+        if isinstance(obj, Settings):
+            return "settings"
+        return None
+
+    def reducer_override(self, obj):
+        if isinstance(obj, type):
+            if obj.__module__ != _DYNAMIC_TYPES_MODULE:
+                return NotImplemented
+            attributes = {
+                k: v for k, v in vars(obj).items() if k in ("__module__", "_xsd_name")
+            }
+            return _rebuild_type, (obj.__name__, obj.__bases__, attributes)
+
+        if isinstance(obj, etree.QName):
+            return etree.QName, (obj.text,)
+
+        if type(obj).__module__.startswith("zeep.") and hasattr(obj, "__dict__"):
+            names = _cached_properties(type(obj))
+            if names:
+                reduced = list(obj.__reduce_ex__(pickle.HIGHEST_PROTOCOL))
+                reduced[2] = {k: v for k, v in reduced[2].items() if k not in names}
+                return tuple(reduced)
+
+        return NotImplemented
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Load a zeep document, binding it to the given transport and settings."""
+
+    def __init__(self, file, transport: Transport, settings: Settings) -> None:
+        super().__init__(file)
+        self._persistent = dict(transport=transport, settings=settings)
+
+    def persistent_load(self, pid: str):
+        return self._persistent[pid]
+
+
+def save_snapshot(document: Document, path: str) -> None:
+    """Write a parsed WSDL document to disk.
+
+    :param document: The document of a zeep client, `client.wsdl`.
+
+    :param path: Where to write the snapshot.
+    """
+    if sys.version_info < (3, 8):
+        raise RuntimeError("Creating WSDL snapshots requires Python 3.8 or newer.")
+
+    snapshot = dict(
+        version=SNAPSHOT_VERSION,
+        zeep=zeep.__version__,
+        location=document.location,
+        document=document,
+    )
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            _SnapshotPickler(fh, protocol=pickle.HIGHEST_PROTOCOL).dump(snapshot)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_snapshot(
+    path: str,
+    transport: Transport,
+    settings: Optional[Settings] = None,
+    location: Optional[str] = None,
+) -> Optional[Document]:
+    """Load a parsed WSDL document from disk.
+
+    :param path: The snapshot path.
+
+    :param transport: The transport the document should use.
+
+    :param settings: The zeep settings the document should use.
+
+    :param location: The expected WSDL location, if given snapshots of another
+    location are ignored.
+
+    :return: The document, or None when there is no usable snapshot. Corrupt,
+    truncated or incompatible snapshots are logged and ignored.
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as fh:
+            snapshot = _SnapshotUnpickler(fh, transport, settings or Settings()).load()
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        logger.warning("Ignoring the unreadable WSDL snapshot %s: %r", path, e)
+        return None
+
+    if (
+        not isinstance(snapshot, dict)
+        or snapshot.get("version") != SNAPSHOT_VERSION
+        or snapshot.get("zeep") != zeep.__version__
+        or (location and snapshot.get("location") != location)
+    ):
+        return None
+    return snapshot["document"]
+
+
+def bind_document(
+    client_class: Type[Client],
+    document: Document,
+    transport: Transport,
+    settings: Optional[Settings] = None,
+) -> Client:
+    """Build a zeep client around an already parsed document.
+
+    Mirrors `zeep.Client.__init__` without loading the WSDL.
+    """
+    client = client_class.__new__(client_class)
+    client.settings = settings or document.settings
+    client.transport = transport
+    client.wsdl = document
+    client.wsse = None
+    client.plugins = []
+    client._default_service = None
+    client._default_service_name = None
+    client._default_port_name = None
+    client._default_soapheaders = None
+    return client
+
+
+def main() -> None:
+    """Parse a WSDL and write its snapshot."""
+    parser = argparse.ArgumentParser(description="Create a Footprints WSDL snapshot.")
+    parser.add_argument("base_url", help="The WSDL url or path.")
+    parser.add_argument("path", help="Where to write the snapshot.")
+    parser.add_argument("--client-id", help="Username used to fetch the WSDL.")
+    parser.add_argument("--client-secret", help="Password used to fetch the WSDL.")
+    args = parser.parse_args()
+
+    transport = Transport()
+    if args.client_id:
+        transport.session.auth = (args.client_id, args.client_secret)
+    save_snapshot(Client(args.base_url, transport=transport).wsdl, args.path)
+
+
+if __name__ == "__main__":
+    main()
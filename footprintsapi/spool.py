@@ -0,0 +1,462 @@
+"""Write-behind queue spooling Footprints writes to a local sqlite database.
+
+Writes (`create*`, `edit*` and `link*` methods) handed to a `WriteBehind` are
+committed to a sqlite file and acknowledged right away. A background thread
+drains the spool in batches: writes touching the same item are sent one after
+the other in the order they were queued, consecutive `editTicket` calls of a
+ticket are merged into one, and transient failures are retried with backoff.
+Writes still in the spool when the process exits are sent by the next
+`WriteBehind` opening the same file.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .exceptions import CircuitOpen
+from .retry import is_transient
+from .utils import merge_ticket_fields
+
+logger = logging.getLogger(__name__)
+
+WRITE_PREFIXES = ("create", "edit", "link")
+
+# Params holding the id of an existing item, writes sharing one are kept in order.
+ORDERING_PARAMS = (
+    "ticket_id",
+    "item_id",
+    "ci_id",
+    "contact_id",
+    "first_ticket_id",
+    "second_ticket_id",
+    "first_item_id",
+    "second_item_id",
+)
+
+# Params of `editTicket` merged when coalescing consecutive edits.
+MERGED_PARAMS = ("ticket_fields", "assignees")
+
+
+def is_write(method_name: str) -> bool:
+    """Check if a SOAP method creates, edits or links items."""
+    return method_name.startswith(WRITE_PREFIXES)
+
+
+def ordering_keys(params: dict) -> Tuple[str, ...]:
+    """Return the ids of the items a write touches."""
+    return tuple(
+        str(params[name]) for name in ORDERING_PARAMS if params.get(name) is not None
+    )
+
+
+class SpooledWrite(NamedTuple):
+    """A write waiting in the spool."""
+
+    id: int
+    method_name: str
+    params: Dict[str, Any]
+    keys: Tuple[str, ...]
+    attempts: int = 0
+    not_before: float = 0.0
+    error: Optional[str] = None
+
+
+class WriteSpool:
+    """Durable FIFO of writes kept in a sqlite database.
+
+    Sent writes are deleted, writes which failed for good are kept aside
+    until they are requeued or discarded.
+    """
+
+    def __init__(self, path: str, timeout: Optional[int] = 60) -> None:
+        """Init function.
+
+        :param path: The sqlite database path.
+
+        :param timeout: Seconds to wait for the database lock.
+        """
+        if path == ":memory:":
+            raise ValueError("The write spool requires a database file.")
+
+        self._lock = threading.RLock()
+        # One connection shared under the lock keeps acknowledgements fast.
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                    CREATE TABLE IF NOT EXISTS writes
+                    (id integer PRIMARY KEY AUTOINCREMENT, method_name text,
+                    params text, keys text, attempts integer DEFAULT 0,
+                    not_before real DEFAULT 0, error text, failed integer DEFAULT 0)
+                """
+            )
+
+    def _fetch(self, query: str, args: Iterable = ()) -> List[SpooledWrite]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, method_name, params, keys, attempts, not_before, error "
+                f"FROM writes {query}",
+                tuple(args),
+            ).fetchall()
+        return [
+            SpooledWrite(
+                row[0], row[1], json.loads(row[2]), tuple(json.loads(row[3])), *row[4:]
+            )
+            for row in rows
+        ]
+
+    def _update(self, query: str, ids: Iterable[int], *args) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(query, [(*args, id) for id in ids])
+
+    def put(self, method_name: str, params: dict) -> int:
+        """Queue a write, return its id once committed.
+
+        :param method_name: The SOAP method to call.
+
+        :param params: The params of the call, they must be serializable to JSON.
+        """
+        data = json.dumps(params)
+        keys = json.dumps(ordering_keys(params))
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "INSERT INTO writes (method_name, params, keys) VALUES (?, ?, ?)",
+                (method_name, data, keys),
+            ).lastrowid
+
+    def pending(self, limit: int = -1) -> List[SpooledWrite]:
+        """Return the writes waiting to be sent, oldest first."""
+        return self._fetch("WHERE failed=0 ORDER BY id LIMIT ?", (limit,))
+
+    def failed(self) -> List[SpooledWrite]:
+        """Return the writes which failed for good, oldest first."""
+        return self._fetch("WHERE failed=1 ORDER BY id")
+
+    def count(self, failed: bool = False, up_to: Optional[int] = None) -> int:
+        """Return the number of pending or failed writes, up to an id."""
+        query = "SELECT COUNT(*) FROM writes WHERE failed=?"
+        args = (int(failed),)
+        if up_to is not None:
+            query += " AND id<=?"
+            args += (up_to,)
+        with self._lock:
+            return self._conn.execute(query, args).fetchone()[0]
+
+    def last_id(self) -> int:
+        """Return the id of the last write queued, 0 if none was."""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(id) FROM writes").fetchone()
+        return row[0] or 0
+
+    def delete(self, ids: Iterable[int]) -> None:
+        """Remove writes from the spool, once sent or when discarded."""
+        self._update("DELETE FROM writes WHERE id=?", ids)
+
+    def retry(self, ids: Iterable[int], error: str, not_before: float) -> None:
+        """Count a failed attempt of writes and delay their next one."""
+        self._update(
+            "UPDATE writes SET attempts=attempts+1, error=?, not_before=? WHERE id=?",
+            ids,
+            error,
+            not_before,
+        )
+
+    def fail(self, ids: Iterable[int], error: str) -> None:
+        """Set writes aside for good."""
+        self._update(
+            "UPDATE writes SET attempts=attempts+1, error=?, failed=1 WHERE id=?",
+            ids,
+            error,
+        )
+
+    def requeue(self, ids: Optional[Iterable[int]] = None) -> None:
+        """Queue failed writes again, all of them by default."""
+        if ids is None:
+            ids = [write.id for write in self.failed()]
+        self._update(
+            "UPDATE writes SET attempts=0, not_before=0, failed=0 WHERE id=?", ids
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _coalesce(chain: List[SpooledWrite]) -> List[List[SpooledWrite]]:
+    """Split a chain of writes into calls, merging consecutive edits of a ticket."""
+    calls = []
+    for write in chain:
+        previous = calls[-1][-1] if calls else None
+        if (
+            previous is not None
+            and write.method_name == previous.method_name == "editTicket"
+            and write.keys == previous.keys
+            and isinstance(write.params.get("ticket_fields"), dict)
+            and isinstance(previous.params.get("ticket_fields"), dict)
+            and {k: v for k, v in write.params.items() if k not in MERGED_PARAMS}
+            == {k: v for k, v in previous.params.items() if k not in MERGED_PARAMS}
+        ):
+            calls[-1].append(write)
+        else:
+            calls.append([write])
+    return calls
+
+
+def _merged_params(writes: List[SpooledWrite]) -> dict:
+    """Return the params of a single call applying writes in order."""
+    if len(writes) == 1:
+        return writes[0].params
+    params = dict(writes[0].params)
+    params["ticket_fields"] = merge_ticket_fields(
+        write.params["ticket_fields"] for write in writes
+    )
+    for write in writes:
+        if write.params.get("assignees") is not None:
+            params["assignees"] = write.params["assignees"]
+    return params
+
+
+class WriteBehind:
+    """Acknowledge writes once spooled and send them from a background thread.
+
+    Writes are delivered at least once: a write sent before a network failure
+    may be sent again. Those failing with anything but a network error, a
+    transient HTTP status or an open circuit are set aside in the spool, see
+    `WriteSpool.failed`. The later writes of the same items are set aside with
+    them, so that `WriteSpool.requeue` sends them all again in order.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 100,
+        concurrency: int = 4,
+        max_attempts: int = 10,
+        backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        poll_interval: float = 1.0,
+        timeout: Optional[int] = 60,
+    ) -> None:
+        """Init function.
+
+        :param path: The sqlite database path of the spool.
+
+        :param batch_size: The maximum number of writes read from the spool at once.
+
+        :param concurrency: The maximum number of calls in flight, writes touching
+        the same item are never sent concurrently.
+
+        :param max_attempts: Attempts made before a write is set aside.
+
+        :param backoff: Seconds to wait before the first retry, doubled on each retry.
+
+        :param max_backoff: The longest wait between two attempts.
+
+        :param poll_interval: Seconds between two checks of the spool while idle.
+
+        :param timeout: Seconds to wait for the database lock.
+        """
+        self.spool = WriteSpool(path, timeout)
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.sent = 0
+        self.retried = 0
+        self._lock = threading.Lock()
+        self._send = None
+        self._thread = None
+        self._stopping = False
+        self._wakeup = threading.Event()
+        self._drained = threading.Condition()
+        self._executor = None
+
+    def start(self, send: Callable[[str, dict], Any]) -> None:
+        """Start sending the spooled writes in a background thread.
+
+        :param send: The function making a call, given the method name and params.
+        """
+        self._send = send
+        with self._drained:
+            self._stopping = False
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="footprints-write-behind", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def submit(self, method_name: str, params: dict) -> int:
+        """Spool a write, return its id in the spool.
+
+        :param method_name: The SOAP method to call.
+
+        :param params: The params of the call, they must be serializable to JSON.
+        """
+        write_id = self.spool.put(method_name, params)
+        if self._send is not None:
+            self.start(self._send)
+        return write_id
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the writes spooled so far are sent or set aside.
+
+        Writes waiting for a retry are still only sent after their backoff.
+
+        :param timeout: The maximum number of seconds to wait, forever by default.
+
+        :return: Whether the writes were all handled in time.
+        """
+        last_id = self.spool.last_id()
+        if self._thread is None or not self._thread.is_alive():
+            return not self.spool.count(up_to=last_id)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        self._wakeup.set()
+        with self._drained:
+            while self.spool.count(up_to=last_id):
+                remaining = deadline - time.monotonic() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._drained.wait(remaining)
+        return True
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Flush the spool, then stop the background thread.
+
+        :param timeout: The maximum number of seconds to wait for the flush.
+
+        :return: Whether the writes were all handled in time.
+        """
+        flushed = self.flush(timeout)
+        with self._drained:
+            self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        return flushed
+
+    def stats(self) -> dict:
+        """Return the number of writes pending, set aside, sent and retried."""
+        return dict(
+            pending=self.spool.count(),
+            failed=self.spool.count(failed=True),
+            sent=self.sent,
+            retried=self.retried,
+        )
+
+    def _run(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            while not self._stopping:
+                self._wakeup.clear()
+                try:
+                    wait = self._drain()
+                except Exception:
+                    logger.exception("Error while draining the write spool")
+                    wait = self.poll_interval
+                with self._drained:
+                    self._drained.notify_all()
+                if wait:
+                    self._wakeup.wait(wait)
+        finally:
+            self._executor.shutdown()
+
+    def _drain(self) -> float:
+        """Send a batch of due writes, return the seconds to wait before the next."""
+        now = time.time()
+        chains = []
+        chain_of_key = {}
+        blocked = set()
+        next_due = now + self.poll_interval
+        # The first write set aside of each item, its later writes are set aside too.
+        set_aside = {}
+        for write in self.spool.failed():
+            for key in write.keys:
+                set_aside.setdefault(key, write.id)
+        for write in self.spool.pending(self.batch_size):
+            keys = write.keys or (f"#{write.id}",)
+            held = [
+                set_aside[key]
+                for key in keys
+                if set_aside.get(key, write.id) < write.id
+            ]
+            if held:
+                self._set_aside([write], min(held))
+                for key in keys:
+                    set_aside.setdefault(key, write.id)
+                continue
+            if write.not_before > now or blocked.intersection(keys):
+                # Later writes of the same items wait for this one.
+                blocked.update(keys)
+                next_due = min(next_due, max(write.not_before, now))
+                continue
+            joined = sorted({chain_of_key[key] for key in keys if key in chain_of_key})
+            if not joined:
+                chain = len(chains)
+                chains.append([])
+            else:
+                # A write touching several chains joins them into the first one.
+                chain = joined[0]
+                for other in joined[1:]:
+                    chains[chain] += chains[other]
+                    chains[other] = []
+                    for key, index in chain_of_key.items():
+                        if index == other:
+                            chain_of_key[key] = chain
+                chains[chain].sort()
+            chains[chain].append(write)
+            for key in keys:
+                chain_of_key[key] = chain
+
+        chains = [chain for chain in chains if chain]
+        if not chains:
+            return max(0.0, next_due - now)
+        list(self._executor.map(self._send_chain, chains))
+        return 0.0
+
+    def _send_chain(self, chain: List[SpooledWrite]) -> None:
+        """Send writes in order, stopping at the first one to be retried or set aside."""
+        calls = iter(_coalesce(chain))
+        for writes in calls:
+            ids = [write.id for write in writes]
+            try:
+                self._send(writes[0].method_name, _merged_params(writes))
+            except Exception as e:
+                attempts = max(write.attempts for write in writes) + 1
+                if _is_transient(e) and attempts < self.max_attempts:
+                    delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+                    self.spool.retry(ids, repr(e), time.time() + delay)
+                    with self._lock:
+                        self.retried += len(ids)
+                    return
+                logger.warning("Setting aside spooled writes %s: %r", ids, e)
+                self.spool.fail(ids, repr(e))
+                self._set_aside([write for later in calls for write in later], ids[0])
+                return
+            else:
+                self.spool.delete(ids)
+                with self._lock:
+                    self.sent += len(ids)
+
+    def _set_aside(self, writes: List[SpooledWrite], failed_id: int) -> None:
+        """Set writes aside behind an earlier write of their items set aside."""
+        if writes:
+            ids = [write.id for write in writes]
+            logger.warning("Setting aside spooled writes %s after %s", ids, failed_id)
+            self.spool.fail(ids, f"Set aside after the write {failed_id}")
+
+
+def _is_transient(exception: Exception) -> bool:
+    """Check if a failed write is worth retrying, even once mapped by the requester."""
+    if isinstance(exception, CircuitOpen):
+        return True
+    context = exception.__context__
+    return is_transient(exception) or (context is not None and is_transient(context))
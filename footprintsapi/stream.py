@@ -0,0 +1,93 @@
+"""Incremental parsing of large SOAP responses."""
+
+from typing import Iterator, List, Optional
+
+from lxml import etree
+from zeep.exceptions import Fault
+
+from .models import SearchRow
+
+
+def _local_name(element: etree._Element) -> str:
+    return etree.QName(element).localname
+
+
+def _values(element: Optional[etree._Element]) -> List[Optional[str]]:
+    """Return the texts of the `value` children of a valuesList element."""
+    if element is None:
+        return []
+    return [value.text for value in element]
+
+
+def _int(text: Optional[str]) -> Optional[int]:
+    return int(text) if text else None
+
+
+def decode_search_row(element: etree._Element) -> SearchRow:
+    """Decode an `_items` element of a `runSearch` response."""
+    row = dict(fields={}, assignees=[])
+    for child in element:
+        name = child.tag
+        if name == "_itemFields":
+            fields = row["fields"]
+            for field in child:
+                field_name = field.find("fieldName")
+                if field_name is None:
+                    continue
+                value = field.find("fieldValue")
+                if value is not None:
+                    value = _values(value)
+                    if len(value) == 1:
+                        value = value[0]
+                fields[field_name.text] = value
+        elif name == "_assignees":
+            row["assignees"] = _values(child)
+        elif name in ("_containerDefinitionId", "_itemDefinitionId", "_itemId"):
+            row[name] = _int(child.text)
+        else:
+            row[name] = child.text
+    return SearchRow(
+        container_definition_id=row.get("_containerDefinitionId"),
+        container_definition_name=row.get("_containerDefinitionName"),
+        item_definition_id=row.get("_itemDefinitionId"),
+        item_definition_name=row.get("_itemDefinitionName"),
+        item_id=row.get("_itemId"),
+        fields=row["fields"],
+        assignees=row["assignees"],
+    )
+
+
+class SearchRowParser:
+    """Parse a `runSearch` response fed in chunks, yielding rows as they end.
+
+    Each row is dropped from the tree once decoded, so memory use doesn't
+    grow with the number of rows.
+    """
+
+    def __init__(self) -> None:
+        """Init function."""
+        self._parser = etree.XMLPullParser(
+            events=("end",), tag=("{*}_items", "{*}Fault"), resolve_entities=False
+        )
+
+    def _rows(self) -> Iterator[SearchRow]:
+        for _, element in self._parser.read_events():
+            if _local_name(element) == "Fault":
+                raise Fault(
+                    element.findtext("faultstring"), code=element.findtext("faultcode")
+                )
+            yield decode_search_row(element)
+            element.clear()
+            parent = element.getparent()
+            while element.getprevious() is not None:
+                del parent[0]
+
+    def feed(self, chunk: bytes) -> Iterator[SearchRow]:
+        """Parse a chunk of the response and yield the rows it completed."""
+        self._parser.feed(chunk)
+        return self._rows()
+
+    def close(self) -> Iterator[SearchRow]:
+        """Finish parsing and yield the remaining rows."""
+        self._parser.close()
+        return self._rows()
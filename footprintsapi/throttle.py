@@ -0,0 +1,198 @@
+"""Client-side rate limiting and concurrency control for Footprints calls."""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, NamedTuple, Optional
+
+from .retry import is_idempotent
+
+
+class Limit(NamedTuple):
+    """How many calls of a method class may be made.
+
+    `rate` is in calls per second, `burst` the number of calls allowed at once
+    after an idle period and `max_in_flight` the number of concurrent calls.
+    `None` leaves the dimension unlimited.
+    """
+
+    rate: Optional[float] = None
+    burst: Optional[int] = None
+    max_in_flight: Optional[int] = None
+
+
+class TokenBucket:
+    """A thread-safe token bucket.
+
+    Tokens are reserved ahead of time so callers sleep outside of the lock,
+    either with `time.sleep` or `asyncio.sleep`, and are served in order.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Init function.
+
+        :param rate: The number of tokens added per second.
+
+        :param burst: The bucket capacity, defaults to one second worth of tokens.
+
+        :param clock: Returns the current time in seconds, `time.monotonic` by default.
+        """
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before using it."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class _Governor:
+    """The bucket and concurrency limit of one method class."""
+
+    def __init__(self, limit: Limit) -> None:
+        self.limit = limit
+        self.bucket = TokenBucket(limit.rate, limit.burst) if limit.rate else None
+        self.semaphore = None
+        if limit.max_in_flight:
+            self.semaphore = threading.BoundedSemaphore(limit.max_in_flight)
+        self._async_semaphore = None
+        self.calls = 0
+        self.in_flight = 0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def async_semaphore(self) -> Optional[asyncio.Semaphore]:
+        # Created on first use so that it belongs to the running loop.
+        if self._async_semaphore is None and self.limit.max_in_flight:
+            self._async_semaphore = asyncio.Semaphore(self.limit.max_in_flight)
+        return self._async_semaphore
+
+    def _enter(self, waited: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.waited += waited
+
+    def _exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    @contextmanager
+    def slot(self):
+        start = time.monotonic()
+        if self.semaphore:
+            self.semaphore.acquire()
+        try:
+            if self.bucket:
+                time.sleep(self.bucket.reserve())
+            self._enter(time.monotonic() - start)
+            try:
+                yield
+            finally:
+                self._exit()
+        finally:
+            if self.semaphore:
+                self.semaphore.release()
+
+    async def aslot_enter(self) -> None:
+        start = time.monotonic()
+        if self.async_semaphore:
+            await self.async_semaphore.acquire()
+        try:
+            if self.bucket:
+                await asyncio.sleep(self.bucket.reserve())
+        except BaseException:
+            if self.async_semaphore:
+                self.async_semaphore.release()
+            raise
+        self._enter(time.monotonic() - start)
+
+    def aslot_exit(self) -> None:
+        self._exit()
+        if self.async_semaphore:
+            self.async_semaphore.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(
+                calls=self.calls,
+                in_flight=self.in_flight,
+                waited=self.waited,
+                **self.limit._asdict(),
+            )
+
+
+class _AsyncSlot:
+    """Async context manager holding a slot of a governor."""
+
+    def __init__(self, governor: _Governor) -> None:
+        self._governor = governor
+
+    async def __aenter__(self) -> None:
+        await self._governor.aslot_enter()
+
+    async def __aexit__(self, *args) -> None:
+        self._governor.aslot_exit()
+
+
+class Throttle:
+    """Limit the rate and concurrency of the calls made to a Footprints endpoint.
+
+    Reads (`get*`, `list*` and `runSearch`) and writes are limited separately.
+    Share one throttle between every `Footprints` object talking to the same
+    endpoint to limit their combined load. Sync and async clients should use
+    separate throttles, their in-flight limits aren't shared.
+    """
+
+    def __init__(
+        self, read: Optional[Limit] = None, write: Optional[Limit] = None
+    ) -> None:
+        """Init function.
+
+        :param read: The limit applied to idempotent reads.
+
+        :param write: The limit applied to every other method.
+        """
+        self._governors = dict(
+            read=_Governor(read or Limit()), write=_Governor(write or Limit())
+        )
+
+    @staticmethod
+    def method_class(method_name: str) -> str:
+        """Return the class of a SOAP method, `read` or `write`."""
+        return "read" if is_idempotent(method_name) else "write"
+
+    def slot(self, method_name: str):
+        """Wait for a slot to call a method, releasing it on exit.
+
+        :param method_name: The SOAP method about to be called.
+        """
+        return self._governors[self.method_class(method_name)].slot()
+
+    def aslot(self, method_name: str) -> _AsyncSlot:
+        """Await a slot to call a method, releasing it on exit.
+
+        :param method_name: The SOAP method about to be called.
+        """
+        return _AsyncSlot(self._governors[self.method_class(method_name)])
+
+    def stats(self) -> Dict[str, dict]:
+        """Return the calls, in flight calls and seconds waited per method class."""
+        return {name: governor.stats() for name, governor in self._governors.items()}
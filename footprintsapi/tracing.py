@@ -0,0 +1,213 @@
+"""Follow each call to Footprints through its attempts and phases.
+
+The requester opens a `Call` for every request reaching footprints and keeps
+it in a context variable, so the transports and the retry loop can add to it
+without being handed it. Each attempt is split in three phases: serializing
+the request envelope, the HTTP exchange and deserializing the response. The
+call is then counted by the metrics and handed to the `RequestHooks`, if any.
+
+Python 3.6 relies on the `contextvars` backport, whose context is shared by
+the asyncio tasks of a thread: the attempts and phases of concurrent async
+calls may be counted on the wrong call there.
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RequestHooks:
+    """Callbacks around every SOAP call, override the ones needed.
+
+    Every hook of a call receives the same `Call`, its `data` dict can carry
+    state between them, such as a tracing span. Exceptions raised by the
+    hooks are logged and never fail the call.
+    """
+
+    def before_send(self, call: "Call") -> None:
+        """Called before each attempt, `call.attempts` counts it already."""
+
+    def after_receive(self, call: "Call") -> None:
+        """Called once an attempt succeeded and its response was deserialized."""
+
+    def on_retry(self, call: "Call", exception: Exception, delay: float) -> None:
+        """Called when a failed attempt is retried after `delay` seconds."""
+
+    def on_error(self, call: "Call", exception: BaseException) -> None:
+        """Called when the call failed for good, with the exception it raises."""
+
+    def after_build(self, method_name: str, obj: Any, seconds: float) -> None:
+        """Called once a model object was built from the response of a call."""
+
+
+class Call:
+    """A call to footprints, its attempts and the timings of the last one.
+
+    `serialize_seconds`, `network_seconds` and `deserialize_seconds` split the
+    last attempt, `request_bytes` and `response_bytes` add up every attempt.
+    """
+
+    __slots__ = (
+        "method_name",
+        "params",
+        "hooks",
+        "start",
+        "seconds",
+        "attempts",
+        "request_bytes",
+        "response_bytes",
+        "serialize_seconds",
+        "network_seconds",
+        "deserialize_seconds",
+        "data",
+        "_attempt_start",
+        "_network_start",
+        "_network_end",
+    )
+
+    def __init__(
+        self, method_name: str, params: dict, hooks: Optional[RequestHooks] = None
+    ) -> None:
+        """Init function.
+
+        :param method_name: The SOAP method called.
+
+        :param params: The params of the call, in footprints naming convention.
+
+        :param hooks: The hooks to call along the way.
+        """
+        self.method_name = method_name
+        self.params = params
+        self.hooks = hooks
+        self.start = time.perf_counter()
+        self.seconds = None
+        self.attempts = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.serialize_seconds = None
+        self.network_seconds = None
+        self.deserialize_seconds = None
+        self.data = {}
+        self._attempt_start = None
+        self._network_start = None
+        self._network_end = None
+
+    def fire(self, hook: str, *args) -> None:
+        """Call one of the hooks, logging its errors."""
+        if self.hooks is None:
+            return
+        try:
+            getattr(self.hooks, hook)(self, *args)
+        except Exception:
+            logger.exception("Error in the %s hook of %s", hook, self.method_name)
+
+    def __repr__(self) -> str:
+        """Will display the method, attempts and timings."""
+        return (
+            f"Call({self.method_name}, attempts={self.attempts}, "
+            f"seconds={self.seconds}, serialize={self.serialize_seconds}, "
+            f"network={self.network_seconds}, deserialize={self.deserialize_seconds})"
+        )
+
+
+# Holds the `Call` in progress, if any.
+_current_call = ContextVar("footprints_call", default=None)
+
+
+def current_call() -> Optional[Call]:
+    """Return the call in progress in this thread or task, if any."""
+    return _current_call.get()
+
+
+def enter_call(call: Call) -> object:
+    """Make a call the one in progress, return the token to pass to `exit_call`."""
+    return call, _current_call.set(call)
+
+
+def exit_call(token: object) -> Call:
+    """End the call entered with a token, restoring the previous one."""
+    call, reset_token = token
+    _current_call.reset(reset_token)
+    call.seconds = time.perf_counter() - call.start
+    return call
+
+
+def start_attempt() -> None:
+    """Count an attempt of the call in progress and start timing it."""
+    call = _current_call.get()
+    if call is None:
+        return
+    call.attempts += 1
+    call._attempt_start = time.perf_counter()
+    call._network_start = call._network_end = None
+    call.network_seconds = 0.0
+    call.fire("before_send")
+
+
+def end_attempt() -> None:
+    """Split the successful attempt of the call in progress in its phases."""
+    call = _current_call.get()
+    if call is None:
+        return
+    end = time.perf_counter()
+    if call._network_start is None:
+        # Nothing was sent, such as a circuit breaker probe only.
+        call.serialize_seconds = end - call._attempt_start
+        call.deserialize_seconds = 0.0
+    else:
+        call.serialize_seconds = call._network_start - call._attempt_start
+        call.deserialize_seconds = end - call._network_end
+    call.fire("after_receive")
+
+
+def retry_attempt(attempt: int, exception: Exception, delay: float) -> None:
+    """Tell the hooks of the call in progress that a failed attempt is retried."""
+    call = _current_call.get()
+    if call is not None:
+        call.fire("on_retry", exception, delay)
+
+
+def record_exchange(started: float, sent: int, received: int) -> None:
+    """Add an HTTP exchange to the call in progress.
+
+    :param started: The `time.perf_counter()` value when the request was sent.
+
+    :param sent: The size of the request body.
+
+    :param received: The size of the response body.
+    """
+    call = _current_call.get()
+    if call is None:
+        return
+    end = time.perf_counter()
+    call.request_bytes += sent
+    call.response_bytes += received
+    if call._network_start is None:
+        call._network_start = started
+    call._network_end = end
+    call.network_seconds = (call.network_seconds or 0.0) + end - started
+
+
+def build(
+    hooks: Optional[RequestHooks], method_name: str, model_class: type, *args
+) -> Any:
+    """Build a model object from a response, timing it for the hooks.
+
+    :param hooks: The hooks to tell, the object is only built without hooks.
+
+    :param method_name: The SOAP method which returned the response.
+
+    :param model_class: The class of the object, called with `args`.
+    """
+    if hooks is None:
+        return model_class(*args)
+    start = time.perf_counter()
+    obj = model_class(*args)
+    try:
+        hooks.after_build(method_name, obj, time.perf_counter() - start)
+    except Exception:
+        logger.exception("Error in the after_build hook of %s", method_name)
+    return obj
@@ -1,7 +1,12 @@
 """Collection of common functions and other objects used throughout the program."""
 
 import re
-from typing import Any, Iterable, Union
+from functools import lru_cache
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple, Union
+
+from zeep.xsd.valueobjects import CompoundValue
+
+from .keymap import FOOTPRINTS_KEYS
 
 
 def check_attributes(attrs_to_check: list = None, data: dict = None) -> Union[bool]:
@@ -61,25 +66,47 @@ def to_dict(obj: object) -> dict:
     return {k: v for k, v in _unpack(obj_dict)}
 
 
+# Keys come from a small vocabulary fixed by the WSDL, conversions are memoized.
+KEY_CACHE_SIZE = 4096
+
+# Snake case keys the conversion would return unchanged, digits split words.
+SNAKE_CASE_KEY = re.compile(r"(?:[a-z]+|[0-9]+)(?:_(?:[a-z]+|[0-9]+))*")
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
 def to_snake_case(value: str) -> str:
-    """Convert camel case string to snake case."""
+    """Convert camel case string to snake case, snake case keys are kept."""
+    if SNAKE_CASE_KEY.fullmatch(value):
+        return value
     words = re.findall(r"[A-Z]?[a-z]+|[A-Z]{2,}(?=[A-Z][a-z]|\d|\W|$)|\d+", value)
     return "_".join(map(str.lower, words))
 
 
 def keys_to_snake_case(content: dict) -> dict:
     """Convert all keys for given dict to snake case."""
-    return {to_snake_case(key): value for key, value in _unpack(content)}
+    return _format_keys(_unpack(content), SNAKE_CASE)
 
 
+@lru_cache(maxsize=KEY_CACHE_SIZE)
 def to_modified_camel(value: str) -> str:
-    """Convert the given string to an underscore camel case."""
-    content = value.split("_")
+    """Convert the given string to an underscore camel case.
+
+    Strings starting with an underscore are taken to be converted already.
+    """
+    if value.startswith("_"):
+        return value
     return "_" + to_camel_case(value)
 
 
+@lru_cache(maxsize=KEY_CACHE_SIZE)
 def to_camel_case(value: str) -> str:
-    """Convert the given string to camel case."""
+    """Convert the given string to camel case.
+
+    Strings without underscores, or starting with one like the request fields
+    of Footprints, are kept as they are.
+    """
+    if value.startswith("_") or "_" not in value:
+        return value
     content = value.split("_")
     return content[0] + "".join(
         word.title() for word in content[1:] if not word.isspace()
@@ -88,37 +115,141 @@ def to_camel_case(value: str) -> str:
 
 def keys_to_camel_case(data: dict) -> dict:
     """Convert all keys for given dict to camel case."""
-    return {to_camel_case(key): value for key, value in _unpack(data)}
+    return _format_keys(_unpack(data), CAMEL_CASE)
 
 
 def keys_to_modified_camel(data: dict) -> dict:
     """Convert all keys for given dict to a modified camel case."""
-    return {to_modified_camel(key): value for key, value in _unpack(data)}
+    return _format_keys(_unpack(data), MODIFIED_CAMEL)
+
+
+class KeyForms(NamedTuple):
+    """The conversions of a key, in the order of the `*_CASE` indexes."""
+
+    camel: str
+    modified_camel: str
+    snake: str
+
+
+CAMEL_CASE = 0
+MODIFIED_CAMEL = 1
+SNAKE_CASE = 2
+
+# The functions converting the keys missing from the key table, by index.
+_CONVERTERS = (to_camel_case, to_modified_camel, to_snake_case)
+
+
+def key_table(names: Iterable[str]) -> Dict[str, KeyForms]:
+    """Map element names, and their snake and camel cases, to their conversions.
+
+    :param names: Element names as found in the WSDL, such as `_itemDefinitionId`.
+    """
+    table = {}
+    for name in names:
+        snake = to_snake_case.__wrapped__(name)
+        camel = to_camel_case.__wrapped__(snake)
+        for key in (name, snake, camel, "_" + camel):
+            if key not in table:
+                table[key] = KeyForms(
+                    *(convert.__wrapped__(key) for convert in _CONVERTERS)
+                )
+    return table
+
+
+# The conversions of the Footprints schema names, computed once at import.
+KEY_TABLE = key_table(FOOTPRINTS_KEYS)
+
+
+def _format_keys(items: Iterable[Tuple[str, Any]], form: int) -> dict:
+    """Convert the keys of key value pairs, from the key table when possible."""
+    formatted = {}
+    convert = _CONVERTERS[form]
+    for key, value in items:
+        forms = KEY_TABLE.get(key)
+        formatted[convert(key) if forms is None else forms[form]] = value
+    return formatted
+
+
+def warm_key_cache(names: Iterable[str]) -> None:
+    """Memoize the conversions of known keys ahead of the first request.
+
+    :param names: Element names as found in the WSDL, such as `_itemDefinitionId`.
+    """
+    for name in names:
+        snake = to_snake_case(name)
+        to_modified_camel(snake)
+        to_camel_case(snake)
+
+
+def _convert_keys(data: Any, form: int, nested_form: int, depth: int) -> Any:
+    """Convert the keys of nested dicts, lists and zeep objects in a single pass.
 
+    :param form: The index of the case the keys of `data` are converted to.
 
-def parse_keys(data: dict = None, parse_type: str = "modified_camel") -> dict:
+    :param nested_form: The index of the case of the keys below them.
+    """
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, CompoundValue):
+        items = data.__values__.items()
+    elif isinstance(data, (list, tuple)):
+        return [_convert_keys(value, form, nested_form, depth) for value in data]
+    else:
+        return data
+
+    if depth <= 1:
+        return _format_keys(items, form)
+    return _format_keys(
+        (
+            (key, _convert_keys(value, nested_form, nested_form, depth - 1))
+            for key, value in items
+        ),
+        form,
+    )
+
+
+def parse_keys(
+    data: dict = None, parse_type: str = "modified_camel", depth: int = 1
+) -> dict:
     """Convert all keys for given dict/list to snake case recursively.
 
-    :param data: The dict to parse
+    :param data: The dict or zeep object to parse
 
     :param parse_type: The type of parsing to carry out.
     The main types are `modified_camel`, `camel_case` and `snake_case`.
+    Footprints only prefixes the fields of its request types with an underscore,
+    so nested keys are converted to `camel_case` by `modified_camel`.
+
+    :param depth: The number of nested dict levels to convert, lists don't
+    count as a level. Only the top level keys are converted by default.
     """
     if parse_type not in ("modified_camel", "camel_case", "snake_case"):
         raise ValueError(
             "Invalid parse type, use modified_camel, camel_case or snake_case"
         )
 
-    if not isinstance(data, dict):
+    if not isinstance(data, (dict, CompoundValue)):
         raise TypeError("Invalid data type, use dict.")
 
-    formatters = [keys_to_modified_camel, keys_to_camel_case, keys_to_snake_case]
+    if depth == 1 and isinstance(data, dict):
+        return _KEY_FORMATTERS[parse_type](data)
 
-    formatter = None
-    for f in formatters:
-        if parse_type in f.__name__:
-            formatter = f
-    return formatter(data)
+    form, nested_form = _KEY_FORMS[parse_type]
+    return _convert_keys(data, form, nested_form, depth)
+
+
+_KEY_FORMATTERS = {
+    "modified_camel": keys_to_modified_camel,
+    "camel_case": keys_to_camel_case,
+    "snake_case": keys_to_snake_case,
+}
+
+# The cases of the keys at the top level and below it.
+_KEY_FORMS = {
+    "modified_camel": (MODIFIED_CAMEL, CAMEL_CASE),
+    "camel_case": (CAMEL_CASE, CAMEL_CASE),
+    "snake_case": (SNAKE_CASE, SNAKE_CASE),
+}
 
 
 def pretty_attributes(
@@ -151,29 +282,92 @@ def pretty_attributes(
     return pretty_str
 
 
-def get_attributes(fields_to_iterate: list, attributes_to_fetch: list = None) -> list:
-    """Iterate through list of dicts and return list of keys and values."""
-    if attributes_to_fetch:
-        attributes_to_fetch = [a.lower() for a in attributes_to_fetch]
+class FieldExtractor:
+    """Extract a fixed set of fields from `itemFields` lists.
 
-    attrs = []
-    for item in fields_to_iterate:
-        label = item["fieldName"].lower()
-        try:
-            value = item["fieldValue"]["value"]
-        except TypeError:
-            value = None
+    The labels are normalized and snake cased once. The field names seen while
+    extracting are remembered as is, so extracting is then a single dict
+    lookup per field. Build them with `field_extractor` so that extractors are
+    shared between calls with the same labels.
+    """
 
-        if attributes_to_fetch and label in attributes_to_fetch:
+    __slots__ = ("keys", "_names")
+
+    # Bounds the remembered field names, the WSDL defines a fixed set of fields.
+    max_names = 4096
+
+    def __init__(self, attributes_to_fetch: Iterable[str]) -> None:
+        """:param attributes_to_fetch: The external field names to extract."""
+        self.keys = {}
+        for attribute in attributes_to_fetch:
+            label = attribute.lower()
+            self.keys[label] = to_snake_case(label)
+        self._names = {}
+
+    def key(self, field_name: str) -> Optional[str]:
+        """Return the snake cased key of a field name, None when it isn't wanted."""
+        try:
+            return self._names[field_name]
+        except KeyError:
+            key = self.keys.get(field_name.lower())
+            if len(self._names) < self.max_names:
+                self._names[field_name] = key
+            return key
+
+    def __call__(self, fields_to_iterate: list) -> list:
+        """Return the snake cased keys and values of the wanted fields."""
+        names = self._names
+        attrs = []
+        for item in fields_to_iterate:
+            name = item["fieldName"]
+            key = names[name] if name in names else self.key(name)
+            if key is None:
+                continue
+            try:
+                value = item["fieldValue"]["value"]
+            except TypeError:
+                value = None
             if isinstance(value, list) and len(value) == 1:
                 value = value[0]
-            key = to_snake_case(label)
             attrs.append((key, value))
+        return attrs
+
+
+@lru_cache(maxsize=256)
+def field_extractor(attributes_to_fetch: Tuple[str, ...]) -> FieldExtractor:
+    """Return the shared extractor of a set of field names."""
+    return FieldExtractor(attributes_to_fetch)
+
 
-    return attrs
+def get_attributes(fields_to_iterate: list, attributes_to_fetch: list = None) -> list:
+    """Iterate through list of dicts and return list of keys and values."""
+    if not attributes_to_fetch:
+        return []
+    return field_extractor(tuple(attributes_to_fetch))(fields_to_iterate)
 
 
 def set_default_attr(obj: object, attr_name_to_set: str, value, default_value=None):
     """Set a default attr if it doesn't already exist."""
     if not hasattr(obj, attr_name_to_set):
         setattr(obj, attr_name_to_set, value or default_value)
+
+
+def merge_ticket_fields(updates: Iterable[dict]) -> dict:
+    """Merge several `ticket_fields` payloads into one, as if applied in order.
+
+    Fields set more than once keep the value of the last update, at the
+    position they were first set at. Keys are camel cased, whichever case the
+    updates used.
+
+    :param updates: Dicts with an item field list, such as
+    `{"item_fields": [{"field_name": "Status", "field_value": {"value": ["Closed"]}}]}`.
+    """
+    merged = {}
+    fields = {}
+    for update in updates:
+        update = parse_keys(update, "camel_case", depth=4)
+        for field in update.pop("itemFields", None) or []:
+            fields[field.get("fieldName")] = field
+        merged.update(update)
+    merged["itemFields"] = list(fields.values())
+    return merged
@@ -30,8 +30,16 @@ setup(
     author="Jesus Rodriguez",
     author_email="jesus_enrique@rocketmail.com",
     license="MIT License",
-    packages=find_packages(),
-    install_requires=["zeep~=4.0.0", "requests~=2.26.0"],
+    packages=find_packages(exclude=("benchmarks", "benchmarks.*")),
+    install_requires=[
+        "zeep~=4.0.0",
+        "requests~=2.26.0",
+        "requests-file>=1.5.1",
+        "cached-property>=1.3.0",
+        "lxml>=3.1.0",
+        "contextvars>=2.4; python_version < '3.7'",
+    ],
+    extras_require={"async": ["httpx"]},
     zip_safe=False,
     classifiers=[
         "Development Status :: 5 - Production/Stable",
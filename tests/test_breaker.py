@@ -0,0 +1,133 @@
+"""Tests of the circuit breaker."""
+
+import threading
+import unittest
+
+import requests
+
+from footprintsapi.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from footprintsapi.exceptions import CircuitOpen
+
+
+class Clock:
+    """A clock only moving when told to."""
+
+    def __init__(self) -> None:
+        """Start at 1000 seconds."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def fail() -> None:
+    """Fail like an unreachable server."""
+    raise requests.ConnectionError()
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    """The circuit opens on failures and closes once a probe succeeds."""
+
+    def setUp(self) -> None:
+        """Build a breaker opening after 3 consecutive failures."""
+        self.clock = Clock()
+        self.breaker = CircuitBreaker(
+            failure_threshold=3, reset_timeout=30, clock=self.clock
+        )
+
+    def trip(self) -> None:
+        """Open the circuit."""
+        for _ in range(3):
+            with self.assertRaises(requests.ConnectionError):
+                self.breaker.call(fail)
+
+    def test_transitions(self) -> None:
+        """Closed, open, half-open on the probe, then closed again."""
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+        self.trip()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.healthy)
+
+        self.clock.now += 29.9
+        with self.assertRaises(CircuitOpen):
+            self.breaker.call(lambda: "ok")
+
+        # A failed probe opens the circuit for another timeout.
+        self.clock.now += 0.1
+        with self.assertRaises(CircuitOpen):
+            self.breaker.call(fail)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.clock.now += 29.9
+        with self.assertRaises(CircuitOpen):
+            self.breaker.call(lambda: "ok")
+
+        self.clock.now += 0.1
+        self.assertEqual(self.breaker.call(lambda: "probe"), "probe")
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+
+    def test_server_answers_are_not_failures(self) -> None:
+        """Errors other than network and server failures don't open the circuit."""
+        for _ in range(5):
+            with self.assertRaises(ValueError):
+                self.breaker.call(lambda: int("x"))
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_single_probe(self) -> None:
+        """Only one caller probes, the others are rejected meanwhile."""
+        self.trip()
+        self.clock.now += 30
+        probing = threading.Event()
+        release = threading.Event()
+
+        def probe() -> str:
+            probing.set()
+            release.wait(5)
+            return "probe"
+
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(self.breaker.call(lambda: "ok", probe))
+        )
+        thread.start()
+        self.assertTrue(probing.wait(5))
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        for _ in range(3):
+            with self.assertRaises(CircuitOpen):
+                self.breaker.call(lambda: "ok")
+        release.set()
+        thread.join()
+        self.assertEqual(results, ["ok"])
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_stats(self) -> None:
+        """The stats report the state, failures, rejections and trips."""
+        self.breaker.call(lambda: "ok")
+        self.trip()
+        self.clock.now += 12
+        with self.assertRaises(CircuitOpen):
+            self.breaker.call(lambda: "ok")
+        self.assertEqual(
+            self.breaker.stats(),
+            dict(
+                state=OPEN,
+                healthy=False,
+                consecutive_failures=3,
+                failure_rate=0.75,
+                opened_for=12.0,
+                rejected=1,
+                trips=1,
+            ),
+        )
+
+        self.clock.now += 18
+        self.breaker.call(lambda: "ok")
+        stats = self.breaker.stats()
+        self.assertEqual(stats["state"], CLOSED)
+        self.assertIsNone(stats["opened_for"])
+        self.assertEqual(stats["failure_rate"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
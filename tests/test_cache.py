@@ -0,0 +1,168 @@
+"""Tests of the response cache."""
+
+import unittest
+from unittest import mock
+
+from benchmarks.mock_server import MockFootprintsServer
+from footprintsapi import Footprints
+from footprintsapi.cache import MISSING, CachePolicy, LRUCache, ResponseCache
+
+DETAILS = {"_itemDefinitionId": 80, "_itemId": 1}
+
+
+class LRUCacheTest(unittest.TestCase):
+    """Entries expire after their TTL and the least recently used go first."""
+
+    def test_ttl(self) -> None:
+        """Entries are dropped once their TTL has passed."""
+        with mock.patch("footprintsapi.cache.time") as clock:
+            clock.monotonic.return_value = 100.0
+            cache = LRUCache(maxsize=2, ttl=5)
+            cache.set("a", 1)
+            clock.monotonic.return_value = 104.9
+            self.assertEqual(cache.get("a"), 1)
+            clock.monotonic.return_value = 105.0
+            self.assertIsNone(cache.get("a"))
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.stats(), dict(hits=1, misses=1, size=0, maxsize=2))
+
+    def test_lru_eviction(self) -> None:
+        """The least recently read or written entry is evicted when full."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.keys(), ["a", "c"])
+        LRUCache(maxsize=0).set("a", 1)
+        self.assertEqual(len(LRUCache(maxsize=0)), 0)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    """Responses are cached per call and invalidated by writes."""
+
+    def setUp(self) -> None:
+        """Cache the details of two tickets, a search and definitions."""
+        self.cache = ResponseCache({"runSearch": CachePolicy(ttl=60)})
+        self.cache.set("getTicketDetails", DETAILS, {"title": "Printer on fire"})
+        self.cache.set("getItemDetails", DETAILS, {"title": "Printer"})
+        self.cache.set(
+            "getTicketDetails", {"_itemDefinitionId": 80, "_itemId": 2}, {"title": 2}
+        )
+        self.cache.set("runSearch", {"_searchId": 1}, [1, 2])
+        self.cache.set("listContainerDefinitions", {}, ["Service Desk"])
+
+    def cached(self, method_name: str, params: dict) -> bool:
+        """Check if a response is cached for a call."""
+        return self.cache.get(method_name, params) is not MISSING
+
+    def test_ids_are_strings(self) -> None:
+        """Ids sent as strings or ints are the same call."""
+        self.assertEqual(
+            self.cache.get(
+                "getTicketDetails", {"_itemId": "1", "_itemDefinitionId": "80"}
+            ),
+            {"title": "Printer on fire"},
+        )
+        self.assertFalse(self.cached("editTicket", DETAILS))
+
+    def test_copies(self) -> None:
+        """Changing a response doesn't change what is cached."""
+        response = {"title": "Printer on fire", "assignees": ["agent"]}
+        self.cache.set("getTicketDetails", DETAILS, response)
+        response["assignees"].append("other")
+        cached = self.cache.get("getTicketDetails", DETAILS)
+        cached["assignees"].append("other")
+        self.assertEqual(
+            self.cache.get("getTicketDetails", DETAILS)["assignees"], ["agent"]
+        )
+
+    def test_write_invalidation(self) -> None:
+        """Writes drop the details of the items they change, keyed alike."""
+        writes = (
+            ("editTicket", {"_ticketDefinitionId": "80", "_ticketId": 1}),
+            ("editItem", {"_itemDefinitionId": 80, "_itemId": "1"}),
+            (
+                "linkTickets",
+                {
+                    "_firstTicketDefinitionId": 80,
+                    "_firstTicketId": 1,
+                    "_secondTicketDefinitionId": 81,
+                    "_secondTicketId": 5,
+                },
+            ),
+            (
+                "linkItems",
+                {
+                    "_firstItemDefinitionId": 81,
+                    "_firstItemId": 5,
+                    "_secondItemDefinitionId": 80,
+                    "_secondItemId": 1,
+                },
+            ),
+        )
+        for method_name, params in writes:
+            with self.subTest(method_name=method_name):
+                self.setUp()
+                self.cache.invalidate(method_name, params)
+                self.assertFalse(self.cached("getTicketDetails", DETAILS))
+                self.assertFalse(self.cached("getItemDetails", DETAILS))
+                self.assertFalse(self.cached("runSearch", {"_searchId": 1}))
+                self.assertTrue(
+                    self.cached(
+                        "getTicketDetails", {"_itemDefinitionId": 80, "_itemId": 2}
+                    )
+                )
+                self.assertTrue(self.cached("listContainerDefinitions", {}))
+
+    def test_stale_responses_are_not_cached(self) -> None:
+        """A response fetched before a write of its item isn't cached."""
+        generation = self.cache.generation()
+        self.cache.invalidate("editTicket", {"_ticketDefinitionId": 80, "_ticketId": 1})
+        self.cache.set("getTicketDetails", DETAILS, {"title": "Stale"}, generation)
+        self.assertFalse(self.cached("getTicketDetails", DETAILS))
+
+        # Other items, and responses fetched after the write, are cached.
+        other = {"_itemDefinitionId": 80, "_itemId": 3}
+        self.cache.set("getTicketDetails", other, {"title": 3}, generation)
+        self.assertTrue(self.cached("getTicketDetails", other))
+        generation = self.cache.generation()
+        self.cache.set("getTicketDetails", DETAILS, {"title": "Fresh"}, generation)
+        self.assertTrue(self.cached("getTicketDetails", DETAILS))
+
+    def test_forgotten_invalidations_are_stale(self) -> None:
+        """Past the remembered items, responses older than any are rejected."""
+        self.cache.max_generations = 2
+        generation = self.cache.generation()
+        for item_id in range(1, 4):
+            self.cache.invalidate(
+                "editTicket", {"_ticketDefinitionId": 80, "_ticketId": item_id}
+            )
+        self.cache.set("getTicketDetails", DETAILS, {"title": "Stale"}, generation)
+        self.assertFalse(self.cached("getTicketDetails", DETAILS))
+
+
+class RequesterCacheTest(unittest.TestCase):
+    """The requester serves repeated reads from the cache."""
+
+    def test_bypass_cache(self) -> None:
+        """Cached reads skip the network, unless the cache is bypassed."""
+        with MockFootprintsServer() as server:
+            fp = Footprints("client", "secret", server.wsdl_url)
+            first = fp.get_ticket(80, 1)
+            self.assertEqual(fp.get_ticket(80, 1).to_json, first.to_json)
+            self.assertEqual(server.calls, 1)
+
+            fp.get_ticket(80, 1, bypass_cache=True)
+            self.assertEqual(server.calls, 2)
+
+            fp._requester.request(
+                "editTicket",
+                dict(ticket_definition_id=80, ticket_id=1, ticket_fields={}),
+            )
+            fp.get_ticket(80, 1)
+            self.assertEqual(server.calls, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""Tests of the request envelopes rendered from templates."""
+
+import unittest
+from pathlib import Path
+
+from zeep.wsdl.utils import etree_to_string
+from zeep.xsd.types.simple import AnySimpleType
+
+from benchmarks.mock_server import MockFootprintsServer
+from footprintsapi import Footprints
+from footprintsapi.envelope import EnvelopeTemplate, UnsupportedValue
+
+WSDL_URL = (
+    Path(__file__).resolve().parent / "wsdl" / "externalapiservices.wsdl"
+).as_uri()
+
+EDIT_TICKET = dict(
+    ticket_definition_id=80,
+    ticket_id=9001,
+    ticket_fields=dict(
+        item_fields=[
+            dict(field_name=f"Field {i}", field_value=dict(value=[f"Value {i} & co"]))
+            for i in range(5)
+        ]
+    ),
+    submitter="agent",
+)
+
+SAMPLES = {"string": "Café & <b>\r\n\tdone", "long": 42, "int": 7, "boolean": True}
+
+
+def sample(xsd_type, depth: int = 0):
+    """Return params setting every field of a type, repeated ones twice."""
+    if isinstance(xsd_type, AnySimpleType):
+        return SAMPLES.get(xsd_type.name, "x")
+    value = {}
+    for name, element in getattr(xsd_type, "elements", []):
+        if depth < 5:
+            item = sample(element.type, depth + 1)
+            value[name] = [item, item] if element.accepts_multiple else item
+    return value
+
+
+def variants(element) -> dict:
+    """Return params exercising the rendering of an operation's request."""
+    full = sample(element.type)
+    first = next(iter(full), None)
+    return {
+        "full": full,
+        "empty": {},
+        "none": {key: None for key in full},
+        "empty lists": {
+            key: [] if isinstance(value, list) else value for key, value in full.items()
+        },
+        "unknown key": dict(full, _notAField="x"),
+        "numbers as text": {
+            key: str(value) if isinstance(value, int) else value
+            for key, value in full.items()
+        },
+        "empty text": {
+            key: "" if isinstance(value, str) else value for key, value in full.items()
+        },
+        "zeep object": element.type(**full),
+        "list for a single value": dict(full, **{first: ["a", "b"]}) if first else {},
+        "invalid text": dict(full, **{first: "\x00"}) if first else {},
+    }
+
+
+class EnvelopeTemplateTest(unittest.TestCase):
+    """Templates render the same bytes as zeep or leave the call to zeep."""
+
+    def test_every_operation(self) -> None:
+        """Every operation of the bundled WSDL renders like zeep."""
+        client = Footprints("client", "secret", WSDL_URL)._requester._client
+        binding = client.service._binding
+        self.assertTrue(binding._operations)
+        for method_name, operation in sorted(binding._operations.items()):
+            element = operation.input.body.type.elements[0][1]
+            envelope, headers = binding._create(
+                method_name, (sample(element.type),), {}, client=client
+            )
+            template = EnvelopeTemplate(operation, envelope, headers)
+            rendered = 0
+            for name, params in variants(element).items():
+                with self.subTest(method_name=method_name, variant=name):
+                    try:
+                        envelope, _ = binding._create(
+                            method_name, (params,), {}, client=client
+                        )
+                        expected = etree_to_string(envelope)
+                    except Exception:
+                        expected = None
+                    try:
+                        result = template.render(params)
+                    except UnsupportedValue:
+                        continue
+                    self.assertEqual(result, expected)
+                    rendered += 1
+            with self.subTest(method_name=method_name):
+                self.assertGreater(rendered, 0)
+
+
+class TemplatedRequestsTest(unittest.TestCase):
+    """Requesters only template the writes, and only when asked to."""
+
+    def call(self, **kwargs) -> tuple:
+        """Read and edit a ticket, return the bodies sent and the templates."""
+        with MockFootprintsServer(keep_requests=True) as server:
+            fp = Footprints("client", "secret", server.wsdl_url, **kwargs)
+            for _ in range(2):
+                fp.get_item_id(80, 1, bypass_cache=True)
+                fp._requester.request("editTicket", EDIT_TICKET)
+        return server.requests, fp._requester._templates
+
+    def test_off_by_default(self) -> None:
+        """No template is compiled unless `envelope_templates` is set."""
+        _, templates = self.call()
+        self.assertEqual(templates, {})
+
+    def test_writes_only(self) -> None:
+        """Only writes are templated, and they send the bytes zeep sends."""
+        expected, _ = self.call()
+        requests, templates = self.call(envelope_templates=True)
+        self.assertEqual(list(templates), ["editTicket"])
+        self.assertIsNotNone(templates["editTicket"])
+        self.assertEqual(requests, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Tests of the bulk calls of `Footprints`."""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from benchmarks.mock_server import RESPONSES, MockFootprintsServer
+from footprintsapi import Footprints
+from footprintsapi.footprints import coalesce_changes
+from footprintsapi.models import BulkResult, Ticket, TicketChange
+
+IDS = [3, "SR-00002", 1, 2]
+
+
+def fields(**values: str) -> dict:
+    """Return the `ticket_fields` setting fields to values."""
+    return dict(
+        item_fields=[
+            dict(field_name=name, field_value=dict(value=[value]))
+            for name, value in values.items()
+        ]
+    )
+
+
+def values(ticket_fields: dict) -> list:
+    """Return the names and values of camel cased `ticket_fields`, in order."""
+    return [
+        (field["fieldName"], field["fieldValue"]["value"][0])
+        for field in ticket_fields["itemFields"]
+    ]
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """An executor remembering how it was shut down."""
+
+    shutdowns = []
+
+    def shutdown(self, wait: bool = True, **kwargs) -> None:
+        """Record the shutdown, then shut down."""
+        self.shutdowns.append(wait)
+        super().shutdown(wait, **kwargs)
+
+
+class GetTicketsTest(unittest.TestCase):
+    """`get_tickets` returns a result per id, in the order of the ids."""
+
+    def get_tickets(self, responses: dict = RESPONSES, **kwargs) -> list:
+        """Get the tickets of `IDS` from a mock server answering `responses`."""
+        with MockFootprintsServer(responses, latency=0.01) as server:
+            fp = Footprints("client", "secret", server.wsdl_url)
+            return fp.get_tickets(80, IDS, concurrency=4, **kwargs)
+
+    def test_order_and_item_numbers(self) -> None:
+        """Item numbers are resolved in the same batch as the item ids."""
+        results = self.get_tickets()
+        self.assertEqual([result.id for result in results], IDS)
+        self.assertTrue(all(result.ok for result in results))
+        for result in results:
+            self.assertIsInstance(result.result, Ticket)
+        self.assertEqual([result.result.item_id for result in results], [3, 9001, 1, 2])
+
+    def test_failed_id(self) -> None:
+        """An id failing holds its error, the other ids their ticket."""
+        responses = {k: v for k, v in RESPONSES.items() if k != "getItemId"}
+        results = self.get_tickets(responses)
+        self.assertEqual([result.id for result in results], IDS)
+        self.assertEqual([result.ok for result in results], [True, False, True, True])
+        self.assertIsNone(results[1].result)
+        self.assertIsInstance(results[1].error, Exception)
+
+    def test_executor_shutdown(self) -> None:
+        """The executor is shut down without waiting for its threads."""
+        RecordingExecutor.shutdowns = []
+        with mock.patch(
+            "footprintsapi.footprints.ThreadPoolExecutor", RecordingExecutor
+        ):
+            self.get_tickets()
+        self.assertEqual(RecordingExecutor.shutdowns, [False])
+
+
+class CoalesceChangesTest(unittest.TestCase):
+    """The changes of a ticket are merged into one."""
+
+    def test_merge(self) -> None:
+        """Fields merge in order, the last assignees set win."""
+        changes = [
+            (1, fields(Status="Open", Priority="Low"), ["agent"]),
+            TicketChange(2, fields(Status="Closed")),
+            (1, fields(Priority="High")),
+            (1, None, ["other"]),
+            (1, fields(Service="Email", Status="Pending"), None),
+        ]
+        coalesced = coalesce_changes(changes)
+        self.assertEqual([change.ticket_id for change in coalesced], [1, 2])
+        self.assertEqual(
+            values(coalesced[0].ticket_fields),
+            [("Status", "Pending"), ("Priority", "High"), ("Service", "Email")],
+        )
+        self.assertEqual(coalesced[0].assignees, ["other"])
+        self.assertEqual(values(coalesced[1].ticket_fields), [("Status", "Closed")])
+        self.assertIsNone(coalesced[1].assignees)
+
+
+class UpdateTicketsTest(unittest.TestCase):
+    """`update_tickets` sends one `editTicket` call per ticket."""
+
+    def test_results(self) -> None:
+        """Each ticket gets a result, holding the error of its failed call."""
+        changes = [
+            (1, fields(Status="Open")),
+            (2, fields(Status="Closed")),
+            (1, fields(Priority="High"), dict(value=["agent"])),
+            (3, fields(Status="Open")),
+        ]
+        with MockFootprintsServer(keep_requests=True) as server:
+            fp = Footprints("client", "secret", server.wsdl_url)
+            server.requests.clear()
+            server.fail_next(1, status=500)
+            results = fp.update_tickets(80, changes, concurrency=1)
+
+        self.assertEqual([result.id for result in results], [1, 2, 3])
+        self.assertEqual([result.ok for result in results], [False, True, True])
+        self.assertEqual(results[1:], [BulkResult(2, 9001), BulkResult(3, 9001)])
+        self.assertEqual(len(server.requests), 3)
+        first = server.requests[0].decode()
+        self.assertLess(first.index("Status"), first.index("Priority"))
+        self.assertIn("agent", first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Tests of the per method call metrics."""
+
+import re
+import unittest
+
+from benchmarks.mock_server import MockFootprintsServer
+from footprintsapi import Footprints
+from footprintsapi.metrics import LATENCY_BUCKETS, Metrics, Observation
+from footprintsapi.tracing import Call
+
+# A sample line of the text exposition format: name, labels and value.
+SAMPLE = re.compile(r'[a-z_]+\{(?:[a-z]+="(?:[^"\\]|\\.)*",?)+\} [0-9.e+-]+')
+
+
+def call(method_name: str, seconds: float, attempts: int = 1) -> Call:
+    """Return a finished call."""
+    finished = Call(method_name, {})
+    finished.seconds = seconds
+    finished.attempts = attempts
+    finished.request_bytes = 100 * attempts
+    finished.response_bytes = 1000
+    return finished
+
+
+class MetricsTest(unittest.TestCase):
+    """Calls are counted per method."""
+
+    def setUp(self) -> None:
+        """Observe a few reads and a failed write."""
+        self.observations = []
+        self.metrics = Metrics(callbacks=[self.observations.append])
+        for seconds in (0.004, 0.004, 0.3):
+            self.metrics.observe(call("getTicketDetails", seconds))
+        self.metrics.observe(call("getTicketDetails", 90, attempts=3))
+        self.metrics.observe(call('edit"Ticket', 0.01), ValueError("Nope"))
+
+    def test_snapshot(self) -> None:
+        """The snapshot holds the counters and latency percentiles."""
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(list(snapshot), ['edit"Ticket', "getTicketDetails"])
+        details = snapshot["getTicketDetails"]
+        self.assertEqual(details["calls"], 4)
+        self.assertEqual(details["retries"], 2)
+        self.assertEqual(details["request_bytes"], 600)
+        self.assertEqual(details["response_bytes"], 4000)
+        self.assertEqual(details["errors"], {})
+        self.assertEqual(
+            details["latency"],
+            dict(mean=(0.004 * 2 + 0.3 + 90) / 4, p50=0.3, p95=90, p99=90),
+        )
+        self.assertEqual(snapshot['edit"Ticket']["errors"], {"ValueError": 1})
+
+    def test_callbacks(self) -> None:
+        """Callbacks get every observation, their errors are only logged."""
+        self.assertEqual(
+            self.observations[-1],
+            Observation('edit"Ticket', 0.01, 1, 100, 1000, "ValueError"),
+        )
+
+        def fail(observation: Observation) -> None:
+            raise RuntimeError("Exporter down")
+
+        metrics = Metrics(callbacks=[fail, self.observations.append])
+        with self.assertLogs("footprintsapi.metrics", "ERROR"):
+            metrics.observe(call("getTicketDetails", 0.1))
+        self.assertEqual(len(self.observations), 6)
+        self.assertIsNone(Metrics().observe(call("getTicketDetails", 0.1)))
+
+    def test_prometheus(self) -> None:
+        """The text exposition format has typed metrics and cumulative buckets."""
+        text = self.metrics.prometheus("fp")
+        self.assertTrue(text.endswith("\n"))
+        lines = text.splitlines()
+        samples = [line for line in lines if not line.startswith("#")]
+        for line in samples:
+            with self.subTest(line=line):
+                self.assertRegex(line, SAMPLE)
+
+        for metric, kind in (
+            ("fp_calls_total", "counter"),
+            ("fp_retries_total", "counter"),
+            ("fp_request_bytes_total", "counter"),
+            ("fp_response_bytes_total", "counter"),
+            ("fp_errors_total", "counter"),
+            ("fp_call_duration_seconds", "histogram"),
+        ):
+            index = lines.index(f"# TYPE {metric} {kind}")
+            self.assertTrue(lines[index - 1].startswith(f"# HELP {metric} "))
+
+        self.assertIn('fp_calls_total{method="getTicketDetails"} 4', lines)
+        self.assertIn('fp_calls_total{method="edit\\"Ticket"} 1', lines)
+        self.assertIn('fp_retries_total{method="getTicketDetails"} 2', lines)
+        self.assertIn(
+            'fp_errors_total{method="edit\\"Ticket",exception="ValueError"} 1', lines
+        )
+
+        prefix = 'fp_call_duration_seconds_bucket{method="getTicketDetails",le='
+        buckets = [line.partition(prefix)[2] for line in lines if prefix in line]
+        self.assertEqual(len(buckets), len(LATENCY_BUCKETS) + 1)
+        counts = [int(bucket.split()[-1]) for bucket in buckets]
+        self.assertEqual(counts, sorted(counts))
+        self.assertEqual(buckets[2], '"0.005"} 2')
+        self.assertEqual(buckets[-2], '"60.0"} 3')
+        self.assertEqual(buckets[-1], '"+Inf"} 4')
+        self.assertIn(
+            'fp_call_duration_seconds_count{method="getTicketDetails"} 4', lines
+        )
+
+    def test_reset(self) -> None:
+        """Reset forgets every counter."""
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot(), {})
+
+
+class FootprintsMetricsTest(unittest.TestCase):
+    """The calls reaching footprints are measured, cache hits aren't."""
+
+    def test_calls(self) -> None:
+        """Calls are counted with the bytes exchanged."""
+        with MockFootprintsServer() as server:
+            fp = Footprints("client", "secret", server.wsdl_url)
+            fp.get_ticket(80, 1)
+            fp.get_ticket(80, 1)
+        details = fp.metrics()["getTicketDetails"]
+        self.assertEqual(details["calls"], 1)
+        self.assertEqual(
+            details["response_bytes"], len(server.render("getTicketDetails"))
+        )
+        self.assertGreater(details["request_bytes"], 0)
+        self.assertIn(
+            'footprints_calls_total{method="getTicketDetails"} 1',
+            fp.prometheus_metrics().splitlines(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Tests of the models built from API responses."""
+
+import unittest
+
+from footprintsapi.models import Item, Ticket
+
+
+def item_fields(**fields: str) -> dict:
+    """Return `itemFields` shaped like zeep's, keyed by field labels."""
+    return dict(
+        itemFields=[
+            dict(fieldName=name, fieldValue=dict(value=[value]))
+            for name, value in fields.items()
+        ]
+    )
+
+
+COMMON_FIELDS = {
+    "Title": "Printer on fire",
+    "Created By": "agent",
+    "Full Name": "Jesus Rodriguez",
+    "User ID": "jrodriguez",
+    "Email Address": "jesus@example.com",
+    "Not Wanted": "ignored",
+}
+
+
+class DecodeAttributesTest(unittest.TestCase):
+    """Multi-word field labels become snake cased attributes."""
+
+    def test_item_fields(self) -> None:
+        """The common labels of `_itemFields` are snake cased."""
+        for model in (Ticket, Item):
+            obj = model(None, {"_itemFields": item_fields(**COMMON_FIELDS)})
+            with self.subTest(model=model.__name__):
+                self.assertEqual(obj.title, "Printer on fire")
+                self.assertEqual(obj.created_by, "agent")
+                self.assertEqual(obj.full_name, "Jesus Rodriguez")
+                self.assertEqual(obj.user_id, "jrodriguez")
+                self.assertEqual(obj.email_address, "jesus@example.com")
+                self.assertNotIn("not_wanted", obj.attributes)
+                self.assertNotIn("created by", obj.attributes)
+
+    def test_custom_fields(self) -> None:
+        """The custom labels of `_customFields` are snake cased."""
+        custom_fields = item_fields(
+            **{"Escalation Status": "Escalated", "Email CC": "cc@example.com"}
+        )
+        ticket = Ticket(None, {"_itemId": 1, "_customFields": custom_fields})
+        self.assertEqual(ticket.item_id, 1)
+        self.assertEqual(ticket.escalation_status, "Escalated")
+        self.assertEqual(ticket.email_cc, "cc@example.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
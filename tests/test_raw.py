@@ -0,0 +1,135 @@
+"""Tests of the raw decoders against zeep's responses."""
+
+import unittest
+from pathlib import Path
+
+from requests import Response
+from zeep.exceptions import Fault
+from zeep.helpers import serialize_object
+
+from benchmarks.mock_server import ENVELOPE, FAULT, search_results, ticket_details
+from footprintsapi import Footprints
+from footprintsapi.models import Ticket
+from footprintsapi.raw import RAW_METHODS
+
+WSDL_URL = (
+    Path(__file__).resolve().parent / "wsdl" / "externalapiservices.wsdl"
+).as_uri()
+
+XSI = 'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
+
+ITEM_DETAILS = (
+    "<ext:getItemDetailsResponse><return><_itemFields>"
+    "<itemFields><fieldName>Title</fieldName>"
+    "<fieldValue><value>Printer on fire</value></fieldValue></itemFields>"
+    "<itemFields><fieldName>Status</fieldName><fieldValue/></itemFields>"
+    "<itemFields><fieldName>Email Address</fieldName>"
+    "<fieldValue><value>a@example.com</value><value>b@example.com</value>"
+    "</fieldValue></itemFields>"
+    "<itemFields><fieldName>Priority</fieldName></itemFields>"
+    "</_itemFields><_assignees><value>Agent</value></_assignees>"
+    "</return></ext:getItemDetailsResponse>"
+)
+
+CASES = {
+    "getTicketDetails": [
+        ticket_details(),
+        ticket_details(40, "x" * 200),
+        ticket_details().replace("<_title>Testing</_title>", "<_title/>"),
+        ticket_details().replace(
+            "<_priority>Low</_priority>", f'<_priority {XSI} xsi:nil="true"/>'
+        ),
+        ticket_details().replace("<_status>Pending</_status>", ""),
+        ticket_details().replace(
+            "<_title>Testing</_title>", "<ext:_title>Testing</ext:_title>"
+        ),
+        ticket_details()
+        .replace(
+            "<_customFields>",
+            "<_assignees><value>a</value><value/></_assignees>"
+            "<!-- edited --><_customFields>",
+        )
+        .replace("</_customFields>", "</_customFields><_editors/>"),
+        "<ext:getTicketDetailsResponse><return/></ext:getTicketDetailsResponse>",
+        "<ext:getTicketDetailsResponse/>",
+    ],
+    "getItemDetails": [
+        ITEM_DETAILS,
+        ITEM_DETAILS.replace("<_assignees><value>Agent</value></_assignees>", ""),
+        "<ext:getItemDetailsResponse><return/></ext:getItemDetailsResponse>",
+    ],
+    "runSearch": [
+        search_results(3),
+        search_results(0),
+        search_results(2, fields=0),
+        "<ext:runSearchResponse/>",
+    ],
+}
+
+
+def _response(body: str, status: int = 200) -> Response:
+    response = Response()
+    response.status_code = status
+    response.headers["Content-Type"] = "text/xml; charset=utf-8"
+    response._content = ENVELOPE.format(body=body).encode("utf-8")
+    return response
+
+
+class RawDecoderTest(unittest.TestCase):
+    """The raw decoders return what zeep's objects serialize to."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Load the bundled WSDL once."""
+        cls.fp = Footprints("client", "secret", WSDL_URL)
+
+    def decode_zeep(self, method_name: str, response: Response):
+        """Decode a response the way zeep does for `Requester.request`."""
+        client = self.fp._requester._client
+        binding = client.service._binding
+        return binding.process_reply(client, binding.get(method_name), response)
+
+    def decode_raw(self, method_name: str, response: Response):
+        """Decode a response with the raw decoder of its method."""
+        return self.fp._requester._raw_decoder(method_name)(response.content)
+
+    def test_every_method_has_cases(self) -> None:
+        """Each of the raw methods is checked below."""
+        self.assertEqual(set(CASES), set(RAW_METHODS))
+
+    def test_responses(self) -> None:
+        """Missing, empty, nil, repeated and qualified elements decode alike."""
+        for method_name, bodies in CASES.items():
+            for body in bodies:
+                with self.subTest(method_name=method_name, body=body[:80]):
+                    response = _response(body)
+                    expected = serialize_object(
+                        self.decode_zeep(method_name, response), dict
+                    )
+                    self.assertEqual(self.decode_raw(method_name, response), expected)
+
+    def test_faults(self) -> None:
+        """Both decoders raise the fault of an error response."""
+        response = _response(FAULT.format(message="Nope"), status=500)
+        for method_name in RAW_METHODS:
+            for decode in (self.decode_zeep, self.decode_raw):
+                with self.subTest(method_name=method_name, decode=decode.__name__):
+                    with self.assertRaises(Fault) as context:
+                        decode(method_name, response)
+                    self.assertEqual(
+                        (context.exception.message, context.exception.code),
+                        ("Nope", "soapenv:Server"),
+                    )
+
+    def test_ticket_attributes(self) -> None:
+        """Tickets built from either response have the same attributes."""
+        response = _response(ticket_details(40))
+        zeep_ticket = Ticket(None, self.decode_zeep("getTicketDetails", response))
+        raw_ticket = Ticket(None, self.decode_raw("getTicketDetails", response))
+        self.assertEqual(
+            serialize_object(zeep_ticket.attributes, dict), raw_ticket.attributes
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Tests of the process-wide registry of parsed WSDL documents."""
+
+import time
+import tracemalloc
+import unittest
+from pathlib import Path
+
+from requests.auth import HTTPBasicAuth
+from zeep import Settings
+
+from footprintsapi import Footprints
+from footprintsapi.registry import DocumentRegistry, registry
+
+WSDL_URL = (
+    Path(__file__).resolve().parent / "wsdl" / "externalapiservices.wsdl"
+).as_uri()
+
+INSTANCES = 100
+
+
+def build(instances: int, shared: bool) -> list:
+    """Build `instances` clients, each with its own credentials."""
+    return [
+        Footprints(f"agent{i}", f"secret{i}", WSDL_URL, shared_wsdl=shared)
+        for i in range(instances)
+    ]
+
+
+class SharedWsdlTest(unittest.TestCase):
+    """Many clients of the same endpoint share one parsed document."""
+
+    def setUp(self) -> None:
+        """Start every test with an empty registry."""
+        registry.clear()
+        self.addCleanup(registry.clear)
+
+    def test_document_is_shared(self) -> None:
+        """Every shared client uses the document parsed by the first one."""
+        clients = build(INSTANCES, shared=True)
+        documents = {id(fp._requester._client.wsdl) for fp in clients}
+        self.assertEqual(len(documents), 1)
+        self.assertEqual(len(registry), 1)
+
+        private = build(2, shared=False)
+        self.assertIsNot(
+            private[0]._requester._client.wsdl, clients[0]._requester._client.wsdl
+        )
+        self.assertIsNot(
+            private[0]._requester._client.wsdl, private[1]._requester._client.wsdl
+        )
+
+    def test_settings_are_keyed(self) -> None:
+        """Documents parsed with different settings aren't shared."""
+        key = DocumentRegistry.key
+        self.assertEqual(key(WSDL_URL), key(WSDL_URL, Settings()))
+        self.assertNotEqual(key(WSDL_URL), key(WSDL_URL, Settings(strict=False)))
+        self.assertNotEqual(
+            key(WSDL_URL, Settings(xml_huge_tree=True)),
+            key(WSDL_URL, Settings(xsd_ignore_sequence_order=True)),
+        )
+
+    def test_credentials_stay_per_instance(self) -> None:
+        """Sharing the document doesn't share the transports and credentials."""
+        clients = build(INSTANCES, shared=True)
+        transports = {id(fp._requester._client.transport) for fp in clients}
+        self.assertEqual(len(transports), INSTANCES)
+        for i, fp in enumerate(clients):
+            self.assertEqual(
+                fp._requester._session.auth, HTTPBasicAuth(f"agent{i}", f"secret{i}")
+            )
+            self.assertIs(
+                fp._requester._client.transport.session, fp._requester._session
+            )
+
+    def test_time_and_memory(self) -> None:
+        """Shared clients cost a fraction of parsing the WSDL for each of them."""
+        build(1, shared=False)
+        parse = min(self._timed(1, shared=False) for _ in range(3))
+        build(1, shared=True)
+        shared = self._timed(INSTANCES, shared=True)
+        # Parsing the WSDL a hundred times would take a hundred times `parse`.
+        self.assertLess(shared, 10 * parse)
+
+        tracemalloc.start()
+        try:
+            clients = build(1, shared=False)
+            parsed, _ = tracemalloc.get_traced_memory()
+            del clients
+            start, _ = tracemalloc.get_traced_memory()
+            clients = build(INSTANCES, shared=True)
+            grown = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(len(clients), INSTANCES)
+        self.assertLess(grown, 10 * parsed)
+
+    def _timed(self, instances: int, shared: bool) -> float:
+        start = time.perf_counter()
+        build(instances, shared)
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Tests of the recording and replay of exchanges."""
+
+import os
+import tempfile
+import unittest
+import zlib
+
+from requests import Response
+
+from benchmarks.mock_server import MockFootprintsServer
+from footprintsapi import Footprints
+from footprintsapi.replay import Recorder, Replayer, Tape
+
+SECRET = "correct horse battery staple"
+
+USERNAME_TOKEN = (
+    '<wsse:UsernameToken xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/'
+    'oasis-200401-wss-wssecurity-secext-1.0.xsd">'
+    "<wsse:Username>{user}</wsse:Username>"
+    '<wsse:Password Type="PasswordText">{password}</wsse:Password>'
+    "<wsse:Nonce/></wsse:UsernameToken>"
+)
+
+
+def body(user: str, password: str, note: str = "") -> bytes:
+    """Return an envelope with a UsernameToken header and some text."""
+    return (
+        "<soapenv:Envelope><soapenv:Header>"
+        + USERNAME_TOKEN.format(user=user, password=password)
+        + f"</soapenv:Header><soapenv:Body><ext:getItemId><_userName>{user}</_userName>"
+        f"<_note>{note}</_note></ext:getItemId></soapenv:Body></soapenv:Envelope>"
+    ).encode()
+
+
+class ReplayTest(unittest.TestCase):
+    """Archives replay their recording without holding credentials."""
+
+    def setUp(self) -> None:
+        """Archive to a temporary file."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "recorded.db")
+
+    def test_tape_is_abstract(self) -> None:
+        """Tapes must implement the adapter and the transport."""
+        with self.assertRaises(TypeError):
+            Tape(self.path)
+
+    def test_credentials_are_scrubbed(self) -> None:
+        """Credential elements and headers are masked both ways."""
+        response = Response()
+        response.status_code = 200
+        response.headers["Authorization"] = f"Basic {SECRET}"
+        response.headers["Content-Type"] = "text/xml"
+        response._content = body("agent", SECRET, "a")
+
+        recorder = Recorder(self.path)
+        request = body("agent", SECRET, "a")
+        recorder.record("POST", "http://footprints/api", request, response, 0.1)
+        rows = recorder.archive._conn.execute(
+            "SELECT request, headers, content FROM exchanges"
+        ).fetchall()
+        recorder.close()
+        for request, headers, content in rows:
+            for data in (zlib.decompress(request), headers, zlib.decompress(content)):
+                self.assertNotIn(SECRET, str(data))
+
+        # Short passwords only mask their element, not the same text elsewhere.
+        replayer = Replayer(self.path)
+        self.addCleanup(replayer.close)
+        exchange, _ = replayer.lookup(
+            "POST", "https://elsewhere/api", body("agent", "a", "a")
+        )
+        self.assertNotIn(b"Authorization", str(exchange.headers).encode())
+        self.assertIn(b'<wsse:Password Type="PasswordText">********<', exchange.content)
+        self.assertIn(b"<wsse:Username>********<", exchange.content)
+        self.assertIn(b"<wsse:Nonce/>", exchange.content)
+        self.assertIn(b"<_userName>agent</_userName><_note>a</_note>", exchange.content)
+
+    def test_replay(self) -> None:
+        """A replay returns the models of the recording, without any network."""
+        settings = dict(cache_policies={"getTicketDetails": None})
+        with MockFootprintsServer() as server:
+            recorder = Recorder(self.path)
+            fp = Footprints(
+                "client", SECRET, server.wsdl_url, tape=recorder, **settings
+            )
+            expected = [fp.get_ticket(80, 1).to_json, list(fp.iter_search(1))]
+            wsdl_url = server.wsdl_url
+            exchanges = len(recorder.archive)
+            recorder.close()
+
+        replayer = Replayer(self.path)
+        self.addCleanup(replayer.close)
+        fp = Footprints("client", SECRET, wsdl_url, tape=replayer, **settings)
+        self.assertEqual(
+            [fp.get_ticket(80, 1).to_json, list(fp.iter_search(1))], expected
+        )
+        self.assertEqual(replayer.served, exchanges)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Tests of the requester."""
+
+import unittest
+from pathlib import Path
+
+from benchmarks.mock_server import MockFootprintsServer
+from footprintsapi import Footprints
+from footprintsapi.requester import PARAMS_DEPTH, Requester
+
+WSDL_URL = (
+    Path(__file__).resolve().parent / "wsdl" / "externalapiservices.wsdl"
+).as_uri()
+
+EDIT = dict(
+    ticket_definition_id=80,
+    ticket_id=1,
+    ticket_fields=dict(
+        title="Printer on fire",
+        item_fields=[dict(field_name="Service", field_value=dict(value=["Email"]))],
+    ),
+    bypass_cache=True,
+)
+
+
+class ParamsDepthTest(unittest.TestCase):
+    """The params are converted down to the configured depth."""
+
+    def prepare(self, **kwargs) -> dict:
+        """Return the params of an `editTicket` call as sent to footprints."""
+        requester = Requester("client", "secret", WSDL_URL, lazy=True, **kwargs)
+        return requester._prepare("editTicket", EDIT, {})
+
+    def test_default(self) -> None:
+        """Field lists nested in the params are converted by default."""
+        requester = Requester("client", "secret", WSDL_URL, lazy=True)
+        self.assertEqual(requester.params_depth, PARAMS_DEPTH)
+        self.assertEqual(
+            self.prepare(),
+            {
+                "_ticketDefinitionId": 80,
+                "_ticketId": 1,
+                "_ticketFields": {
+                    "title": "Printer on fire",
+                    "itemFields": [
+                        {"fieldName": "Service", "fieldValue": {"value": ["Email"]}}
+                    ],
+                },
+            },
+        )
+
+    def test_shallow(self) -> None:
+        """Only the levels up to the depth are converted."""
+        params = self.prepare(params_depth=1)
+        self.assertEqual(params["_ticketFields"], EDIT["ticket_fields"])
+
+    def test_depth_zero(self) -> None:
+        """The params are sent as given, without the request options."""
+        params = self.prepare(params_depth=0)
+        self.assertEqual(params, {k: v for k, v in EDIT.items() if k != "bypass_cache"})
+
+        with MockFootprintsServer() as server:
+            fp = Footprints("client", "secret", server.wsdl_url, params_depth=0)
+            response = fp._requester.request(
+                "getTicketDetails", {"_itemDefinitionId": 80, "_itemId": 1}
+            )
+        self.assertEqual(response._itemId, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""Tests of the retries of transient failures."""
+
+import random
+import time
+import unittest
+from email.utils import formatdate
+
+import requests
+
+from benchmarks.mock_server import MockFootprintsServer
+from footprintsapi import Footprints
+from footprintsapi.retry import RetryBudget, RetryPolicy
+
+
+def http_error(status: int, retry_after: str = None) -> requests.HTTPError:
+    """Return the error raised for a response with a status."""
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return requests.HTTPError(response=response)
+
+
+class RetryPolicyTest(unittest.TestCase):
+    """Delays grow exponentially up to a cap, Retry-After takes precedence."""
+
+    def test_backoff_cap(self) -> None:
+        """The backoff doubles on each attempt until it reaches the cap."""
+        policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+        delays = [policy.delay(attempt, http_error(503)) for attempt in range(1, 6)]
+        self.assertEqual(delays, [1, 2, 4, 5, 5])
+
+    def test_jitter_bounds(self) -> None:
+        """Jittered delays fall between 0 and the backoff."""
+        random.seed(0)
+        policy = RetryPolicy(backoff=1, max_backoff=5)
+        for attempt, backoff in ((1, 1), (2, 2), (5, 5)):
+            delays = [policy.delay(attempt, http_error(503)) for _ in range(200)]
+            with self.subTest(attempt=attempt):
+                self.assertTrue(all(0 <= delay <= backoff for delay in delays))
+                self.assertGreater(max(delays), backoff / 2)
+
+    def test_retry_after(self) -> None:
+        """Retry-After seconds and dates are honoured, up to the cap."""
+        policy = RetryPolicy(backoff=1, max_backoff=10, jitter=False)
+        self.assertEqual(policy.delay(1, http_error(429, "3")), 3)
+        self.assertEqual(policy.delay(1, http_error(429, "-3")), 0)
+        self.assertIsNone(policy.delay(1, http_error(429, "60")))
+        self.assertEqual(policy.delay(2, http_error(429, "soon")), 2)
+
+        delay = policy.delay(1, http_error(503, formatdate(usegmt=True)))
+        self.assertEqual(delay, 0)
+        later = formatdate(time.time() + 5, usegmt=True)
+        self.assertTrue(3 <= policy.delay(1, http_error(503, later)) <= 5)
+
+    def test_idempotent_methods(self) -> None:
+        """Only idempotent reads failing transiently are retried by default."""
+        policy = RetryPolicy()
+        error = requests.ConnectionError()
+        for method_name in ("getTicketDetails", "listSearches", "runSearch"):
+            self.assertTrue(policy.is_retryable(method_name, error))
+        for method_name in ("editTicket", "createTicket", "linkTickets"):
+            self.assertFalse(policy.is_retryable(method_name, error))
+        self.assertFalse(policy.is_retryable("getTicketDetails", http_error(500)))
+        self.assertFalse(policy.is_retryable("getTicketDetails", ValueError()))
+        self.assertTrue(
+            RetryPolicy(methods=["editTicket"]).is_retryable("editTicket", error)
+        )
+
+    def test_call(self) -> None:
+        """Failed attempts are retried until one succeeds."""
+        policy = RetryPolicy(backoff=0)
+        outcomes = [http_error(503), requests.Timeout(), "ticket"]
+
+        def func() -> str:
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        retries = []
+        result = policy.call(
+            "getTicketDetails", func, lambda *args: retries.append(args[0])
+        )
+        self.assertEqual(result, "ticket")
+        self.assertEqual(retries, [1, 2])
+        self.assertEqual(policy.stats()["retries"], {"getTicketDetails": 2})
+        self.assertEqual(policy.stats()["failures"], {"getTicketDetails": 2})
+
+        outcomes.append(http_error(503))
+        with self.assertRaises(requests.HTTPError):
+            policy.call("editTicket", func)
+        self.assertEqual(policy.stats()["failures"]["editTicket"], 1)
+
+
+class RetryBudgetTest(unittest.TestCase):
+    """Retries stop once the budget is spent."""
+
+    def test_exhaustion(self) -> None:
+        """The reserve is spent by retries and earned back by calls."""
+        budget = RetryBudget(ratio=0.5, reserve=2)
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+        for _ in range(10):
+            budget.deposit()
+        self.assertEqual(budget.tokens, 2)
+
+    def test_policy_gives_up(self) -> None:
+        """A policy raises instead of retrying without budget."""
+        policy = RetryPolicy(max_attempts=10, backoff=0, budget=RetryBudget(0, 2))
+        attempts = []
+
+        def fail() -> None:
+            attempts.append(1)
+            raise http_error(503)
+
+        with self.assertRaises(requests.HTTPError):
+            policy.call("getTicketDetails", fail)
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(policy.stats()["budget"], 0)
+
+
+class TransportTest(unittest.TestCase):
+    """Gateway errors reach the policy with their status."""
+
+    def setUp(self) -> None:
+        """Serve a mock footprints instance."""
+        self.server = MockFootprintsServer().start()
+        self.addCleanup(self.server.stop)
+        self.fp = Footprints(
+            "client",
+            "secret",
+            self.server.wsdl_url,
+            retry_policy=RetryPolicy(backoff=0),
+            cache_policies={"getTicketDetails": None},
+        )
+
+    def test_transient_statuses(self) -> None:
+        """Reads failing with 503 and 429 are retried."""
+        self.server.fail_next(1, status=503)
+        self.server.fail_next(1, status=429, retry_after="0")
+        calls = self.server.calls
+        self.assertEqual(self.fp.get_ticket(80, 1).item_id, 1)
+        self.assertEqual(self.server.calls - calls, 3)
+        self.assertEqual(
+            self.fp.retry_policy.stats()["retries"], {"getTicketDetails": 2}
+        )
+
+    def test_writes_and_other_statuses(self) -> None:
+        """Writes and statuses other than the transient ones aren't retried."""
+        edit = dict(ticket_definition_id=80, ticket_id=1, ticket_fields={})
+        cases = (
+            ("editTicket", 503, edit),
+            ("getTicketDetails", 500, dict(item_definition_id=80, item_id=1)),
+        )
+        for method_name, status, params in cases:
+            self.server.fail_next(1, status=status)
+            calls = self.server.calls
+            with self.subTest(method_name=method_name):
+                with self.assertRaises(Exception):
+                    self.fp._requester.request(method_name, params)
+                self.assertEqual(self.server.calls - calls, 1)
+        self.assertEqual(self.fp.retry_policy.stats()["retries"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
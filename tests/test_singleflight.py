@@ -0,0 +1,91 @@
+"""Tests of the coalescing of identical concurrent calls."""
+
+import asyncio
+import threading
+import unittest
+
+from footprintsapi.singleflight import SingleFlight
+
+CALLERS = 10
+
+
+class SingleFlightTest(unittest.TestCase):
+    """Callers of a call in flight share its outcome."""
+
+    def test_threads(self) -> None:
+        """Threads making the same call wait for the first one."""
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch() -> str:
+            calls.append(1)
+            release.wait(5)
+            return "ticket"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    single_flight.call("getTicketDetails", "key", fetch)
+                )
+            )
+            for _ in range(CALLERS)
+        ]
+        for thread in threads:
+            thread.start()
+        while sum(single_flight.stats()["coalesced"].values()) < CALLERS - 1:
+            release.wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["ticket"] * CALLERS)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            single_flight.stats(),
+            dict(
+                calls={"getTicketDetails": 1},
+                coalesced={"getTicketDetails": CALLERS - 1},
+            ),
+        )
+
+    def test_tasks(self) -> None:
+        """Tasks share the result, or the exception, of the call in flight."""
+        single_flight = SingleFlight()
+        calls = []
+
+        async def fetch() -> str:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "ticket"
+
+        async def fail() -> str:
+            await asyncio.sleep(0.01)
+            raise ValueError("Nope")
+
+        async def burst(func) -> list:
+            return await asyncio.gather(
+                *(
+                    single_flight.acall("getTicketDetails", "key", func)
+                    for _ in range(CALLERS)
+                ),
+                return_exceptions=True,
+            )
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.assertEqual(loop.run_until_complete(burst(fetch)), ["ticket"] * CALLERS)
+        self.assertEqual(len(calls), 1)
+        errors = loop.run_until_complete(burst(fail))
+        self.assertEqual([str(error) for error in errors], ["Nope"] * CALLERS)
+
+    def test_methods(self) -> None:
+        """Only idempotent reads are coalesced by default."""
+        single_flight = SingleFlight()
+        self.assertTrue(single_flight.applies("getTicketDetails"))
+        self.assertFalse(single_flight.applies("editTicket"))
+        self.assertFalse(SingleFlight(methods=()).applies("getTicketDetails"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Tests of the write-behind spool."""
+
+import os
+import tempfile
+import unittest
+
+from footprintsapi.spool import WriteBehind
+
+
+class WriteBehindOrderTest(unittest.TestCase):
+    """Writes of an item never overtake a write of it set aside."""
+
+    def setUp(self) -> None:
+        """Spool writes to a temporary file, sending them to `self.send`."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.sent = []
+        self.rejected = set()
+        self.write_behind = WriteBehind(
+            os.path.join(directory.name, "spool.db"), poll_interval=0.01
+        )
+        self.addCleanup(self.write_behind.spool.close)
+        self.addCleanup(self.write_behind.join, 5)
+
+    def send(self, method_name: str, params: dict) -> None:
+        """Record a write, failing those marked rejected."""
+        if params["title"] in self.rejected:
+            raise ValueError(f"Rejected {params['title']}")
+        self.sent.append(params["title"])
+
+    def submit(self, ticket_id: int, title: str) -> int:
+        """Spool a `createTicket` call touching a ticket."""
+        return self.write_behind.submit(
+            "createTicket", dict(ticket_id=ticket_id, title=title)
+        )
+
+    def test_later_writes_wait_for_the_failed_one(self) -> None:
+        """A failure sets aside the later writes of its item, until requeued."""
+        self.rejected.add("a1")
+        for title in ("a1", "a2", "a3"):
+            self.submit(1, title)
+        self.submit(2, "b1")
+        self.write_behind.start(self.send)
+        self.assertTrue(self.write_behind.flush(5))
+
+        # Spooled after the failure, a4 must not overtake a1 either.
+        self.submit(1, "a4")
+        self.assertTrue(self.write_behind.flush(5))
+        self.assertEqual(self.sent, ["b1"])
+        failed = self.write_behind.spool.failed()
+        self.assertEqual(
+            [write.params["title"] for write in failed], ["a1", "a2", "a3", "a4"]
+        )
+        self.assertIn("Rejected a1", failed[0].error)
+
+        self.rejected.clear()
+        self.write_behind.spool.requeue()
+        self.assertTrue(self.write_behind.flush(5))
+        self.assertEqual(self.sent, ["b1", "a1", "a2", "a3", "a4"])
+        self.assertEqual(self.write_behind.stats()["failed"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests of the incremental parsing of search responses."""
+
+import tracemalloc
+import unittest
+from functools import partial
+from io import BytesIO
+from typing import Iterator
+
+from zeep.exceptions import Fault
+
+from benchmarks.mock_server import (
+    CUSTOM_FIELD,
+    ENVELOPE,
+    FAULT,
+    RESPONSES,
+    SEARCH_ROW,
+    MockFootprintsServer,
+    search_results,
+)
+from footprintsapi import Footprints
+from footprintsapi.models import SearchRow
+from footprintsapi.stream import SearchRowParser
+
+FIELDS = 10
+
+
+def response_chunks(rows: int, fields: int = FIELDS) -> Iterator[bytes]:
+    """Yield a `runSearch` response a row at a time, never holding all of it."""
+    head, tail = ENVELOPE.split("{body}")
+    yield (head + "<ext:runSearchResponse><return>").encode()
+    row_fields = "".join(
+        CUSTOM_FIELD.format(name=f"Field {i}", value=f"Value {i}")
+        for i in range(fields)
+    )
+    for item_id in range(1, rows + 1):
+        yield SEARCH_ROW.format(item_id=item_id, fields=row_fields).encode()
+    yield ("</return></ext:runSearchResponse>" + tail).encode()
+
+
+def expected_row(item_id: int, fields: int = FIELDS) -> SearchRow:
+    """Return the row decoded from the synthetic row `item_id`."""
+    return SearchRow(
+        container_definition_id=1,
+        container_definition_name="Service Desk",
+        item_definition_id=80,
+        item_definition_name="Incident",
+        item_id=item_id,
+        fields={f"Field {i}": f"Value {i}" for i in range(fields)},
+        assignees=["Jesus Rodriguez"],
+    )
+
+
+def parse(chunks: Iterator[bytes]) -> Iterator[SearchRow]:
+    """Feed the chunks to a parser and yield its rows."""
+    parser = SearchRowParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+class SearchRowParserTest(unittest.TestCase):
+    """Rows are decoded as they end and dropped once yielded."""
+
+    def test_rows(self) -> None:
+        """Every row is decoded in order, whatever the chunk boundaries."""
+        body = b"".join(response_chunks(50))
+        chunks = iter(partial(BytesIO(body).read, 100), b"")
+        self.assertEqual(list(parse(chunks)), [expected_row(i) for i in range(1, 51)])
+
+    def test_memory_stays_flat(self) -> None:
+        """The peak memory doesn't grow with the number of rows."""
+        peaks = {}
+        for rows in (500, 10000):
+            tracemalloc.start()
+            try:
+                count = 0
+                for count, row in enumerate(parse(response_chunks(rows)), 1):
+                    self.assertEqual(row, expected_row(count))
+                peaks[rows] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertEqual(count, rows)
+            self.assertEqual(row, expected_row(rows))
+        # Twenty times the rows, well under twice the memory.
+        self.assertLess(peaks[10000], 2 * peaks[500])
+        self.assertLess(peaks[10000], 2**20)
+
+    def test_fault(self) -> None:
+        """A SOAP fault is raised as zeep's `Fault`."""
+        body = ENVELOPE.format(body=FAULT.format(message="Invalid search id"))
+        with self.assertRaises(Fault) as context:
+            list(parse([body.encode()]))
+        self.assertEqual(context.exception.message, "Invalid search id")
+
+
+class IterSearchTest(unittest.TestCase):
+    """`iter_search` yields the rows of a large search from the network."""
+
+    def test_iter_search(self) -> None:
+        """Every row of the response is yielded, decoded."""
+        rows = 5000
+        responses = dict(RESPONSES, runSearch=search_results(rows, FIELDS))
+        with MockFootprintsServer(responses) as server:
+            fp = Footprints("client", "secret", server.wsdl_url)
+            count = 0
+            for count, row in enumerate(fp.iter_search(1), 1):
+                self.assertEqual(row, expected_row(count))
+        self.assertEqual(count, rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Tests of the client-side rate and concurrency limits."""
+
+import threading
+import unittest
+
+from footprintsapi.throttle import Limit, Throttle, TokenBucket
+
+
+class Clock:
+    """A clock only moving when told to."""
+
+    def __init__(self) -> None:
+        """Start at 1000 seconds."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class TokenBucketTest(unittest.TestCase):
+    """Tokens are spent by calls and refilled at the rate."""
+
+    def test_refill(self) -> None:
+        """A burst is free, later calls wait for the tokens refilled."""
+        clock = Clock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock)
+        self.assertEqual([bucket.reserve(), bucket.reserve()], [0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)
+
+        # The reserved tokens are refilled first, then up to the burst.
+        clock.now += 0.2
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        clock.now += 10
+        self.assertEqual([bucket.reserve(), bucket.reserve()], [0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+
+    def test_default_burst(self) -> None:
+        """The bucket holds a second worth of tokens, at least one."""
+        self.assertEqual(TokenBucket(rate=5).burst, 5)
+        self.assertEqual(TokenBucket(rate=0.5).burst, 1)
+
+
+class ThrottleTest(unittest.TestCase):
+    """Reads and writes are limited separately."""
+
+    def test_method_class(self) -> None:
+        """Idempotent methods are reads, every other method a write."""
+        self.assertEqual(Throttle.method_class("getTicketDetails"), "read")
+        self.assertEqual(Throttle.method_class("runSearch"), "read")
+        self.assertEqual(Throttle.method_class("editTicket"), "write")
+
+    def test_max_in_flight(self) -> None:
+        """Calls past the in-flight limit wait for a slot."""
+        throttle = Throttle(read=Limit(max_in_flight=2))
+        entered = threading.Semaphore(0)
+        release = threading.Event()
+
+        def call(method_name: str) -> None:
+            with throttle.slot(method_name):
+                entered.release()
+                release.wait(5)
+
+        threads = [
+            threading.Thread(target=call, args=("getTicketDetails",)) for _ in range(3)
+        ]
+        threads.append(threading.Thread(target=call, args=("editTicket",)))
+        for thread in threads:
+            thread.start()
+        for _ in range(3):
+            self.assertTrue(entered.acquire(timeout=5))
+        self.assertFalse(entered.acquire(timeout=0.05))
+        stats = throttle.stats()
+        self.assertEqual(stats["read"]["in_flight"], 2)
+        self.assertEqual(stats["write"]["in_flight"], 1)
+
+        release.set()
+        for thread in threads:
+            thread.join()
+        stats = throttle.stats()
+        self.assertEqual(stats["read"]["calls"], 3)
+        self.assertEqual(stats["read"]["in_flight"], 0)
+        self.assertEqual(stats["read"]["max_in_flight"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
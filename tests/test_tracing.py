@@ -0,0 +1,158 @@
+"""Tests of the calls followed through their attempts and phases."""
+
+import contextvars
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.mock_server import MockFootprintsServer
+from footprintsapi import Footprints
+from footprintsapi.exceptions import FootprintsException
+from footprintsapi.retry import RetryPolicy
+from footprintsapi.tracing import (
+    Call,
+    RequestHooks,
+    current_call,
+    enter_call,
+    exit_call,
+    record_exchange,
+    start_attempt,
+)
+
+
+class RecordingHooks(RequestHooks):
+    """Hooks keeping every event and the calls which ended."""
+
+    def __init__(self) -> None:
+        """Start without events."""
+        self.events = []
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def before_send(self, call: Call) -> None:
+        """Record the attempt."""
+        with self._lock:
+            self.events.append(("before_send", call.method_name, call.attempts))
+
+    def after_receive(self, call: Call) -> None:
+        """Record the call."""
+        with self._lock:
+            self.events.append(("after_receive", call.method_name, call.attempts))
+            self.calls.append(call)
+
+    def on_retry(self, call: Call, exception: Exception, delay: float) -> None:
+        """Record the retry."""
+        with self._lock:
+            self.events.append(("on_retry", call.method_name, call.attempts))
+
+    def on_error(self, call: Call, exception: BaseException) -> None:
+        """Record the error."""
+        with self._lock:
+            self.events.append(("on_error", call.method_name, type(exception).__name__))
+
+
+class ContextTest(unittest.TestCase):
+    """The call in progress belongs to the context which entered it."""
+
+    def test_nested_calls(self) -> None:
+        """Exiting a call restores the one entered before it."""
+        outer, inner = Call("runSearch", {}), Call("getTicketDetails", {})
+        outer_token = enter_call(outer)
+        inner_token = enter_call(inner)
+        self.assertIs(current_call(), inner)
+        self.assertIs(exit_call(inner_token), inner)
+        self.assertIs(current_call(), outer)
+        self.assertIs(exit_call(outer_token), outer)
+        self.assertIsNone(current_call())
+        self.assertGreater(outer.seconds, inner.seconds)
+
+    def test_executor_threads(self) -> None:
+        """Threads run in a copied context share the call, others don't see it."""
+        call = Call("getTicketDetails", {})
+        token = enter_call(call)
+        try:
+            start_attempt()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                self.assertIsNone(executor.submit(current_call).result())
+                context = contextvars.copy_context()
+                self.assertIs(executor.submit(context.run, current_call).result(), call)
+                executor.submit(
+                    context.run, record_exchange, time.perf_counter(), 10, 20
+                ).result()
+        finally:
+            exit_call(token)
+        self.assertEqual((call.attempts, call.request_bytes), (1, 10))
+        self.assertEqual(call.response_bytes, 20)
+        self.assertGreaterEqual(call.network_seconds, 0)
+
+
+class HooksTest(unittest.TestCase):
+    """Hooks receive every attempt of the calls made to footprints."""
+
+    def setUp(self) -> None:
+        """Serve a mock footprints instance to a client with hooks."""
+        self.server = MockFootprintsServer().start()
+        self.addCleanup(self.server.stop)
+        self.hooks = RecordingHooks()
+        self.fp = Footprints(
+            "client",
+            "secret",
+            self.server.wsdl_url,
+            cache_policies={"getTicketDetails": None},
+            retry_policy=RetryPolicy(backoff=0),
+            hooks=self.hooks,
+        )
+
+    def test_phases(self) -> None:
+        """A call is split in its phases, bytes counted once per attempt."""
+        self.fp.get_ticket(80, 1)
+        call = self.hooks.calls[-1]
+        self.assertEqual(call.attempts, 1)
+        self.assertGreater(call.request_bytes, 0)
+        self.assertEqual(
+            call.response_bytes, len(self.server.render("getTicketDetails"))
+        )
+        self.assertLess(0, call.network_seconds)
+        self.assertLess(call.network_seconds, call.seconds)
+        self.assertGreaterEqual(call.serialize_seconds, 0)
+        self.assertGreaterEqual(call.deserialize_seconds, 0)
+
+    def test_retries_and_errors(self) -> None:
+        """Retried attempts and failed calls reach their hooks."""
+        self.server.fail_next(1)
+        self.fp.get_ticket(80, 1)
+        self.assertEqual(
+            [event[0] for event in self.hooks.events],
+            ["before_send", "on_retry", "before_send", "after_receive"],
+        )
+        self.assertEqual(self.hooks.calls[-1].attempts, 2)
+
+        del self.hooks.events[:]
+        self.server.fail_next(3)
+        with self.assertRaises(FootprintsException):
+            self.fp.get_ticket(80, 1)
+        events = [event[0] for event in self.hooks.events]
+        self.assertEqual(events.count("on_retry"), 2)
+        self.assertEqual(
+            self.hooks.events[-1],
+            ("on_error", "getTicketDetails", "FootprintsException"),
+        )
+
+    def test_concurrent_calls(self) -> None:
+        """Calls made from executor threads only count their own attempts."""
+        results = self.fp.get_tickets(80, range(1, 21), concurrency=8)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(len(self.hooks.calls), 20)
+        response_bytes = len(self.server.render("getTicketDetails"))
+        for call in self.hooks.calls:
+            self.assertEqual(call.attempts, 1)
+            self.assertEqual(call.response_bytes, response_bytes)
+        self.assertEqual(
+            sorted(call.params["_itemId"] for call in self.hooks.calls),
+            list(range(1, 21)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
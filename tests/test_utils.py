@@ -0,0 +1,160 @@
+"""Tests of the key case conversions."""
+
+import re
+import unittest
+
+from benchmarks.bench_fields import build_fields, legacy_get_attributes
+from footprintsapi.keymap import FOOTPRINTS_KEYS
+from footprintsapi.mixins import COMMON_ATTRS, CUSTOM_ATTRS
+from footprintsapi.utils import (
+    KEY_TABLE,
+    FieldExtractor,
+    field_extractor,
+    get_attributes,
+    merge_ticket_fields,
+    parse_keys,
+    to_camel_case,
+    to_snake_case,
+)
+
+REQUEST = {
+    "item_definition_id": 80,
+    "ticket_fields": {
+        "title": "Printer on fire",
+        "item_fields": [
+            {"field_name": "Service", "field_value": {"value": ["Email"]}},
+        ],
+    },
+    "assignees": ["agent"],
+}
+
+SENT = {
+    "_itemDefinitionId": 80,
+    "_ticketFields": {
+        "title": "Printer on fire",
+        "itemFields": [
+            {"fieldName": "Service", "fieldValue": {"value": ["Email"]}},
+        ],
+    },
+    "_assignees": ["agent"],
+}
+
+
+class ParseKeysTest(unittest.TestCase):
+    """Keys survive being converted to the request case and back."""
+
+    def test_request_round_trip(self) -> None:
+        """Snake case params become the keys sent to footprints and back."""
+        sent = parse_keys(REQUEST, depth=8)
+        self.assertEqual(sent, SENT)
+        self.assertEqual(parse_keys(sent, "snake_case", depth=8), REQUEST)
+
+    def test_converted_keys_pass_through(self) -> None:
+        """Keys already in the target case are kept, underscores included."""
+        self.assertEqual(parse_keys(SENT, depth=8), SENT)
+        self.assertEqual(parse_keys(REQUEST, "snake_case", depth=8), REQUEST)
+        nested = {"items": [{"_itemId": 1, "_itemDefinitionId": 2}]}
+        self.assertEqual(parse_keys(nested, "camel_case", depth=3), nested)
+        self.assertEqual(
+            parse_keys(nested, depth=3),
+            {"_items": [{"_itemId": 1, "_itemDefinitionId": 2}]},
+        )
+
+    def test_schema_names_round_trip(self) -> None:
+        """Every field name of the schema round-trips through snake case."""
+        for name in FOOTPRINTS_KEYS:
+            # Type names and acronyms, as in `createCI`, lose their case.
+            if not re.match(r"_?[a-z]", name) or re.search(r"[A-Z]{2}", name):
+                continue
+            snake = to_snake_case(name)
+            with self.subTest(name=name):
+                self.assertEqual(parse_keys({name: 1}, "snake_case"), {snake: 1})
+                if name.startswith("_"):
+                    self.assertEqual(parse_keys({snake: 1}), {name: 1})
+                else:
+                    self.assertEqual(to_camel_case(snake), name)
+
+    def test_key_table_matches_converters(self) -> None:
+        """The key table holds what the converters return."""
+        for key, forms in KEY_TABLE.items():
+            with self.subTest(key=key):
+                self.assertEqual(parse_keys({key: 1}, "camel_case"), {forms.camel: 1})
+                self.assertEqual(to_camel_case.__wrapped__(key), forms.camel)
+                self.assertEqual(to_snake_case.__wrapped__(key), forms.snake)
+
+
+class FieldExtractorTest(unittest.TestCase):
+    """Extractors return what `get_attributes` returned before them."""
+
+    def test_matches_legacy(self) -> None:
+        """Multi-word, custom and unwanted fields are handled alike."""
+        fields = build_fields(20)
+        # A label in another case, a field without a value and a repeated one.
+        fields += [
+            dict(fieldName="EMAIL CC", fieldValue=dict(value=["a", "b"])),
+            dict(fieldName="Details", fieldValue=None),
+            dict(fieldName="Title", fieldValue=dict(value=["Again"])),
+        ]
+        for attributes in (COMMON_ATTRS, CUSTOM_ATTRS, ["Custom Field 3"]):
+            expected = legacy_get_attributes(fields, attributes)
+            with self.subTest(attributes=attributes):
+                self.assertEqual(get_attributes(fields, attributes), expected)
+                self.assertEqual(FieldExtractor(attributes)(fields), expected)
+                extractor = field_extractor(tuple(attributes))
+                self.assertEqual(extractor(fields), expected)
+                self.assertEqual(extractor(fields), expected)
+
+        common = get_attributes(fields, COMMON_ATTRS)
+        self.assertIn(("created_by", "Created By value"), common)
+        self.assertIn(("email_cc", ["a", "b"]), get_attributes(fields, CUSTOM_ATTRS))
+        self.assertIn(("details", None), get_attributes(fields, CUSTOM_ATTRS))
+
+    def test_missing_fields(self) -> None:
+        """Fields absent from the ticket, or nothing wanted, extract nothing."""
+        fields = build_fields(0)
+        self.assertEqual(get_attributes(fields, ["Not A Field"]), [])
+        self.assertEqual(get_attributes(fields, []), [])
+        self.assertEqual(get_attributes([], COMMON_ATTRS), [])
+        self.assertIs(field_extractor(("Title",)), field_extractor(("Title",)))
+
+
+class MergeTicketFieldsTest(unittest.TestCase):
+    """Ticket field updates merge as if applied in order."""
+
+    def test_last_update_wins(self) -> None:
+        """Fields keep their first position and their last value."""
+        merged = merge_ticket_fields(
+            [
+                {
+                    "title": "Printer",
+                    "item_fields": [
+                        {"field_name": "Status", "field_value": {"value": ["Open"]}},
+                        {"field_name": "Service", "field_value": {"value": ["Print"]}},
+                    ],
+                },
+                {
+                    "itemFields": [
+                        {"fieldName": "Priority", "fieldValue": {"value": ["High"]}},
+                        {"fieldName": "Status", "fieldValue": {"value": ["Closed"]}},
+                    ]
+                },
+                {"title": "Printer on fire", "description": "Smoke"},
+            ]
+        )
+        self.assertEqual(
+            merged,
+            {
+                "title": "Printer on fire",
+                "description": "Smoke",
+                "itemFields": [
+                    {"fieldName": "Status", "fieldValue": {"value": ["Closed"]}},
+                    {"fieldName": "Service", "fieldValue": {"value": ["Print"]}},
+                    {"fieldName": "Priority", "fieldValue": {"value": ["High"]}},
+                ],
+            },
+        )
+        self.assertEqual(merge_ticket_fields([]), {"itemFields": []})
+
+
+if __name__ == "__main__":
+    unittest.main()